@@ -0,0 +1,56 @@
+"""add chore completion indexes
+
+Revision ID: b4a91e0d7c22
+Revises: 8f3d2c6a1b57
+Create Date: 2026-10-18 14:05:52.730941
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4a91e0d7c22'
+down_revision: Union[str, None] = '8f3d2c6a1b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, partial index condition)
+INDEXES = [
+    ('ix_chore_completion_family_id_created_at', 'chore_completion', ['family_id', 'created_at'], None),
+    ('ix_chore_completion_completed_by_id_created_at', 'chore_completion', ['completed_by_id', 'created_at'], None),
+    ('ix_chore_completion_chore_id', 'chore_completion', ['chore_id'], None),
+    ('ix_chore_completion_approved_created_at_id', 'chore_completion', ['created_at', 'id'], "status = 'approved'"),
+    ('ix_chore_confirmation_user_id_status', 'chore_confirmation', ['user_id', 'status'], None),
+    ('ix_chore_confirmation_chore_completion_id_status', 'chore_confirmation', ['chore_completion_id', 'status'], None),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY doesn't lock writes but can't run inside a
+    # transaction. A failed build leaves an INVALID index: drop it and rerun.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,64 @@
+"""chore completion keyset indexes
+
+Revision ID: d6e3f91a4c58
+Revises: b4a91e0d7c22
+Create Date: 2026-10-18 16:42:11.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6e3f91a4c58'
+down_revision: Union[str, None] = 'b4a91e0d7c22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (new index, columns, index it supersedes, its columns)
+INDEXES = [
+    ('ix_chore_completion_family_id_created_at_id', ['family_id', 'created_at', 'id'], 'ix_chore_completion_family_id_created_at', ['family_id', 'created_at']),
+    ('ix_chore_completion_completed_by_id_created_at_id', ['completed_by_id', 'created_at', 'id'], 'ix_chore_completion_completed_by_id_created_at', ['completed_by_id', 'created_at']),
+    ('ix_chore_completion_chore_id_created_at_id', ['chore_id', 'created_at', 'id'], 'ix_chore_completion_chore_id', ['chore_id']),
+]
+
+
+def upgrade() -> None:
+    # built concurrently before the old ones are dropped, queries keep an index
+    with op.get_context().autocommit_block():
+        for name, columns, old_name, _ in INDEXES:
+            op.create_index(
+                name,
+                'chore_completion',
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                old_name,
+                table_name='chore_completion',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, old_name, old_columns in reversed(INDEXES):
+            op.create_index(
+                old_name,
+                'chore_completion',
+                old_columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                name,
+                table_name='chore_completion',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
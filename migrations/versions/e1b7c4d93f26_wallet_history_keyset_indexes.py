@@ -0,0 +1,64 @@
+"""wallet history keyset indexes
+
+Revision ID: e1b7c4d93f26
+Revises: d6e3f91a4c58
+Create Date: 2026-10-18 18:10:37.502913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b7c4d93f26'
+down_revision: Union[str, None] = 'd6e3f91a4c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (new index, table, columns, index it supersedes, its columns)
+INDEXES = [
+    ('ix_peer_transactions_to_user_id_created_at_id', 'peer_transactions', ['to_user_id', 'created_at', 'id'], 'ix_peer_transactions_to_user_id', ['to_user_id']),
+    ('ix_peer_transactions_from_user_id_created_at_id', 'peer_transactions', ['from_user_id', 'created_at', 'id'], 'ix_peer_transactions_from_user_id', ['from_user_id']),
+    ('ix_reward_transactions_to_user_id_created_at_id', 'reward_transactions', ['to_user_id', 'created_at', 'id'], 'ix_reward_transactions_to_user_id', ['to_user_id']),
+]
+
+
+def upgrade() -> None:
+    # built concurrently before the old ones are dropped, queries keep an index
+    with op.get_context().autocommit_block():
+        for name, table, columns, old_name, _ in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                old_name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, old_name, old_columns in reversed(INDEXES):
+            op.create_index(
+                old_name,
+                table,
+                old_columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,238 @@
+"""
+Plans and latencies of the chore_completion / chore_confirmation queries
+before and after the indexes of migrations b4a91e0d7c22 and d6e3f91a4c58, on
+a seeded table.
+
+Seeds a scratch schema (not the application tables, no foreign keys) with
+`rows` completions spread over 2 years, 10k families, 8 members and 25 chores
+per family, plus a confirmation for ~20% of them. Every query is run with
+EXPLAIN ANALYZE, the median of a few runs is reported with the scans used.
+The schema is dropped at the end unless --keep is given.
+
+    PYTHONPATH=src python scripts/benchmarks/chore_completion_indexes.py --rows 10000000
+
+Requires a database reachable with the usual DB_* settings (seeding 10M rows
+takes a few minutes and ~2 GB).
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+
+from database_connection import engine
+
+SCHEMA = "bench_chore_completion"
+RUNS = 5
+
+SEED = [
+    f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE",
+    f"CREATE SCHEMA {SCHEMA}",
+    f"""
+    CREATE TABLE {SCHEMA}.chore_completion AS
+    SELECT
+        gen_random_uuid() AS id,
+        md5('chore' || i % 10000 || ':' || i % 25)::uuid AS chore_id,
+        md5('family' || i % 10000)::uuid AS family_id,
+        md5('user' || i % 10000 || ':' || i % 8)::uuid AS completed_by_id,
+        CASE
+            WHEN random() < 0.8 THEN 'approved'
+            WHEN random() < 0.75 THEN 'awaits'
+            ELSE 'canceled'
+        END::varchar(8) AS status,
+        'bench'::varchar(50) AS message,
+        TIMEZONE('utc', now()) - random() * interval '730 days' AS created_at
+    FROM generate_series(1, :rows) AS i
+    """,
+    f"ALTER TABLE {SCHEMA}.chore_completion ADD PRIMARY KEY (id)",
+    f"""
+    CREATE TABLE {SCHEMA}.chore_confirmation AS
+    SELECT
+        gen_random_uuid() AS id,
+        md5('confirmer' || c.family_id || floor(random() * 8))::uuid AS user_id,
+        c.id AS chore_completion_id,
+        CASE WHEN random() < 0.5 THEN 'approved' ELSE 'awaits' END::varchar(8)
+            AS status,
+        c.created_at
+    FROM {SCHEMA}.chore_completion AS c TABLESAMPLE SYSTEM (20)
+    """,
+    f"ALTER TABLE {SCHEMA}.chore_confirmation ADD PRIMARY KEY (id)",
+]
+
+# same definitions as the migrations
+INDEXES = [
+    "CREATE INDEX ON {s}.chore_completion (family_id, created_at, id)",
+    "CREATE INDEX ON {s}.chore_completion (completed_by_id, created_at, id)",
+    "CREATE INDEX ON {s}.chore_completion (chore_id, created_at, id)",
+    "CREATE INDEX ON {s}.chore_completion (created_at, id) "
+    "WHERE status = 'approved'",
+    "CREATE INDEX ON {s}.chore_confirmation (user_id, status)",
+    "CREATE INDEX ON {s}.chore_confirmation (chore_completion_id, status)",
+]
+
+QUERIES = {
+    "family page (offset 200)": """
+        SELECT id, created_at, status FROM {s}.chore_completion
+        WHERE family_id = :family_id
+        ORDER BY created_at DESC LIMIT 20 OFFSET 200
+    """,
+    "family page (cursor)": """
+        SELECT id, created_at, status FROM {s}.chore_completion
+        WHERE family_id = :family_id AND (created_at, id) < (:before, :before_id)
+        ORDER BY created_at DESC, id DESC LIMIT 20
+    """,
+    "family user page (cursor)": """
+        SELECT id, created_at, status FROM {s}.chore_completion
+        WHERE family_id = :family_id AND completed_by_id = :user_id
+            AND (created_at, id) < (:before, :before_id)
+        ORDER BY created_at DESC, id DESC LIMIT 20
+    """,
+    "family page, approved": """
+        SELECT id, created_at FROM {s}.chore_completion
+        WHERE family_id = :family_id AND status = 'approved'
+        ORDER BY created_at DESC LIMIT 20
+    """,
+    "family month, DATE()": """
+        SELECT count(*) FROM {s}.chore_completion
+        WHERE family_id = :family_id
+            AND DATE(created_at) BETWEEN :start AND :end
+    """,
+    "family month, half-open": """
+        SELECT count(*) FROM {s}.chore_completion
+        WHERE family_id = :family_id
+            AND created_at >= :start AND created_at < :end_exclusive
+    """,
+    "user month, DATE()": """
+        SELECT count(*) FROM {s}.chore_completion
+        WHERE completed_by_id = :user_id
+            AND DATE(created_at) BETWEEN :start AND :end
+    """,
+    "user month, half-open": """
+        SELECT count(*) FROM {s}.chore_completion
+        WHERE completed_by_id = :user_id
+            AND created_at >= :start AND created_at < :end_exclusive
+    """,
+    "chore completions": """
+        SELECT count(*) FROM {s}.chore_completion WHERE chore_id = :chore_id
+    """,
+    "approved keyset page": """
+        SELECT id, created_at FROM {s}.chore_completion
+        WHERE status = 'approved' AND (created_at, id) > (:after, :after_id)
+        ORDER BY created_at, id LIMIT 1000
+    """,
+    "user confirmations, awaits": """
+        SELECT id FROM {s}.chore_confirmation
+        WHERE user_id = :confirmer_id AND status = 'awaits' LIMIT 20
+    """,
+    "approvals of a completion": """
+        SELECT count(*) FROM {s}.chore_confirmation
+        WHERE chore_completion_id = :completion_id AND status = 'approved'
+    """,
+}
+
+
+def summarize_plan(plan: dict) -> str:
+    scans = []
+
+    def walk(node: dict) -> None:
+        if "Scan" in node["Node Type"]:
+            scan = node["Node Type"]
+            if "Index Name" in node:
+                scan += f" {node['Index Name']}"
+            scans.append(scan)
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan["Plan"])
+    return ", ".join(scans)
+
+
+async def measure(conn, params: dict) -> dict[str, tuple[float, str]]:
+    results = {}
+    for name, query in QUERIES.items():
+        sql = text("EXPLAIN (ANALYZE, FORMAT JSON) " + query.format(s=SCHEMA))
+        timings = []
+        for _ in range(RUNS):
+            # asyncpg hands json over as text
+            plan = json.loads((await conn.execute(sql, params)).scalar())[0]
+            timings.append(plan["Execution Time"])
+        results[name] = (sorted(timings)[RUNS // 2], summarize_plan(plan))
+    return results
+
+
+async def pick_params(conn) -> dict:
+    row = (
+        await conn.execute(
+            text(
+                f"SELECT c.id, c.family_id, c.completed_by_id, c.chore_id, "
+                f"c.created_at, f.user_id "
+                f"FROM {SCHEMA}.chore_completion AS c "
+                f"JOIN {SCHEMA}.chore_confirmation AS f "
+                f"ON f.chore_completion_id = c.id LIMIT 1"
+            )
+        )
+    ).one()
+    start = date.today().replace(day=1) - timedelta(days=31)
+    end = start + timedelta(days=30)
+    return {
+        "completion_id": row[0],
+        "family_id": row[1],
+        "user_id": row[2],
+        "chore_id": row[3],
+        "after": row[4],
+        "after_id": row[0],
+        "before": row[4],
+        "before_id": row[0],
+        "confirmer_id": row[5],
+        "start": start,
+        "end": end,
+        "end_exclusive": end + timedelta(days=1),
+    }
+
+
+async def main(rows: int, keep: bool) -> None:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+        started = time.perf_counter()
+        for statement in SEED:
+            params = {"rows": rows} if ":rows" in statement else {}
+            await conn.execute(text(statement), params)
+        await conn.execute(text(f"ANALYZE {SCHEMA}.chore_completion"))
+        await conn.execute(text(f"ANALYZE {SCHEMA}.chore_confirmation"))
+        print(f"seeded {rows:,} completions in {time.perf_counter() - started:.0f}s")
+
+        try:
+            params = await pick_params(conn)
+            before = await measure(conn, params)
+
+            started = time.perf_counter()
+            for statement in INDEXES:
+                await conn.execute(text(statement.format(s=SCHEMA)))
+            await conn.execute(text(f"ANALYZE {SCHEMA}.chore_completion"))
+            await conn.execute(text(f"ANALYZE {SCHEMA}.chore_confirmation"))
+            print(f"indexes built in {time.perf_counter() - started:.0f}s\n")
+
+            after = await measure(conn, params)
+            for name in QUERIES:
+                (before_ms, before_plan), (after_ms, after_plan) = (
+                    before[name],
+                    after[name],
+                )
+                print(f"{name}\n  before {before_ms:>10.2f} ms  {before_plan}")
+                print(f"  after  {after_ms:>10.2f} ms  {after_plan}")
+        finally:
+            if not keep:
+                await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--keep", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.keep))
@@ -0,0 +1,85 @@
+"""
+Rows per second reaching `chore_completion_stats` through both ingestion modes:
+
+- rabbitmq: confirmed batches to the broker, consumed by the RabbitMQ engine
+  table and parsed by `mv_chore_completion` (timed until the rows are visible)
+- direct: column-oriented inserts with `ClickHouseClient.insert_completions`
+
+Needs the ClickHouse and RabbitMQ services of docker-compose.yml with
+`scripts/clickhouse_init.sql` applied. Inserts synthetic rows.
+
+    PYTHONPATH=src python scripts/benchmarks/clickhouse_ingestion.py [rows] [batch]
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+
+from database_connection import clickhouse_client, rabbit_client
+
+VISIBILITY_TIMEOUT = 120
+
+
+def make_events(count: int) -> list[dict]:
+    family_ids = [str(uuid.uuid4()) for _ in range(100)]
+    now = int(time.time() * 1_000_000)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "family_id": family_ids[i % len(family_ids)],
+            "chore_id": str(uuid.uuid4()),
+            "completed_by_id": str(uuid.uuid4()),
+            "created_at": now - i * 1_000_000,
+        }
+        for i in range(count)
+    ]
+
+
+async def count_rows() -> int:
+    client = await clickhouse_client.get_client()
+    table = clickhouse_client.completions_table
+    result = await client.query(f"SELECT count() FROM {table}")
+    return result.result_rows[0][0]
+
+
+async def wait_for_rows(expected: int) -> None:
+    deadline = time.monotonic() + VISIBILITY_TIMEOUT
+    while await count_rows() < expected:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"{expected} rows were not visible in time")
+        await asyncio.sleep(0.05)
+
+
+async def bench_rabbitmq(events: list[dict], batch: int) -> float:
+    expected = await count_rows() + len(events)
+    started = time.perf_counter()
+    for i in range(0, len(events), batch):
+        await rabbit_client.publish_many(events[i : i + batch])
+    await wait_for_rows(expected)
+    return len(events) / (time.perf_counter() - started)
+
+
+async def bench_direct(events: list[dict], batch: int) -> float:
+    started = time.perf_counter()
+    for i in range(0, len(events), batch):
+        await clickhouse_client.insert_completions(events[i : i + batch])
+    return len(events) / (time.perf_counter() - started)
+
+
+async def main(rows: int, batch: int) -> None:
+    await clickhouse_client.connect()
+    try:
+        print(f"{rows} rows in batches of {batch}")
+        for name, bench in (("rabbitmq", bench_rabbitmq), ("direct", bench_direct)):
+            rate = await bench(make_events(rows), batch)
+            print(f"{name:<10}{rate:>12,.0f} rows/s")
+    finally:
+        await rabbit_client.close()
+        await clickhouse_client.close()
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    batch = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    asyncio.run(main(rows, batch))
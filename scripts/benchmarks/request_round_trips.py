@@ -0,0 +1,134 @@
+"""
+Counts database round trips per request for the main authenticated endpoints.
+
+Every statement, BEGIN, COMMIT and ROLLBACK (including the reset done when a
+connection goes back to the pool) sent by the application engines is counted
+while requests are served in-process (httpx + ASGI transport, no network), so
+the numbers do not depend on the machine.
+
+The script only relies on the app and the engines, so it can also be run
+against an older revision (e.g. from a `git worktree`) to get the baseline:
+
+    PYTHONPATH=src python scripts/benchmarks/request_round_trips.py
+
+Requires a migrated database reachable with the usual DB_* settings.
+Seeds one user with a family per run.
+"""
+
+import asyncio
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import timedelta
+
+import httpx
+from sqlalchemy import event
+
+from core.security import create_jwt_token
+from database_connection import async_session, engine, replica_engine
+from families.services import FamilyCreatorService
+from main import app
+from users.services import UserCreatorService
+
+ENDPOINTS = [
+    ("GET", "/api/users/me/profile", None),
+    ("GET", "/api/users/me/settings", None),
+    ("PATCH", "/api/users/me/profile", {"name": "Bench"}),
+    ("GET", "/api/families", None),
+    ("GET", "/api/families/members", None),
+    ("GET", "/api/chores", None),
+    ("GET", "/api/wallets", None),
+    ("GET", "/api/wallets/transactions", None),
+    ("GET", "/api/chores-completions", None),
+    ("GET", "/api/products/family", None),
+]
+REPEAT = 20
+
+
+@contextmanager
+def count_round_trips():
+    counter: Counter[str] = Counter()
+
+    def on_statement(*args, **kwargs):
+        counter["statements"] += 1
+
+    listeners = {
+        "before_cursor_execute": on_statement,
+        "begin": lambda conn: counter.update(["begin"]),
+        "commit": lambda conn: counter.update(["commit"]),
+        "rollback": lambda conn: counter.update(["rollback"]),
+    }
+
+    def on_pool_reset(*args, **kwargs):
+        counter["rollback"] += 1
+
+    engines = [e.sync_engine for e in (engine, replica_engine) if e is not None]
+    for sync_engine in engines:
+        for name, listener in listeners.items():
+            event.listen(sync_engine, name, listener)
+        event.listen(sync_engine.pool, "reset", on_pool_reset)
+    try:
+        yield counter
+    finally:
+        for sync_engine in engines:
+            for name, listener in listeners.items():
+                event.remove(sync_engine, name, listener)
+            event.remove(sync_engine.pool, "reset", on_pool_reset)
+
+
+async def create_user_with_family() -> str:
+    async with async_session() as session:
+        async with session.begin():
+            user = await UserCreatorService(
+                email=f"bench-{uuid.uuid4().hex[:12]}@example.com",
+                db_session=session,
+            ).run_process()
+            await FamilyCreatorService(
+                name="Benchmark", user=user, db_session=session
+            ).run_process()
+            user_id = user.id
+
+    return create_jwt_token(
+        {"sub": str(user_id), "is_family_admin": True},
+        expires_delta=timedelta(minutes=10),
+    )
+
+
+async def main() -> None:
+    token = await create_user_with_family()
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+
+    print(
+        f"{'endpoint':<40}{'status':>7}{'begin':>7}"
+        f"{'stmts':>7}{'commit':>8}{'total':>7}"
+    )
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        for method, path, body in ENDPOINTS:
+            # warm up connections and caches so only the steady state is counted
+            await client.request(method, path, json=body, headers=headers)
+            with count_round_trips() as counter:
+                for _ in range(REPEAT):
+                    response = await client.request(
+                        method, path, json=body, headers=headers
+                    )
+            per_request = {k: v / REPEAT for k, v in counter.items()}
+            ends = per_request.get("commit", 0) + per_request.get("rollback", 0)
+            total = sum(per_request.values())
+            print(
+                f"{method + ' ' + path:<40}{response.status_code:>7}"
+                f"{per_request.get('begin', 0):>7.1f}"
+                f"{per_request.get('statements', 0):>7.1f}"
+                f"{ends:>8.1f}"
+                f"{total:>7.1f}"
+            )
+
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+"""
+Micro-benchmark of the token part of the permission dependencies
+(`BasePermission.__call__` before it touches the database), with and without
+the verified-token cache.
+
+Measures both the bare `get_payload_from_jwt_token` call and a whole request
+through a FastAPI route that resolves the same `HTTPBearer` + verification
+dependency, served in-process.
+
+    PYTHONPATH=src python scripts/benchmarks/token_verification.py
+"""
+
+import asyncio
+import time
+import timeit
+
+import httpx
+from fastapi import Depends, FastAPI, Security
+from fastapi.security import HTTPAuthorizationCredentials
+
+from core.permissions import security
+from core.security import create_jwt_token, get_payload_from_jwt_token
+
+CALLS = 20_000
+REQUESTS = 2_000
+
+
+def build_app(use_cache: bool) -> FastAPI:
+    app = FastAPI()
+
+    def verify(credentials: HTTPAuthorizationCredentials = Security(security)):
+        return get_payload_from_jwt_token(credentials.credentials, use_cache)
+
+    @app.get("/")
+    async def endpoint(payload: dict = Depends(verify)) -> dict:
+        return {"sub": payload["sub"]}
+
+    return app
+
+
+async def time_requests(app: FastAPI, token: str) -> float:
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await client.get("/", headers=headers)
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            await client.get("/", headers=headers)
+        return (time.perf_counter() - started) / REQUESTS
+
+
+def main() -> None:
+    token = create_jwt_token({"sub": "00000000-0000-0000-0000-000000000000"})
+
+    print(f"{'':<24}{'verify, us':>12}{'request, us':>13}")
+    for use_cache in (False, True):
+        per_call = (
+            timeit.timeit(
+                lambda: get_payload_from_jwt_token(token, use_cache), number=CALLS
+            )
+            / CALLS
+        )
+        per_request = asyncio.run(time_requests(build_app(use_cache), token))
+        label = "with cache" if use_cache else "without cache"
+        print(f"{label:<24}{per_call * 1e6:>12.1f}{per_request * 1e6:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
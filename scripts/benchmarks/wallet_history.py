@@ -0,0 +1,189 @@
+"""
+Latency of wallet history pages of a user with a long history: the previous
+query (the whole union ordered, then OFFSET) against the branch-limited one,
+paged by offset and by cursor.
+
+Seeds a user with `transactions` transactions (transfers both ways, a few
+purchases, mostly chore rewards) spread over 3 years, inside a transaction
+that is rolled back at the end. Needs a database migrated to the head with the
+usual DB_* settings.
+
+    PYTHONPATH=src python scripts/benchmarks/wallet_history.py --transactions 100000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from sqlalchemy import select, text, union_all
+
+from chores.models import Chore
+from chores_completions.models import ChoreCompletion
+from core.enums import StatusConfirmENUM
+from core.pagination import Cursor
+from database_connection import async_session, engine
+from families.models import Family
+from products.models import Product
+from users.models import User
+from wallets.repository import TransactionDataService
+
+RUNS = 5
+PAGE = 20
+
+SEED_PEER = """
+    INSERT INTO peer_transactions (
+        id, detail, coins, to_user_id, from_user_id, product_id,
+        transaction_type, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        'bench',
+        1 + i % 50,
+        CASE WHEN i % 2 = 0 THEN :user_id ELSE :other_id END,
+        CASE WHEN i % 2 = 0 THEN :other_id ELSE :user_id END,
+        CASE WHEN i % 5 = 0 THEN :product_id END,
+        CASE WHEN i % 5 = 0 THEN 'purchase' ELSE 'transfer' END,
+        TIMEZONE('utc', now()) - random() * interval '1095 days',
+        TIMEZONE('utc', now())
+    FROM generate_series(1, :count) AS i
+"""
+
+SEED_REWARD = """
+    INSERT INTO reward_transactions (
+        id, detail, coins, to_user_id, chore_completion_id,
+        transaction_type, created_at, updated_at
+    )
+    SELECT
+        gen_random_uuid(),
+        'bench',
+        10,
+        :user_id,
+        :completion_id,
+        'reward_for_chore',
+        TIMEZONE('utc', now()) - random() * interval '1095 days',
+        TIMEZONE('utc', now())
+    FROM generate_series(1, :count) AS i
+"""
+
+
+def legacy_page_query(service: TransactionDataService, user_id, offset, limit):
+    """The union of the whole history, ordered and cut afterwards"""
+    branches = [
+        service._peer_transactions_query(user_id, incoming=True),
+        service._peer_transactions_query(user_id, incoming=False),
+        service._reward_transactions_query(user_id),
+    ]
+    union_query = union_all(*(query for query, _ in branches)).subquery()
+    return (
+        select(union_query)
+        .order_by(union_query.c.created_at.desc(), union_query.c.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+async def seed(db_session, transactions: int) -> uuid.UUID:
+    user = User(username=f"bench-{uuid.uuid4()}", email=f"{uuid.uuid4()}@bench")
+    other = User(username=f"bench-{uuid.uuid4()}", email=f"{uuid.uuid4()}@bench")
+    db_session.add_all([user, other])
+    await db_session.flush()
+    family = Family(name="bench", family_admin_id=user.id)
+    db_session.add(family)
+    await db_session.flush()
+    chore = Chore(
+        name="bench",
+        description="bench",
+        icon="bench",
+        valuation=10,
+        family_id=family.id,
+    )
+    product = Product(
+        name="bench",
+        description="bench",
+        icon="bench",
+        price=10,
+        family_id=family.id,
+        seller_id=other.id,
+    )
+    db_session.add_all([chore, product])
+    await db_session.flush()
+    completion = ChoreCompletion(
+        chore_id=chore.id,
+        family_id=family.id,
+        completed_by_id=user.id,
+        status=StatusConfirmENUM.approved.value,
+        message="bench",
+    )
+    db_session.add(completion)
+    await db_session.flush()
+
+    peer_count = transactions * 3 // 10
+    params = {"user_id": user.id, "other_id": other.id, "product_id": product.id}
+    await db_session.execute(text(SEED_PEER), {**params, "count": peer_count})
+    await db_session.execute(
+        text(SEED_REWARD),
+        {
+            "user_id": user.id,
+            "completion_id": completion.id,
+            "count": transactions - peer_count,
+        },
+    )
+    await db_session.execute(text("ANALYZE peer_transactions"))
+    await db_session.execute(text("ANALYZE reward_transactions"))
+    return user.id
+
+
+async def measure(db_session, query) -> float:
+    timings = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        (await db_session.execute(query)).mappings().all()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[RUNS // 2]
+
+
+async def main(transactions: int) -> None:
+    async with async_session() as db_session:
+        started = time.perf_counter()
+        user_id = await seed(db_session, transactions)
+        print(
+            f"seeded {transactions:,} transactions "
+            f"in {time.perf_counter() - started:.0f}s\n"
+        )
+        service = TransactionDataService(db_session)
+        try:
+            for offset in (0, 1_000, transactions // 2):
+                # cursor of the transaction just before the page
+                cursor = None
+                if offset:
+                    last = (
+                        await db_session.execute(
+                            service.get_page_query(user_id, offset - 1, 1)
+                        )
+                    ).one()
+                    cursor = Cursor(created_at=last.created_at, id=last.id)
+
+                legacy = await measure(
+                    db_session, legacy_page_query(service, user_id, offset, PAGE)
+                )
+                by_offset = await measure(
+                    db_session, service.get_page_query(user_id, offset, PAGE)
+                )
+                by_cursor = await measure(
+                    db_session, service.get_page_query(user_id, 0, PAGE, cursor)
+                )
+                print(f"page at {offset:,}")
+                print(f"  whole union, offset  {legacy:>10.2f} ms")
+                print(f"  limited, offset      {by_offset:>10.2f} ms")
+                print(f"  limited, cursor      {by_cursor:>10.2f} ms")
+        finally:
+            await db_session.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--transactions", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.transactions))
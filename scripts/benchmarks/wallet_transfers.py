@@ -0,0 +1,137 @@
+"""
+Transfers per second of `coin_exchange` against the previous implementation
+(load both wallets, check the balance in Python, two ORM updates with refresh),
+with `workers` concurrent sessions:
+
+- hot: every worker transfers between the same two users, in both directions
+- spread: every worker has its own pair of users
+
+Transfers use rate 1, so the total of the balances must not change; coins
+appearing or vanishing are reported as lost updates. Creates its users and
+wallets and deletes them at the end. Needs a migrated database reachable with
+the usual DB_* settings.
+
+    PYTHONPATH=src python scripts/benchmarks/wallet_transfers.py \\
+        [--workers 16] [--seconds 10] [--isolation standard_write]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import delete, func, select
+
+from core.exceptions.transactions import TransactionConflictError
+from core.exceptions.wallets import NotEnoughCoins
+from core.transactions import MONEY_MOVEMENT, STANDARD_WRITE, run_in_transaction
+from database_connection import async_session, engine
+from users.models import User
+from wallets.models import Wallet
+from wallets.repository import WalletRepository
+from wallets.services import coin_exchange
+
+PROFILES = {profile.name: profile for profile in (MONEY_MOVEMENT, STANDARD_WRITE)}
+BALANCE = 1_000_000
+RATE = Decimal(1)
+
+
+async def legacy_coin_exchange(to_user_id, from_user_id, coins, rate, db_session):
+    wallet_dal = WalletRepository(db_session)
+    from_wallet = await wallet_dal.get_by_user_id(from_user_id)
+    if from_wallet.balance < coins:
+        raise NotEnoughCoins()
+    from_wallet.balance -= coins
+    await wallet_dal.update(from_wallet)
+
+    to_wallet = await wallet_dal.get_by_user_id(to_user_id)
+    to_wallet.balance += int(coins * rate)
+    await wallet_dal.update(to_wallet)
+
+
+async def create_users(count: int) -> list[uuid.UUID]:
+    async with async_session() as db_session:
+        users = [
+            User(username=f"bench-{uuid.uuid4()}", email=f"{uuid.uuid4()}@bench")
+            for _ in range(count)
+        ]
+        db_session.add_all(users)
+        await db_session.flush()
+        db_session.add_all(Wallet(user_id=user.id, balance=BALANCE) for user in users)
+        await db_session.commit()
+        return [user.id for user in users]
+
+
+async def get_total(user_ids: list[uuid.UUID]) -> int:
+    async with async_session() as db_session:
+        query = select(func.sum(Wallet.balance)).where(Wallet.user_id.in_(user_ids))
+        return (await db_session.execute(query)).scalar()
+
+
+async def worker(exchange, pair, profile, deadline: float, stats: dict) -> None:
+    while time.monotonic() < deadline:
+        from_user_id, to_user_id = random.sample(pair, 2)
+        # a session per transfer, like a request
+        async with async_session() as db_session:
+
+            async def transfer():
+                await exchange(to_user_id, from_user_id, 1, RATE, db_session)
+
+            try:
+                await run_in_transaction(db_session, transfer, profile)
+                stats["committed"] += 1
+            except TransactionConflictError:
+                stats["conflicts"] += 1
+
+
+async def run(exchange, pairs, workers, profile, seconds) -> tuple[dict, float]:
+    stats = {"committed": 0, "conflicts": 0}
+    deadline = time.monotonic() + seconds
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            worker(exchange, pairs[i % len(pairs)], profile, deadline, stats)
+            for i in range(workers)
+        )
+    )
+    return stats, time.perf_counter() - started
+
+
+async def main(workers: int, seconds: float, profile_name: str) -> None:
+    profile = PROFILES[profile_name]
+    user_ids = await create_users(workers * 2)
+    pairs = [user_ids[i : i + 2] for i in range(0, len(user_ids), 2)]
+    print(f"{workers} workers, {seconds:.0f}s per run, {profile.name}\n")
+    try:
+        for scenario, scenario_pairs in (("hot", pairs[:1]), ("spread", pairs)):
+            for name, exchange in (
+                ("legacy", legacy_coin_exchange),
+                ("atomic", coin_exchange),
+            ):
+                total = await get_total(user_ids)
+                stats, elapsed = await run(
+                    exchange, scenario_pairs, workers, profile, seconds
+                )
+                lost = total - await get_total(user_ids)
+                print(
+                    f"{scenario:<8}{name:<8}"
+                    f"{stats['committed'] / elapsed:>10,.0f} transfers/s"
+                    f"{stats['conflicts']:>8} conflicts"
+                    f"{lost:>8} lost coins"
+                )
+    finally:
+        async with async_session() as db_session:
+            await db_session.execute(delete(User).where(User.id.in_(user_ids)))
+            await db_session.commit()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--isolation", choices=PROFILES, default=MONEY_MOVEMENT.name)
+    args = parser.parse_args()
+    asyncio.run(main(args.workers, args.seconds, args.isolation))
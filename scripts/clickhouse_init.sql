@@ -34,3 +34,73 @@ SELECT
     JSONExtract(payload, 'completed_by_id','UUID') as completed_by_id,
     toDateTime(JSONExtract(payload, 'created_at','Int64') / 1000000) as created_at
 FROM rabbitmq_chore_completion;
+
+
+-- Daily rollups of chore_completion_stats, read by StatsClickhouseRepository.
+-- SummingMergeTree folds rows with the same key in background merges, so
+-- reads still have to sum(completions) over not yet merged parts.
+-- Existing data is copied with scripts/clickhouse_rollups_populate.sql.
+
+CREATE TABLE IF NOT EXISTS chore_completion_daily_family
+(
+    family_id UUID,
+    day Date,
+    completions UInt64
+)
+ENGINE = SummingMergeTree(completions)
+ORDER BY (family_id, day);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_chore_completion_daily_family
+TO chore_completion_daily_family
+AS
+SELECT
+    family_id,
+    toDate(created_at) AS day,
+    count() AS completions
+FROM chore_completion_stats
+GROUP BY family_id, day;
+
+
+CREATE TABLE IF NOT EXISTS chore_completion_daily_user
+(
+    completed_by_id UUID,
+    family_id UUID,
+    day Date,
+    completions UInt64,
+    INDEX family_id_idx family_id TYPE bloom_filter GRANULARITY 4
+)
+ENGINE = SummingMergeTree(completions)
+ORDER BY (completed_by_id, family_id, day);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_chore_completion_daily_user
+TO chore_completion_daily_user
+AS
+SELECT
+    completed_by_id,
+    family_id,
+    toDate(created_at) AS day,
+    count() AS completions
+FROM chore_completion_stats
+GROUP BY completed_by_id, family_id, day;
+
+
+CREATE TABLE IF NOT EXISTS chore_completion_daily_chore
+(
+    family_id UUID,
+    chore_id UUID,
+    day Date,
+    completions UInt64
+)
+ENGINE = SummingMergeTree(completions)
+ORDER BY (family_id, chore_id, day);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_chore_completion_daily_chore
+TO chore_completion_daily_chore
+AS
+SELECT
+    family_id,
+    chore_id,
+    toDate(created_at) AS day,
+    count() AS completions
+FROM chore_completion_stats
+GROUP BY family_id, chore_id, day;
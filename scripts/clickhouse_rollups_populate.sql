@@ -0,0 +1,37 @@
+-- Fills the daily rollup tables from the rows chore_completion_stats already
+-- holds. Run it once after creating the rollups of clickhouse_init.sql on a
+-- database with data.
+--
+-- Rows inserted while it runs would be counted twice (by the materialized
+-- views and by these selects), so stop the outbox relay first: approvals keep
+-- accumulating in the Postgres outbox and are delivered after the restart.
+
+TRUNCATE TABLE chore_completion_daily_family;
+TRUNCATE TABLE chore_completion_daily_user;
+TRUNCATE TABLE chore_completion_daily_chore;
+
+INSERT INTO chore_completion_daily_family
+SELECT
+    family_id,
+    toDate(created_at) AS day,
+    count() AS completions
+FROM chore_completion_stats
+GROUP BY family_id, day;
+
+INSERT INTO chore_completion_daily_user
+SELECT
+    completed_by_id,
+    family_id,
+    toDate(created_at) AS day,
+    count() AS completions
+FROM chore_completion_stats
+GROUP BY completed_by_id, family_id, day;
+
+INSERT INTO chore_completion_daily_chore
+SELECT
+    family_id,
+    chore_id,
+    toDate(created_at) AS day,
+    count() AS completions
+FROM chore_completion_stats
+GROUP BY family_id, chore_id, day;
@@ -68,8 +68,7 @@ async def refresh_access_token(
 async def send_email_code(body: AuthEmail) -> JSONResponse:
     secret_code = random.randint(MIN_VERIFY_CODE, MAX_VERIFY_CODE)
 
-    redis = await redis_client.get_client()
-    await redis.set(body.email, secret_code, ex=300)
+    await redis_client.run(lambda redis: redis.set(body.email, secret_code, ex=300))
 
     asyncio.create_task(
         send_email_secret_code(to_email=body.email, secret_code=secret_code)
@@ -82,8 +81,7 @@ async def send_email_code(body: AuthEmail) -> JSONResponse:
 async def post_email_code(
     body: AuthCodeEmail, db: AsyncSession = Depends(get_db)
 ) -> AccessRefreshTokens:
-    redis = await redis_client.get_client()
-    code_from_redis = await redis.get(body.email)
+    code_from_redis = await redis_client.run(lambda redis: redis.get(body.email))
 
     if code_from_redis is None:
         raise HTTPException(
@@ -16,8 +16,9 @@ from chores.services import ChoreCreatorService
 from core.permissions import (
     ChorePermission,
     FamilyMemberPermission,
+    get_permitted_chore,
 )
-from database_connection import get_db
+from core.unit_of_work import get_uow_session
 from families.repository import FamilyRepository
 from users.models import User
 
@@ -34,14 +35,13 @@ router = APIRouter()
 async def get_family_chores(
     limit: int | None = Query(None, ge=1),
     current_user: User = Depends(FamilyMemberPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> ChoresListResponseSchema:
-    async with async_session.begin():
-        family_chores = await ChoreRepository(async_session).get_family_chores(
-            current_user.family_id, limit=limit
-        )
-        result_response = ChoresListResponseSchema(chores=family_chores)
-        return result_response
+    family_chores = await ChoreRepository(async_session).get_family_chores(
+        current_user.family_id, limit=limit
+    )
+    result_response = ChoresListResponseSchema(chores=family_chores)
+    return result_response
 
 
 @router.post(
@@ -52,23 +52,22 @@ async def get_family_chores(
 async def create_family_chore(
     body: ChoreCreateSchema,
     current_user: User = Depends(FamilyMemberPermission(only_admin=True)),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> ChoreResponseSchema:
-    async with async_session.begin():
-        family = await FamilyRepository(async_session).get_by_id(current_user.family_id)
-        creator_service = ChoreCreatorService(
-            family=family,
-            db_session=async_session,
-            data=body,
-        )
-        new_chore = await creator_service.run_process()
-        return ChoreResponseSchema(
-            id=new_chore.id,
-            name=new_chore.name,
-            description=new_chore.description,
-            icon=new_chore.icon,
-            valuation=new_chore.valuation,
-        )
+    family = await FamilyRepository(async_session).get_by_id(current_user.family_id)
+    creator_service = ChoreCreatorService(
+        family=family,
+        db_session=async_session,
+        data=body,
+    )
+    new_chore = await creator_service.run_process()
+    return ChoreResponseSchema(
+        id=new_chore.id,
+        name=new_chore.name,
+        description=new_chore.description,
+        icon=new_chore.icon,
+        valuation=new_chore.valuation,
+    )
 
 
 @router.delete(
@@ -79,18 +78,17 @@ async def create_family_chore(
 async def delete_family_chore(
     chore_id: UUID,
     current_user: User = Depends(ChorePermission(only_admin=True)),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> Response:
-    async with async_session.begin():
-        chore_dal = ChoreRepository(async_session)
-        result = await chore_dal.soft_delete(chore_id)
-
-        if result:
-            return Response(status_code=status.HTTP_204_NO_CONTENT)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail={"Chore was not found"}
-            )
+    chore_dal = ChoreRepository(async_session)
+    result = await chore_dal.soft_delete(chore_id)
+
+    if result:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail={"Chore was not found"}
+        )
 
 
 @router.patch(
@@ -102,17 +100,13 @@ async def edit_family_chore(
     chore_id: UUID,
     body: ChoreUpdateSchema,
     current_user: User = Depends(ChorePermission(only_admin=True)),
-    async_session: AsyncSession = Depends(get_db),
+    chore: Chore = Depends(get_permitted_chore),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> ChoreResponseSchema:
-    async with async_session.begin():
-        chore = await async_session.get(Chore, chore_id)
-        if not chore:
-            raise HTTPException(404, "Chore not found")
-
-        for field, value in body.model_dump(exclude_unset=True).items():
-            setattr(chore, field, value)
+    for field, value in body.model_dump(exclude_unset=True).items():
+        setattr(chore, field, value)
 
-        await async_session.flush()
+    await async_session.flush()
 
     return ChoreResponseSchema(
         id=chore.id,
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Enum, ForeignKey, String
+from sqlalchemy import Enum, ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.enums import StatusConfirmENUM
@@ -9,6 +9,35 @@ from core.models import Base, BaseIdTimeStampModel
 
 class ChoreCompletion(Base, BaseIdTimeStampModel):
     __tablename__ = "chore_completion"
+    __table_args__ = (
+        # (created_at, id) suffixes serve the keyset pages of the family list
+        # under each of its filters
+        Index(
+            "ix_chore_completion_family_id_created_at_id",
+            "family_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_chore_completion_completed_by_id_created_at_id",
+            "completed_by_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_chore_completion_chore_id_created_at_id",
+            "chore_id",
+            "created_at",
+            "id",
+        ),
+        # keyset scans over approved completions (ClickHouse backfill)
+        Index(
+            "ix_chore_completion_approved_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("status = 'approved'"),
+        ),
+    )
 
     chore_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey(column="chores.id", ondelete="RESTRICT")
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from sqlalchemy import case
+from sqlalchemy import case, tuple_
 
 from sqlalchemy.future import select
 from sqlalchemy.orm import aliased
@@ -16,6 +16,7 @@ from chores_confirmations.models import ChoreConfirmation
 from core.base_dals import BaseDals
 from core.enums import StatusConfirmENUM
 from core.exceptions.chores_completion import ChoreCompletionNotFoundError
+from core.pagination import Cursor
 from users.models import User
 
 
@@ -31,6 +32,7 @@ class ChoreCompletionRepository(BaseDals[ChoreCompletion]):
         status: StatusConfirmENUM | None,
         chore_id: UUID | None,
         user_id: UUID | None,
+        cursor: Cursor | None = None,
     ) -> list[ChoreCompletionResponseSchema]:
         """
         Retrieves a list of chore completion records for a specific family,
@@ -40,6 +42,9 @@ class ChoreCompletionRepository(BaseDals[ChoreCompletion]):
             family_id (UUID): The ID of the family whose chore completions are to be fetched.
             offset (int): The number of records to skip for pagination.
             limit (int): The maximum number of records to retrieve.
+            cursor (Cursor | None): Position of the last record of the previous page.
+                Records are ordered by (created_at, id) descending, so with a cursor
+                the page is read from the index without skipping rows.
 
         Returns:
             list[ChoreCompletionResponseSchema]: A list of `ChoreCompletionResponseSchema` Pydantic models
@@ -47,13 +52,18 @@ class ChoreCompletionRepository(BaseDals[ChoreCompletion]):
             the user who completed it, and the completion status.
         """
 
-        conditions = [Chore.family_id == family_id]
+        conditions = [ChoreCompletion.family_id == family_id]
         if status is not None:
             conditions.append(ChoreCompletion.status == status.value)
         if chore_id is not None:
             conditions.append(ChoreCompletion.chore_id == chore_id)
         if user_id is not None:
             conditions.append(ChoreCompletion.completed_by_id == user_id)
+        if cursor is not None:
+            conditions.append(
+                tuple_(ChoreCompletion.created_at, ChoreCompletion.id)
+                < tuple_(cursor.created_at, cursor.id)
+            )
 
         query = (
             select(
@@ -89,7 +99,7 @@ class ChoreCompletionRepository(BaseDals[ChoreCompletion]):
             .join(User, ChoreCompletion.completed_by_id == User.id)
             .join(Chore, ChoreCompletion.chore_id == Chore.id)
             .where(*conditions)
-            .order_by(ChoreCompletion.created_at.desc())
+            .order_by(ChoreCompletion.created_at.desc(), ChoreCompletion.id.desc())
             .limit(limit)
             .offset(offset)
         )
@@ -101,20 +111,20 @@ class ChoreCompletionRepository(BaseDals[ChoreCompletion]):
         return chores_completions
 
     async def get_family_chore_completion_detail(
-        self, chore_completion_id: UUID
-    ) -> ChoreCompletionDetailSchema | None:
+        self, chore_completion: ChoreCompletion
+    ) -> ChoreCompletionDetailSchema:
         """
-        Retrieves the detailed information for a specific chore completion,
-        including the chore details, the user who completed it, and the users
-        who have confirmed the completion.
+        Retrieves the detailed information for a chore completion already
+        loaded (by `ChoreCompletionPermission`): the chore details, the user who
+        completed it, and the users who have confirmed the completion.
 
         Args:
-            chore_completion_id (UUID): The ID of the chore completion whose details are to be fetched.
+            chore_completion (ChoreCompletion): The chore completion whose details are to be fetched.
 
         Returns:
-            ChoreCompletionDetailSchema | None: A Pydantic model representing the details of the
-            specified chore completion, including the chore, the user who completed it,
-            the status, and the users who confirmed it. Returns None if no matching completion is found.
+            ChoreCompletionDetailSchema: A Pydantic model representing the details of the
+            chore completion, including the chore, the user who completed it,
+            the status, and the users who confirmed it.
         """
         confirm_user = aliased(User)
 
@@ -122,40 +132,28 @@ class ChoreCompletionRepository(BaseDals[ChoreCompletion]):
             select(
                 func.json_build_object(
                     "id",
-                    ChoreCompletion.id,
-                    "chore",
-                    func.json_build_object(
-                        "id",
-                        Chore.id,
-                        "name",
-                        Chore.name,
-                        "description",
-                        Chore.description,
-                        "icon",
-                        Chore.icon,
-                        "valuation",
-                        Chore.valuation,
-                    ),
-                    "completed_by",
-                    func.json_build_object(
-                        "id",
-                        User.id,
-                        "username",
-                        User.username,
-                        "name",
-                        User.name,
-                        "surname",
-                        User.surname,
-                        "avatar_version",
-                        User.avatar_version,
-                    ),
-                    "completed_at",
-                    ChoreCompletion.created_at,
-                    "message",
-                    ChoreCompletion.message,
-                    "status",
-                    ChoreCompletion.status,
-                ).label("chore_completion"),
+                    Chore.id,
+                    "name",
+                    Chore.name,
+                    "description",
+                    Chore.description,
+                    "icon",
+                    Chore.icon,
+                    "valuation",
+                    Chore.valuation,
+                ).label("chore"),
+                func.json_build_object(
+                    "id",
+                    User.id,
+                    "username",
+                    User.username,
+                    "name",
+                    User.name,
+                    "surname",
+                    User.surname,
+                    "avatar_version",
+                    User.avatar_version,
+                ).label("completed_by"),
                 func.json_agg(
                     case(
                         (
@@ -182,18 +180,28 @@ class ChoreCompletionRepository(BaseDals[ChoreCompletion]):
                     )
                 ).label("confirmed_by"),
             )
-            .join(User, ChoreCompletion.completed_by_id == User.id)
-            .join(Chore, ChoreCompletion.chore_id == Chore.id)
+            .select_from(Chore)
+            .join(User, User.id == chore_completion.completed_by_id)
             .outerjoin(
                 ChoreConfirmation,
-                ChoreCompletion.id == ChoreConfirmation.chore_completion_id,
+                ChoreConfirmation.chore_completion_id == chore_completion.id,
             )
             .outerjoin(confirm_user, ChoreConfirmation.user_id == confirm_user.id)
-            .where(ChoreCompletion.id == chore_completion_id)
-            .group_by(ChoreCompletion.id, Chore.id, User.id)
+            .where(Chore.id == chore_completion.chore_id)
+            .group_by(Chore.id, User.id)
         )
 
         query_result = await self.db_session.execute(query)
-        item = query_result.mappings().first()
-
-        return ChoreCompletionDetailSchema.model_validate(item) if item else None
+        item = query_result.mappings().one()
+
+        return ChoreCompletionDetailSchema(
+            chore_completion=ChoreCompletionResponseSchema(
+                id=chore_completion.id,
+                chore=item["chore"],
+                completed_by=item["completed_by"],
+                completed_at=chore_completion.created_at,
+                status=StatusConfirmENUM(chore_completion.status).value,
+                message=chore_completion.message,
+            ),
+            confirmed_by=item["confirmed_by"],
+        )
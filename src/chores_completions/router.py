@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from chores.repository import ChoreRepository
+from chores.models import Chore
+from chores_completions.models import ChoreCompletion
 from chores_completions.repository import ChoreCompletionRepository
 from chores_completions.schemas import (
     ChoreCompletionCreateSchema,
@@ -15,13 +16,23 @@ from chores_completions.schemas import (
 from chores_completions.services import CreateChoreCompletion
 from core.enums import StatusConfirmENUM
 from core.exceptions.chores import ChoreNotFoundError
+from core.pagination import NEXT_CURSOR_HEADER, Cursor
 from core.permissions import (
     ChoreCompletionPermission,
     ChorePermission,
     FamilyMemberPermission,
+    get_permitted_chore,
+    get_permitted_chore_completion,
 )
-from core.query_depends import get_pagination_params
-from database_connection import get_db
+from core.query_depends import get_cursor, get_pagination_params
+from core.transactions import READ_ONLY, transaction
+from core.unit_of_work import (
+    UnitOfWork,
+    get_unit_of_work,
+    get_uow_session,
+    transaction_profile,
+)
+from database_connection import get_read_db
 from users.models import User
 
 logger = getLogger(__name__)
@@ -35,26 +46,29 @@ router = APIRouter()
     summary="Create a chore completion for a specific chore",
     description="Marks a chore as completed by the current user. May require confirmation from other family members.",
 )
+@transaction_profile(CreateChoreCompletion.transaction_profile)
 async def create_chore_completion(
     chore_id: UUID,
     body: ChoreCompletionCreateSchema,
     current_user: User = Depends(ChorePermission(only_admin=False)),
-    async_session: AsyncSession = Depends(get_db),
+    chore: Chore = Depends(get_permitted_chore),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ) -> Response:
-    async with async_session.begin():
-        try:
-            chore = await ChoreRepository(async_session).get_by_id(chore_id)
-            creator_service = CreateChoreCompletion(
-                user=current_user,
-                chore=chore,
-                message=body.message,
-                db_session=async_session,
-            )
-            await creator_service.run_process()
-        except ChoreNotFoundError:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Chore not found"
-            )
+    async def create() -> None:
+        creator_service = CreateChoreCompletion(
+            user=current_user,
+            chore=chore,
+            message=body.message,
+            db_session=uow.db_session,
+        )
+        await creator_service.run_process()
+
+    try:
+        await uow.run(create)
+    except ChoreNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Chore not found"
+        )
     return JSONResponse(
         content={"detail": "Chore completion was created"},
         status_code=201,
@@ -64,23 +78,36 @@ async def create_chore_completion(
 @router.get(
     path="",
     summary="Get a list of completed family chores sorted by date",
+    description=f"""
+Returns the family's chore completions, newest first.
+
+Pages can be requested with **offset** or, for deep pages, with **cursor**: the
+value of the `{NEXT_CURSOR_HEADER}` header of the previous page (the header is
+missing on the last page). A cursor page doesn't scan the skipped records.
+""",
     tags=["Chores completions"],
 )
 async def get_family_chores_completions(
+    response: Response,
     pagination: tuple[int, int] = Depends(get_pagination_params),
+    cursor: Cursor | None = Depends(get_cursor),
     status: StatusConfirmENUM | None = None,
     chore_id: UUID | None = Query(None),
     user_id: UUID | None = Query(None),
     current_user: User = Depends(FamilyMemberPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    read_session: AsyncSession = Depends(get_read_db),
 ) -> list[ChoreCompletionResponseSchema]:
-    async with async_session.begin():
+    async with transaction(read_session, READ_ONLY):
         offset, limit = pagination
-        data_service = ChoreCompletionRepository(async_session)
+        data_service = ChoreCompletionRepository(read_session)
         result_response = await data_service.get_family_chore_completion(
-            current_user.family_id, offset, limit, status, chore_id, user_id
+            current_user.family_id, offset, limit, status, chore_id, user_id, cursor
         )
-        return result_response
+    if result_response and len(result_response) == limit:
+        last = result_response[-1]
+        next_cursor = Cursor(created_at=last.completed_at, id=last.id)
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor.encode()
+    return result_response
 
 
 # Get family's chore completion detail
@@ -92,11 +119,11 @@ async def get_family_chores_completions(
 async def get_family_chore_completion_detail(
     chore_completion_id: UUID,
     current_user: User = Depends(ChoreCompletionPermission()),
-    async_session: AsyncSession = Depends(get_db),
-) -> ChoreCompletionDetailSchema | None:
-    async with async_session.begin():
-        data_service = ChoreCompletionRepository(async_session)
-        result_response = await data_service.get_family_chore_completion_detail(
-            chore_completion_id
-        )
-        return result_response
+    chore_completion: ChoreCompletion = Depends(get_permitted_chore_completion),
+    async_session: AsyncSession = Depends(get_uow_session),
+) -> ChoreCompletionDetailSchema:
+    data_service = ChoreCompletionRepository(async_session)
+    result_response = await data_service.get_family_chore_completion_detail(
+        chore_completion
+    )
+    return result_response
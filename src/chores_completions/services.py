@@ -4,17 +4,20 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import ENABLE_CLICKHOUSE
-from database_connection import rabbit_client
 from chores.models import Chore
 from chores_completions.models import ChoreCompletion
 from chores_completions.repository import ChoreCompletionRepository
 from chores_confirmations.repository import ChoreConfirmationRepository
-from core.enums import StatusConfirmENUM
+from core.enums import OutboxTopicEnum, StatusConfirmENUM
 from core.services import BaseService
+from core.transactions import MONEY_MOVEMENT
 from core.validators import (
     validate_chore_completion_is_changable,
     validate_chore_is_active,
 )
+from outbox.repository import OutboxRepository
+from statistics.cache import stats_cache
+from statistics.repository import DailyCompletionCountRepository
 from users.models import User
 from users.repository import UserPermissionsRepository
 from wallets.services import CoinsRewardService
@@ -22,6 +25,9 @@ from wallets.services import CoinsRewardService
 
 @dataclass
 class CreateChoreCompletion(BaseService[ChoreCompletion]):
+    # may approve the completion right away and reward the user
+    transaction_profile = MONEY_MOVEMENT
+
     user: User
     chore: Chore
     message: str
@@ -78,13 +84,23 @@ class CreateChoreCompletion(BaseService[ChoreCompletion]):
 
 @dataclass
 class ApproveChoreCompletion(BaseService[None]):
+    transaction_profile = MONEY_MOVEMENT
+
     chore_completion: ChoreCompletion
     db_session: AsyncSession
 
     async def process(self) -> None:
         await self.change_chore_completion_status()
+        await DailyCompletionCountRepository(db_session=self.db_session).increment(
+            self.chore_completion
+        )
+        stats_cache.invalidate_on_commit(
+            self.db_session,
+            self.chore_completion.family_id,
+            self.chore_completion.completed_by_id,
+        )
         if ENABLE_CLICKHOUSE:
-            await self.rabbit_publish()
+            await self.add_outbox_event()
         await self.send_reward()
 
     async def change_chore_completion_status(self):
@@ -92,7 +108,8 @@ class ApproveChoreCompletion(BaseService[None]):
         self.chore_completion.status = StatusConfirmENUM.approved
         await chore_completion_dal.update(self.chore_completion)
 
-    async def rabbit_publish(self):
+    async def add_outbox_event(self):
+        # delivered by the outbox relay once this transaction has committed
         message = {
             "id": str(self.chore_completion.id),
             "family_id": str(self.chore_completion.family_id),
@@ -100,7 +117,9 @@ class ApproveChoreCompletion(BaseService[None]):
             "completed_by_id": str(self.chore_completion.completed_by_id),
             "created_at": int(self.chore_completion.created_at.timestamp() * 1_000_000),
         }
-        await rabbit_client.publish(message=message)
+        await OutboxRepository(db_session=self.db_session).add(
+            OutboxTopicEnum.chore_completion_approved, message
+        )
 
     async def send_reward(self):
         service = CoinsRewardService(
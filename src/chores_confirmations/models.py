@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Enum, ForeignKey
+from sqlalchemy import Enum, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.enums import StatusConfirmENUM
@@ -9,6 +9,14 @@ from core.models import Base, BaseUserModel
 
 class ChoreConfirmation(Base, BaseUserModel):
     __tablename__ = "chore_confirmation"
+    __table_args__ = (
+        Index("ix_chore_confirmation_user_id_status", "user_id", "status"),
+        Index(
+            "ix_chore_confirmation_chore_completion_id_status",
+            "chore_completion_id",
+            "status",
+        ),
+    )
 
     chore_completion_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey(column="chore_completion.id", ondelete="CASCADE")
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from chores_completions.services import ApproveChoreCompletion
 from chores_confirmations.repository import ChoreConfirmationRepository
 from chores_confirmations.schemas import (
     ChoreConfirmationResponseSchema,
@@ -15,7 +16,12 @@ from core.enums import StatusConfirmENUM
 from core.exceptions.base_exceptions import CanNotBeChangedError
 from core.permissions import ChoreConfirmationPermission, IsAuthenicatedPermission
 from core.query_depends import get_pagination_params
-from database_connection import get_db
+from core.unit_of_work import (
+    UnitOfWork,
+    get_unit_of_work,
+    get_uow_session,
+    transaction_profile,
+)
 from users.models import User
 
 logger = getLogger(__name__)
@@ -32,14 +38,13 @@ async def get_my_chores_confirmations(
     pagination: tuple[int, int] = Depends(get_pagination_params),
     status: StatusConfirmENUM | None = None,  # by default we return all confirmations
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> list[ChoreConfirmationResponseSchema]:
     offset, limit = pagination
-    async with async_session.begin():
-        data_service = ChoreConfirmationRepository(db_session=async_session)
-        result = await data_service.get_user_chore_confirmations(
-            current_user.id, status, offset, limit
-        )
+    data_service = ChoreConfirmationRepository(db_session=async_session)
+    result = await data_service.get_user_chore_confirmations(
+        current_user.id, status, offset, limit
+    )
     return result
 
 
@@ -48,21 +53,24 @@ async def get_my_chores_confirmations(
     summary="Update the status of a chore confirmation",
     tags=["Chores confiramtions"],
 )
+# the last approval approves the chore completion and rewards the user
+@transaction_profile(ApproveChoreCompletion.transaction_profile)
 async def change_status_chore_confirmation(
     chore_confirmation_id: UUID,
     body: ChoreConfirmationSetStatusSchema,
     current_user: User = Depends(ChoreConfirmationPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ) -> JSONResponse:
-    async with async_session.begin():
-        try:
-            await set_status_chore_confirmation(
-                chore_confirmation_id, body.status, async_session
-            )
-        except CanNotBeChangedError as e:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"{e}",
+    try:
+        await uow.run(
+            lambda: set_status_chore_confirmation(
+                chore_confirmation_id, body.status, uow.db_session
             )
+        )
+    except CanNotBeChangedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"{e}",
+        )
 
     return JSONResponse(content={"detail": "OK"}, status_code=201)
@@ -0,0 +1,60 @@
+import time
+
+from core.metrics import metrics
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a dependency is down.
+
+    After `failure_threshold` consecutive failures the breaker opens and calls
+    are rejected without touching the dependency. Once `reset_timeout` seconds
+    have passed a single trial call is let through (half-open): its success
+    closes the breaker, its failure opens it again. A trial that never reports
+    back (e.g. cancelled) is replaced by a new one after `reset_timeout`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        # open: time for a trial; half-open: the trial didn't report back
+        if now - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self.opened_at = now
+            return True
+        metrics.increment(f"circuit_breaker.{self.name}.rejected")
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                metrics.increment(f"circuit_breaker.{self.name}.opened")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def record_aborted(self) -> None:
+        """The call ended without a verdict on the dependency (cancelled, or
+        failed for another reason), a pending trial counts as failed"""
+        if self.state == self.HALF_OPEN:
+            self.record_failure()
+
+    def as_dict(self) -> dict:
+        return {"state": self.state, "failures": self.failures}
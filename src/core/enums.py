@@ -8,6 +8,10 @@ class StorageFolderEnum(enum.Enum):
     product_avatars = "products_avatars"
 
 
+class OutboxTopicEnum(enum.Enum):
+    chore_completion_approved = "chore_completion.approved"
+
+
 class PostgreSQLEnum(enum.Enum):
     @classmethod
     def get_subclasses(cls):
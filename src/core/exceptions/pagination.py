@@ -0,0 +1,6 @@
+from core.exceptions.base_exceptions import BaseAPIException
+
+
+class InvalidCursorError(BaseAPIException):
+    def __init__(self, message="The pagination cursor is invalid."):
+        super().__init__(message)
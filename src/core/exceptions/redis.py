@@ -0,0 +1,8 @@
+from core.exceptions.base_exceptions import BaseAPIException
+
+
+class RedisUnavailableError(BaseAPIException):
+    def __init__(
+        self, message="The service is temporarily unavailable, try again later."
+    ):
+        super().__init__(message)
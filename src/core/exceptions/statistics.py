@@ -0,0 +1,12 @@
+from core.exceptions.base_exceptions import BaseAPIException
+
+
+class StatisticsError(BaseAPIException):
+    """Base exception for all errors related to statistics."""
+
+    pass
+
+
+class DateRangeTooLongError(StatisticsError):
+    def __init__(self, max_days: int):
+        super().__init__(f"The date range cannot be longer than {max_days} days.")
@@ -0,0 +1,8 @@
+from core.exceptions.base_exceptions import ConflictError
+
+
+class TransactionConflictError(ConflictError):
+    def __init__(
+        self, message="The operation conflicted with a concurrent one, try again."
+    ):
+        super().__init__(message)
@@ -20,3 +20,8 @@ class TransactionNotFoundError(WalletError, ObjectNotFoundError):
 class NotEnoughCoins(WalletError):
     def __init__(self, message="User does not have enough coins for the transaction."):
         super().__init__(message)
+
+
+class SelfTransferError(WalletError):
+    def __init__(self, message="Coins can't be transferred to the same wallet."):
+        super().__init__(message)
@@ -21,6 +21,7 @@ from core.exceptions.image_exceptions import (
     ImageSizeTooLargeError,
     NotAllowdedContentTypes,
 )
+from core.exceptions.redis import RedisUnavailableError
 from database_connection import redis_client
 from core.services import BaseService
 from core.storage import LocalStorageService, PresignedUrl, get_s3_client
@@ -28,6 +29,7 @@ from families.models import Family
 from families.repository import FamilyRepository
 from products.models import Product
 from products.repository import ProductRepository
+from users.cache import user_cache
 from users.models import User
 from users.repository import UserRepository
 
@@ -55,7 +57,6 @@ class OldGetAvatarService(BaseService[str | None]):
     folder: StorageFolderEnum
 
     async def process(self) -> str | None:
-        self.redis = await redis_client.get_client()
         url = await self.get_url_from_redis()
 
         if url == "no_avatar":
@@ -70,11 +71,22 @@ class OldGetAvatarService(BaseService[str | None]):
                 await self.set_url_redis(url)
         return url
 
+    # the url cache is optional: without redis the url is generated every time
     async def get_url_from_redis(self) -> str | None:
-        return await self.redis.get(str(self.object_id))
+        try:
+            return await redis_client.run(lambda redis: redis.get(str(self.object_id)))
+        except RedisUnavailableError:
+            return None
 
     async def set_url_redis(self, url: str) -> None:
-        await self.redis.set(str(self.object_id), url, ex=USER_URL_AVATAR_EXPIRE)
+        try:
+            await redis_client.run(
+                lambda redis: redis.set(
+                    str(self.object_id), url, ex=USER_URL_AVATAR_EXPIRE
+                )
+            )
+        except RedisUnavailableError:
+            pass
 
     async def get_url_from_s3_storage(self) -> str | None:
         s3_storage = get_s3_client()
@@ -166,8 +178,12 @@ class UploadAvatarService(BaseService[str]):
             folder=folder,
         )
         presigned_url = await s3_client.generate_presigned_url(object_key, folder)
-        redis = await redis_client.get_client()
-        await redis.set(object_key, presigned_url, ex=expire)
+        try:
+            await redis_client.run(
+                lambda redis: redis.set(object_key, presigned_url, ex=expire)
+            )
+        except RedisUnavailableError:
+            pass
         return presigned_url
 
     async def upload_to_local_storage(self, folder: StorageFolderEnum) -> str:
@@ -187,7 +203,11 @@ class UploadAvatarService(BaseService[str]):
         else:
             self.target_object.avatar_version += 1
         self.db_session.add(self.target_object)
-        await self.db_session.commit()
+        await self.db_session.flush()
+        if isinstance(self.target_object, User):
+            await user_cache.invalidate_on_commit(
+                self.db_session, self.target_object.id
+            )
 
     def validate_content_type(self):
         self.content_type = self.file.content_type
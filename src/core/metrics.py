@@ -0,0 +1,71 @@
+from collections import defaultdict
+from collections.abc import Callable
+from dataclasses import dataclass
+from threading import Lock
+
+
+@dataclass
+class TimingStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict[str, float]:
+        average = self.total / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "total": round(self.total, 6),
+            "avg": round(average, 6),
+            "max": round(self.max, 6),
+        }
+
+
+class MetricsRegistry:
+    """
+    In-process registry of application metrics.
+
+    Counters and timings are pushed by the code that owns them, collectors are
+    pulled when a snapshot is taken (e.g. connection pool state).
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters: dict[str, int] = defaultdict(int)
+        self._timings: dict[str, TimingStats] = defaultdict(TimingStats)
+        self._gauges: dict[str, float] = {}
+        self._collectors: dict[str, Callable[[], dict]] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            self._timings[name].add(value)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self._lock:
+            self._gauges[name] = value
+
+    def register_collector(self, name: str, collector: Callable[[], dict]) -> None:
+        self._collectors[name] = collector
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {
+                "counters": dict(self._counters),
+                "timings": {k: v.as_dict() for k, v in self._timings.items()},
+                "gauges": dict(self._gauges),
+            }
+        result["collectors"] = {
+            name: collector() for name, collector in self._collectors.items()
+        }
+        return result
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,38 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from uuid import UUID
+
+from core.exceptions.pagination import InvalidCursorError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Position in a list ordered by (created_at, id) descending. Sent to clients
+    as an opaque url-safe string, the next page starts right after it.
+    `created_at` is naive UTC, like the columns it is compared with.
+    """
+
+    created_at: datetime
+    id: UUID
+
+    def encode(self) -> str:
+        data = json.dumps([self.created_at.isoformat(), str(self.id)])
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "Cursor":
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+            created_at, id = datetime.fromisoformat(created_at), UUID(id)
+        except (binascii.Error, ValueError, TypeError):
+            raise InvalidCursorError()
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        return cls(created_at=created_at, id=id)
@@ -1,4 +1,5 @@
-from typing import Any
+from typing import Any, TypeVar
+from uuid import UUID
 
 from fastapi import Depends, Request, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
@@ -11,37 +12,67 @@ from chores_completions.models import ChoreCompletion
 from chores_confirmations.models import ChoreConfirmation
 from core.exceptions.http_exceptions import permission_denided
 from core.security import get_payload_from_jwt_token
-from database_connection import get_db
+from core.unit_of_work import UnitOfWork, get_unit_of_work
 from products.models import Product
 from users.models import User, UserFamilyPermissions
 from users.repository import UserRepository
 
 security = HTTPBearer()
 
+T = TypeVar("T")
+
 
 class BasePermission:
     """
     Base permission class to be inherited by all custom permissions.
     Defines the interface for checking user permissions and extracting the user.
+
+    Permissions that load the requested resource together with the user
+    override `get_user_and_resource`; the resource is kept on `request.state`
+    and handed to the handler by `get_permitted_resource` dependencies.
     """
 
     async def __call__(
         self,
         request: Request,
         credentials: HTTPAuthorizationCredentials = Security(security),
-        async_session: AsyncSession = Depends(get_db),
+        uow: UnitOfWork = Depends(get_unit_of_work),
     ) -> User:
         token = credentials.credentials
         token_payload = get_payload_from_jwt_token(token)
-        async with async_session.begin():
-            user = await self.get_user_and_check_permission(
+
+        async def check_permission() -> User:
+            user, resource = await self.get_user_and_resource(
                 token_payload=token_payload,
                 http_method=request.method,
-                async_session=async_session,
+                async_session=uow.db_session,
                 **request.path_params,
             )
+            request.state.permitted_resource = resource
+            return user
+
+        # the check runs in the request's unit of work and is replayed
+        # if the handler has to restart the transaction
+        await uow.begin()
+        user = await check_permission()
+        uow.on_retry(check_permission)
         return user
 
+    async def get_user_and_resource(
+        self,
+        token_payload: dict[str, Any],
+        http_method: str,
+        async_session: AsyncSession,
+        **kwargs,
+    ) -> tuple[User, Any]:
+        user = await self.get_user_and_check_permission(
+            token_payload=token_payload,
+            http_method=http_method,
+            async_session=async_session,
+            **kwargs,
+        )
+        return user, None
+
     async def get_user_and_check_permission(
         self,
         token_payload: dict[str, Any],
@@ -64,11 +95,12 @@ class IsAuthenicatedPermission(BasePermission):
         async_session: AsyncSession,
         **kwargs,
     ) -> User:
-        user_id = token_payload.get("sub")
-        if user_id is None:
+        try:
+            user_id = UUID(token_payload["sub"])
+        except (KeyError, ValueError):
             raise permission_denided
         user_dal = UserRepository(async_session)
-        user = await user_dal.get_by_id(user_id)
+        user = await user_dal.get_cached_by_id(user_id)
 
         return user
 
@@ -153,19 +185,20 @@ class ChorePermission(BasePermission):
     """
     Permission that checks whether the user has access to a specific chore in their family.
     If `only_admin=True`, access is granted only to family admins.
+    The chore is available to the handler through `get_permitted_chore`.
     """
 
     def __init__(self, only_admin: bool = False):
         self.only_admin = only_admin
         super().__init__()
 
-    async def get_user_and_check_permission(
+    async def get_user_and_resource(
         self,
         token_payload: dict[str, Any],
         http_method: str,
         async_session: AsyncSession,
         **kwargs,
-    ) -> User:
+    ) -> tuple[User, Chore]:
         if self.only_admin:
             user_is_family_admin = token_payload.get("is_family_admin")
             if not user_is_family_admin:
@@ -173,51 +206,48 @@ class ChorePermission(BasePermission):
 
         chore_id = kwargs.get("chore_id")
         user_id = token_payload.get("sub")
-        query = select(User).where(
+        query = select(User, Chore).where(
             User.id == user_id,
-            exists().where(
-                (Chore.id == chore_id) & (User.family_id == Chore.family_id)
-            ),
+            Chore.id == chore_id,
+            Chore.family_id == User.family_id,
         )
 
         result = await async_session.execute(query)
-        user = result.scalars().first()
+        row = result.first()
 
-        if user is None:
+        if row is None:
             raise permission_denided
-        return user
+        return row.User, row.Chore
 
 
 class ChoreCompletionPermission(BasePermission):
     """
     Permission that checks whether the user has access to a specific chore completion record
     through shared family association.
+    The completion is available to the handler through `get_permitted_chore_completion`.
     """
 
-    async def get_user_and_check_permission(
+    async def get_user_and_resource(
         self,
         token_payload: dict[str, Any],
         http_method: str,
         async_session: AsyncSession,
         **kwargs,
-    ) -> User:
+    ) -> tuple[User, ChoreCompletion]:
         chore_completion_id = kwargs.get("chore_completion_id")
         user_id = token_payload.get("sub")
-        query = select(User).where(
+        query = select(User, ChoreCompletion).where(
             User.id == user_id,
-            exists().where(
-                (ChoreCompletion.id == chore_completion_id)
-                & (ChoreCompletion.chore_id == Chore.id)
-                & (User.family_id == Chore.family_id)
-            ),
+            ChoreCompletion.id == chore_completion_id,
+            ChoreCompletion.family_id == User.family_id,
         )
 
         result = await async_session.execute(query)
-        user = result.scalars().first()
+        row = result.first()
 
-        if user is None:
+        if row is None:
             raise permission_denided
-        return user
+        return row.User, row.ChoreCompletion
 
 
 class ChoreConfirmationPermission(BasePermission):
@@ -254,39 +284,38 @@ class ChoreConfirmationPermission(BasePermission):
 class ProductPermission(BasePermission):
     """
     Permission that checks if the user has access to a product belonging to their family.
+    The product is available to the handler through `get_permitted_product`.
     """
 
     def __init__(self, only_owner: bool = False):
         self.only_owner = only_owner
         super().__init__()
 
-    async def get_user_and_check_permission(
+    async def get_user_and_resource(
         self,
         token_payload: dict[str, Any],
         http_method: str,
         async_session: AsyncSession,
         **kwargs,
-    ) -> User:
+    ) -> tuple[User, Product]:
         product_id = kwargs.get("product_id")
         user_id = token_payload.get("sub")
 
-        exists_query = (
-            select(Product)
-            .where(Product.id == product_id)
-            .where(Product.family_id == User.family_id)
+        query = select(User, Product).where(
+            User.id == user_id,
+            Product.id == product_id,
+            Product.family_id == User.family_id,
         )
 
         if self.only_owner:
-            exists_query = exists_query.where(Product.seller_id == user_id)
-
-        query = select(User).where(User.id == user_id).where(exists(exists_query))
+            query = query.where(Product.seller_id == User.id)
 
         result = await async_session.execute(query)
-        user = result.scalars().first()
+        row = result.first()
 
-        if user is None:
+        if row is None:
             raise permission_denided
-        return user
+        return row.User, row.Product
 
 
 class FamilyInvitePermission(BasePermission):
@@ -320,3 +349,26 @@ class FamilyInvitePermission(BasePermission):
             raise permission_denided
 
         return user
+
+
+def get_permitted_resource(request: Request, model: type[T]) -> T:
+    resource = getattr(request.state, "permitted_resource", None)
+    if not isinstance(resource, model):
+        # the route must declare the matching permission before this dependency
+        raise RuntimeError(f"{model.__name__} was not loaded by the permission")
+    return resource
+
+
+def get_permitted_chore(request: Request) -> Chore:
+    """Dependency for getting the chore loaded by `ChorePermission`"""
+    return get_permitted_resource(request, Chore)
+
+
+def get_permitted_chore_completion(request: Request) -> ChoreCompletion:
+    """Dependency for getting the completion loaded by `ChoreCompletionPermission`"""
+    return get_permitted_resource(request, ChoreCompletion)
+
+
+def get_permitted_product(request: Request) -> Product:
+    """Dependency for getting the product loaded by `ProductPermission`"""
+    return get_permitted_resource(request, Product)
@@ -1,8 +1,18 @@
 from fastapi import Query
 
+from core.pagination import Cursor
+
 
 def get_pagination_params(
     offset: int = Query(0, ge=0),
     limit: int = Query(10, le=50),
 ):
     return offset, limit
+
+
+def get_cursor(
+    cursor: str | None = Query(
+        None, description="Value of X-Next-Cursor of the previous page"
+    ),
+) -> Cursor | None:
+    return Cursor.decode(cursor) if cursor else None
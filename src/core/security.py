@@ -1,3 +1,5 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException
@@ -5,7 +7,15 @@ from jose import ExpiredSignatureError, JWTError, jwt
 from starlette import status
 
 import config
+from core.cache import TTLLRUCache
 from core.exceptions.http_exceptions import credentials_exception
+from core.metrics import metrics
+
+# Tokens are kept no longer than their `exp`, so an expired token always goes
+# through full verification again and gets the usual 401.
+verified_tokens = TTLLRUCache[str, dict](
+    maxsize=config.TOKEN_CACHE_SIZE, ttl=config.TOKEN_CACHE_MAX_TTL
+)
 
 
 def create_jwt_token(data: dict, expires_delta: timedelta | None = None) -> str:
@@ -24,7 +34,41 @@ def create_jwt_token(data: dict, expires_delta: timedelta | None = None) -> str:
     return jwt.encode(to_encode, config.SECRET_KEY, algorithm=config.ALGORITHM)
 
 
-def get_payload_from_jwt_token(token: str):
+def get_token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def get_payload_from_jwt_token(token: str, use_cache: bool = True):
+    """
+    Verifies the token and returns its payload. Verified payloads are cached by
+    the token digest until the token expires: tokens can't be revoked, so a
+    cached one is accepted exactly as long as the signature check would.
+    """
+    digest = get_token_digest(token)
+    if use_cache and config.TOKEN_CACHE_SIZE:
+        payload = verified_tokens.get(digest)
+        if payload is not None:
+            metrics.increment("auth.token_cache.hits")
+            return payload.copy()
+        metrics.increment("auth.token_cache.misses")
+
+    payload = _decode_jwt_token(token)
+
+    if use_cache and config.TOKEN_CACHE_SIZE:
+        ttl = _get_seconds_to_expire(payload)
+        if ttl > 0:
+            verified_tokens.set(digest, payload.copy(), ttl=ttl)
+    return payload
+
+
+def _get_seconds_to_expire(payload: dict) -> float:
+    expire = payload.get("exp")
+    if expire is None:
+        return config.TOKEN_CACHE_MAX_TTL
+    return min(float(expire) - time.time(), config.TOKEN_CACHE_MAX_TTL)
+
+
+def _decode_jwt_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
     except ExpiredSignatureError:
@@ -3,6 +3,8 @@ from abc import ABCMeta, abstractmethod
 from collections.abc import Callable
 from typing import Generic, TypeVar
 
+from core.transactions import STANDARD_WRITE, TransactionProfile
+
 T = TypeVar("T")
 
 
@@ -23,8 +25,13 @@ class BaseService(Generic[T], metaclass=ABCMeta):
 
         process() -> any:
             Abstract method that must be implemented in subclasses to define the main processing logic.
+
+    Attributes:
+        transaction_profile: The transaction profile callers should run the service with.
     """
 
+    transaction_profile: TransactionProfile = STANDARD_WRITE
+
     def get_validators(self) -> list[Callable]:
         """Returns a list of validator functions."""
         return []
@@ -0,0 +1,145 @@
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, TypeVar
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.exceptions.transactions import TransactionConflictError
+from core.metrics import metrics
+
+T = TypeVar("T")
+
+SERIALIZATION_FAILURE = "40001"
+DEADLOCK_DETECTED = "40P01"
+RETRYABLE_SQLSTATES = {SERIALIZATION_FAILURE, DEADLOCK_DETECTED}
+
+AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
+
+@dataclass(frozen=True)
+class TransactionProfile:
+    """
+    Describes how a transaction is started and retried.
+
+    - isolation_level: PostgreSQL isolation level of the transaction
+    - read_only: starts the transaction as READ ONLY
+    - max_retries: how many times a serialization failure or deadlock is retried
+    """
+
+    name: str
+    isolation_level: str
+    read_only: bool = False
+    max_retries: int = 0
+    backoff_base: float = 0.01
+    backoff_max: float = 0.5
+
+    def get_backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+
+READ_ONLY = TransactionProfile(
+    name="read_only",
+    isolation_level="READ COMMITTED",
+    read_only=True,
+)
+STANDARD_WRITE = TransactionProfile(
+    name="standard_write",
+    isolation_level="READ COMMITTED",
+    max_retries=2,
+)
+MONEY_MOVEMENT = TransactionProfile(
+    name="money_movement",
+    isolation_level="SERIALIZABLE",
+    max_retries=5,
+)
+
+
+def is_retryable_error(error: DBAPIError) -> bool:
+    sqlstate = getattr(error.orig, "sqlstate", None)
+    return sqlstate in RETRYABLE_SQLSTATES
+
+
+async def apply_transaction_profile(
+    db_session: AsyncSession, profile: TransactionProfile
+) -> None:
+    """Must be called before the first statement of the transaction"""
+    await db_session.connection(
+        execution_options={
+            "isolation_level": profile.isolation_level,
+            "postgresql_readonly": profile.read_only,
+        }
+    )
+
+
+def call_after_commit(
+    db_session: AsyncSession, callback: Callable[[], Awaitable]
+) -> None:
+    """
+    Schedules `callback` to run after the current transaction of the session is
+    committed (e.g. cache invalidation). Dropped if the transaction rolls back.
+    """
+    db_session.info.setdefault(AFTER_COMMIT_CALLBACKS, []).append(callback)
+
+
+async def run_after_commit_callbacks(db_session: AsyncSession) -> None:
+    for callback in db_session.info.pop(AFTER_COMMIT_CALLBACKS, []):
+        await callback()
+
+
+def discard_after_commit_callbacks(db_session: AsyncSession) -> None:
+    db_session.info.pop(AFTER_COMMIT_CALLBACKS, None)
+
+
+@asynccontextmanager
+async def transaction(
+    db_session: AsyncSession, profile: TransactionProfile = STANDARD_WRITE
+) -> AsyncIterator[AsyncSession]:
+    """Begins a transaction with the given profile, without retries"""
+    try:
+        async with db_session.begin():
+            await apply_transaction_profile(db_session, profile)
+            yield db_session
+    except BaseException:
+        discard_after_commit_callbacks(db_session)
+        raise
+    await run_after_commit_callbacks(db_session)
+
+
+async def run_in_transaction(
+    db_session: AsyncSession,
+    operation: Callable[[], Awaitable[T]],
+    profile: TransactionProfile = STANDARD_WRITE,
+) -> T:
+    """
+    Runs `operation` in a transaction with the given profile and retries it with
+    backoff on serialization failures and deadlocks.
+
+    A retry starts after a rollback, which expires every object of the session,
+    so `operation` must (re)load the rows it works with instead of relying on
+    objects loaded before the call.
+    """
+    attempt = 0
+    while True:
+        try:
+            async with transaction(db_session, profile):
+                result = await operation()
+        except DBAPIError as e:
+            if not is_retryable_error(e):
+                raise
+            if attempt >= profile.max_retries:
+                metrics.increment(f"db.transactions.{profile.name}.retries_exhausted")
+                raise TransactionConflictError() from e
+
+            attempt += 1
+            metrics.increment(f"db.transactions.{profile.name}.retries")
+            await asyncio.sleep(profile.get_backoff(attempt))
+        else:
+            metrics.increment(f"db.transactions.{profile.name}.committed")
+            if attempt:
+                metrics.increment(f"db.transactions.{profile.name}.committed_on_retry")
+            return result
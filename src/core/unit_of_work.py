@@ -0,0 +1,145 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import AsyncGenerator, TypeVar
+
+from fastapi import Depends, Request
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.exceptions.transactions import TransactionConflictError
+from core.metrics import metrics
+from core.transactions import (
+    READ_ONLY,
+    STANDARD_WRITE,
+    TransactionProfile,
+    apply_transaction_profile,
+    discard_after_commit_callbacks,
+    is_retryable_error,
+    run_after_commit_callbacks,
+)
+from database_connection import get_db
+
+T = TypeVar("T")
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class UnitOfWork:
+    """
+    Request-scoped transaction shared by the permission check and the handler.
+
+    The transaction is started by the first `begin()` call with the profile
+    declared by the route and is committed once, when the request is finished
+    (or by `run()`). Steps registered with `on_retry` (the permission check) are
+    replayed when `run()` restarts the transaction after a serialization failure.
+    """
+
+    def __init__(self, db_session: AsyncSession, profile: TransactionProfile):
+        self.db_session = db_session
+        self.profile = profile
+        self._retry_steps: list[Callable[[], Awaitable]] = []
+
+    async def begin(self) -> None:
+        if self.db_session.in_transaction():
+            return
+        await self.db_session.begin()
+        await apply_transaction_profile(self.db_session, self.profile)
+
+    def on_retry(self, step: Callable[[], Awaitable]) -> None:
+        self._retry_steps.append(step)
+
+    async def commit(self) -> None:
+        if self.db_session.in_transaction():
+            await self.db_session.commit()
+        await run_after_commit_callbacks(self.db_session)
+
+    async def rollback(self) -> None:
+        if self.db_session.in_transaction():
+            await self.db_session.rollback()
+        discard_after_commit_callbacks(self.db_session)
+
+    async def run(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs `operation` and commits the unit of work. On serialization failures
+        and deadlocks the transaction is rolled back and restarted, the
+        registered steps are replayed (which refreshes the objects they load)
+        and `operation` is retried according to the route's profile.
+        """
+        attempt = 0
+        while True:
+            try:
+                await self.begin()
+                if attempt:
+                    for step in self._retry_steps:
+                        await step()
+                result = await operation()
+                await self.commit()
+            except DBAPIError as e:
+                await self.rollback()
+                if not is_retryable_error(e):
+                    raise
+                if attempt >= self.profile.max_retries:
+                    metrics.increment(
+                        f"db.transactions.{self.profile.name}.retries_exhausted"
+                    )
+                    raise TransactionConflictError() from e
+
+                attempt += 1
+                metrics.increment(f"db.transactions.{self.profile.name}.retries")
+                await asyncio.sleep(self.profile.get_backoff(attempt))
+            else:
+                metrics.increment(f"db.transactions.{self.profile.name}.committed")
+                if attempt:
+                    metrics.increment(
+                        f"db.transactions.{self.profile.name}.committed_on_retry"
+                    )
+                return result
+
+
+def transaction_profile(profile: TransactionProfile):
+    """
+    Declares the transaction profile of a route handler. Must be placed below
+    the router decorator:
+
+        @router.post("/transfer")
+        @transaction_profile(MONEY_MOVEMENT)
+        async def transfer(...): ...
+    """
+
+    def decorator(endpoint):
+        endpoint.transaction_profile = profile
+        return endpoint
+
+    return decorator
+
+
+def get_route_transaction_profile(request: Request) -> TransactionProfile:
+    """Declared profile of the route or the default one for its HTTP method"""
+    endpoint = request.scope.get("endpoint")
+    profile = getattr(endpoint, "transaction_profile", None)
+    if profile is not None:
+        return profile
+    return READ_ONLY if request.method in READ_METHODS else STANDARD_WRITE
+
+
+async def get_unit_of_work(
+    request: Request,
+    db_session: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[UnitOfWork, None]:
+    """Dependency for getting the unit of work of the request"""
+    uow = UnitOfWork(db_session, get_route_transaction_profile(request))
+    try:
+        yield uow
+    except Exception:
+        await uow.rollback()
+        raise
+    else:
+        await uow.commit()
+
+
+async def get_uow_session(
+    uow: UnitOfWork = Depends(get_unit_of_work),
+) -> AsyncSession:
+    """Dependency for getting the session of the request's unit of work"""
+    await uow.begin()
+    return uow.db_session
@@ -1,27 +1,240 @@
+import asyncio
 import json
-from typing import AsyncGenerator
+import os
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, fields
+from datetime import datetime, timezone
+from typing import AsyncGenerator, TypeVar
+from uuid import UUID
 
 import aio_pika
 import redis.asyncio as aioredis
 import clickhouse_connect
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import RedisError
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 import config
+from core.circuit_breaker import CircuitBreaker
+from core.exceptions.redis import RedisUnavailableError
+from core.metrics import metrics
 
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Pool and driver settings of the SQLAlchemy engine"""
+
+    name: str
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    pool_recycle: int
+    pool_pre_ping: bool
+    statement_cache_size: int
+    echo: bool
+
+    @classmethod
+    def from_config(cls, name: str) -> "EngineProfile":
+        if name not in config.DB_ENGINE_PROFILES:
+            raise ValueError(f"Unknown database engine profile: {name}")
+        values = dict(config.DB_ENGINE_PROFILES[name])
+
+        for field in fields(cls):
+            env_value = os.getenv(f"DB_{field.name.upper()}")
+            if field.name == "name" or env_value is None:
+                continue
+            if field.type is bool:
+                values[field.name] = env_value.lower() in ("1", "true", "yes")
+            else:
+                values[field.name] = int(env_value)
+        return cls(name=name, **values)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool which measures how long checkouts wait for a connection"""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            metrics.increment(f"db.pool.{self._metrics_name}.timeouts")
+            raise
+        finally:
+            metrics.observe(
+                f"db.pool.{self._metrics_name}.checkout_wait",
+                time.perf_counter() - started,
+            )
+
+    @property
+    def _metrics_name(self) -> str:
+        return getattr(self, "metrics_name", "primary")
+
+
+def create_engine_from_profile(
+    url: str, profile: EngineProfile, metrics_name: str = "primary"
+) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url=url,
+        future=True,
+        echo=profile.echo,
+        poolclass=InstrumentedQueuePool,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_recycle=profile.pool_recycle,
+        pool_pre_ping=profile.pool_pre_ping,
+        connect_args={
+            # SQLAlchemy-level cache of prepared statements per connection
+            "prepared_statement_cache_size": profile.statement_cache_size,
+            # asyncpg's own statement cache
+            "statement_cache_size": profile.statement_cache_size,
+        },
+    )
+    new_engine.pool.metrics_name = metrics_name
+    metrics.register_collector(
+        f"db.pool.{metrics_name}", lambda: get_pool_statistics(new_engine)
+    )
+    return new_engine
+
+
+def get_pool_statistics(target_engine: AsyncEngine) -> dict:
+    """Current state of the engine connection pool"""
+    pool = target_engine.pool
+    return {
+        "profile": engine_profile.name,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+    }
+
+
+engine_profile = EngineProfile.from_config(config.DB_ENGINE_PROFILE)
 
 # create async engine for interaction with database
-engine = create_async_engine(
-    url=config.REAL_DATABASE_URL,
-    future=True,
-    echo=True,
-    execution_options={"isolation_level": "REPEATABLE READ"},
-)
+engine = create_engine_from_profile(config.REAL_DATABASE_URL, engine_profile)
 
 # create session for the interaction with database
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
+# optional read replica for read-only endpoints
+replica_engine = (
+    create_engine_from_profile(
+        config.REPLICA_DATABASE_URL, engine_profile, metrics_name="replica"
+    )
+    if config.REPLICA_DATABASE_URL
+    else None
+)
+
+
+class ReplicaSession(AsyncSession):
+    """
+    Read-only session on the replica which moves to the primary when no
+    replica connection can be opened, and takes the replica out of rotation
+    until its next lag check. The session connects when its transaction
+    starts, so nothing has been read from the replica at that point.
+    """
+
+    async def connection(self, **kwargs):
+        try:
+            return await super().connection(**kwargs)
+        except (OSError, exc.DBAPIError):
+            if self.bind is not replica_engine:
+                raise
+            replica_monitor.mark_unavailable()
+            metrics.increment("db.reads.replica_fallbacks")
+            self.bind = engine
+            self.sync_session.bind = engine.sync_engine
+            return await super().connection(**kwargs)
+
+
+async_read_session = (
+    sessionmaker(replica_engine, expire_on_commit=False, class_=ReplicaSession)
+    if replica_engine is not None
+    else async_session
+)
+
+
+class ReplicaMonitor:
+    """
+    Periodically measures the replication lag and decides whether read-only
+    sessions may use the replica. A replica which is unreachable (here or in a
+    `ReplicaSession`) or lags more than `max_lag` seconds is skipped until the
+    next check.
+    """
+
+    LAG_QUERY = text(
+        """
+        SELECT CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END
+    """
+    )
+
+    def __init__(
+        self, replica: AsyncEngine | None, max_lag: float, check_interval: float
+    ):
+        self.replica = replica
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._available = False
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def is_available(self) -> bool:
+        if self.replica is None:
+            return False
+        if not self._check_expired():
+            return self._available
+
+        async with self._lock:
+            if self._check_expired():
+                self._available = await self._check_lag()
+                self._checked_at = time.monotonic()
+        return self._available
+
+    def mark_unavailable(self) -> None:
+        metrics.increment("db.replica.unreachable")
+        self._available = False
+        self._checked_at = time.monotonic()
+
+    def _check_expired(self) -> bool:
+        return (
+            self._checked_at is None
+            or time.monotonic() - self._checked_at >= self.check_interval
+        )
+
+    async def _check_lag(self) -> bool:
+        try:
+            async with self.replica.connect() as connection:
+                lag = (await connection.execute(self.LAG_QUERY)).scalar()
+        except Exception:
+            metrics.increment("db.replica.unreachable")
+            return False
+
+        lag = float(lag or 0)
+        metrics.set_gauge("db.replica.lag_seconds", lag)
+        return lag <= self.max_lag
+
+
+replica_monitor = ReplicaMonitor(
+    replica_engine,
+    max_lag=config.REPLICA_MAX_LAG_SECONDS,
+    check_interval=config.REPLICA_LAG_CHECK_INTERVAL,
+)
+
+
 async def get_db() -> AsyncGenerator:
     """Dependency for getting async session"""
     try:
@@ -31,6 +244,25 @@ async def get_db() -> AsyncGenerator:
         await session.close()
 
 
+async def get_read_db() -> AsyncGenerator:
+    """
+    Dependency for getting async session for read-only queries.
+    Uses the replica when it is configured and in sync, otherwise the primary.
+    """
+    if await replica_monitor.is_available():
+        session_factory = async_read_session
+        metrics.increment("db.reads.replica")
+    else:
+        session_factory = async_session
+        metrics.increment("db.reads.primary")
+
+    try:
+        session: AsyncSession = session_factory()
+        yield session
+    finally:
+        await session.close()
+
+
 class Singleton(type):
     _instances = {}
 
@@ -40,41 +272,112 @@ class Singleton(type):
         return cls._instances[cls]
 
 
+class InstrumentedRedisPool(aioredis.BlockingConnectionPool):
+    """Blocking Redis pool which measures how long callers wait for a connection"""
+
+    async def get_connection(self, command_name, *keys, **options):
+        started = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError as e:
+            if isinstance(e.__cause__, asyncio.TimeoutError):
+                metrics.increment("redis.pool.timeouts")
+            raise
+        finally:
+            metrics.observe("redis.pool.checkout_wait", time.perf_counter() - started)
+
+    def get_statistics(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+        }
+
+
 class RedisClient(metaclass=Singleton):
+    """
+    Redis client with a bounded pool. Commands go through `run`, which fails
+    fast with `RedisUnavailableError` while the circuit breaker is open, so
+    callers can degrade instead of waiting on a dead socket.
+    """
+
     def __init__(
         self,
         redis_url: str,
         max_connections: int = 10,
-        timeout: int = 1,
+        timeout: float = 1,
         health_check_interval: int = 10,
+        pool_timeout: float = 1,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
     ):
         self.redis_url = redis_url
         self.max_connections = max_connections
         self.timeout = timeout
         self.health_check_interval = health_check_interval
+        self.pool_timeout = pool_timeout
         self.client: aioredis.Redis | None = None
+        self.breaker = CircuitBreaker("redis", failure_threshold, reset_timeout)
+        metrics.register_collector("redis", self.get_statistics)
 
     async def connect(self):
-        try:
-            pool = aioredis.ConnectionPool.from_url(
-                self.redis_url, decode_responses=True
-            )
-            self.client = aioredis.Redis.from_pool(pool)
-            print(f"Ping redis successful: {await self.client.ping()}")
-        except Exception as e:
-            print(f"Redis Error: {e}")
+        pool = InstrumentedRedisPool.from_url(
+            self.redis_url,
+            decode_responses=True,
+            max_connections=self.max_connections,
+            timeout=self.pool_timeout,
+            socket_timeout=self.timeout,
+            socket_connect_timeout=self.timeout,
+            health_check_interval=self.health_check_interval,
+        )
+        self.client = aioredis.Redis.from_pool(pool)
 
     async def get_client(self) -> aioredis.Redis:
         if self.client is None:
             await self.connect()
         return self.client
 
+    async def run(self, command: Callable[[aioredis.Redis], Awaitable[T]]) -> T:
+        """
+        Runs `command` with the client, e.g.
+        `await redis_client.run(lambda redis: redis.get(key))`
+        """
+        if not self.breaker.allow_request():
+            raise RedisUnavailableError()
+        try:
+            result = await command(await self.get_client())
+        except (RedisError, OSError) as e:
+            self.breaker.record_failure()
+            metrics.increment("redis.errors")
+            raise RedisUnavailableError() from e
+        except BaseException:
+            # e.g. cancelled: a half-open trial must not stay pending
+            self.breaker.record_aborted()
+            raise
+        self.breaker.record_success()
+        return result
+
+    def get_statistics(self) -> dict:
+        statistics = {"breaker": self.breaker.as_dict()}
+        if self.client is not None:
+            statistics["pool"] = self.client.connection_pool.get_statistics()
+        return statistics
+
     async def close(self):
         if self.client:
             await self.client.aclose()
 
 
 class ClickHouseClient(metaclass=Singleton):
+    completions_table = "chore_completion_stats"
+    completions_columns = (
+        "id",
+        "chore_id",
+        "family_id",
+        "completed_by_id",
+        "created_at",
+    )
+
     def __init__(self):
         self.host = config.CLICKHOUSE_HOST
         self.port = config.CLICKHOUSE_PORT
@@ -98,6 +401,40 @@ class ClickHouseClient(metaclass=Singleton):
             await self.connect()
         return self._client
 
+    async def insert_completions(self, events: list[dict]) -> None:
+        """
+        Inserts chore-completion events (the analytics payloads) in one
+        column-oriented block, bypassing the RabbitMQ engine table and its
+        JSON-parsing materialized view.
+        """
+        await self.insert_completion_columns(
+            [
+                [UUID(event["id"]) for event in events],
+                [UUID(event["chore_id"]) for event in events],
+                [UUID(event["family_id"]) for event in events],
+                [UUID(event["completed_by_id"]) for event in events],
+                [
+                    datetime.fromtimestamp(
+                        event["created_at"] / 1_000_000, timezone.utc
+                    )
+                    for event in events
+                ],
+            ]
+        )
+
+    async def insert_completion_columns(self, columns: list[list]) -> None:
+        """`columns` are ordered as `completions_columns`"""
+        client = await self.get_client()
+        started = time.perf_counter()
+        await client.insert(
+            self.completions_table,
+            columns,
+            column_names=self.completions_columns,
+            column_oriented=True,
+        )
+        metrics.observe("clickhouse.insert_latency", time.perf_counter() - started)
+        metrics.increment("clickhouse.inserted_rows", len(columns[0]))
+
     async def close(self):
         if self._client:
             await self._client.close()
@@ -106,37 +443,78 @@ class ClickHouseClient(metaclass=Singleton):
 
 
 class RabbitMQClient(metaclass=Singleton):
-    def __init__(self, url: str):
+    """
+    Long-lived publisher to the ClickHouse exchange.
+
+    The outbox relay hands it batches of events, published with publisher
+    confirms so the broker round trip is paid once per batch.
+    """
+
+    exchange_name = "clickhouse_exchange"
+    routing_key = "completions"
+
+    def __init__(
+        self,
+        url: str,
+        confirm_timeout: float = 10,
+    ):
         self.url = url
-        self.connection = None
-        self.channel = None
+        self.confirm_timeout = confirm_timeout
+        self.connection: aio_pika.abc.AbstractRobustConnection | None = None
+        self.channel: aio_pika.abc.AbstractChannel | None = None
+        self.exchange: aio_pika.abc.AbstractExchange | None = None
 
     async def connect(self):
         if not self.connection:
             self.connection = await aio_pika.connect_robust(self.url)
-            self.channel = await self.connection.channel()
+        if self.channel is None or self.channel.is_closed:
+            self.channel = await self.connection.channel(publisher_confirms=True)
+            self.exchange = await self.channel.get_exchange(self.exchange_name)
 
-    async def publish(self, message: dict):
-        if not self.connection:
+    async def publish_many(self, messages: list[dict]) -> None:
+        """Publishes right away and returns once the broker confirmed all"""
+        try:
             await self.connect()
-
-        exchange = await self.channel.get_exchange("clickhouse_exchange")
-
-        await exchange.publish(
-            aio_pika.Message(
-                body=json.dumps(message).encode(),
-                content_type="application/json",
-                delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
-            ),
-            routing_key="completions",
-        )
+            started = time.perf_counter()
+            # all confirms of the batch are awaited together
+            await asyncio.gather(
+                *(
+                    self.exchange.publish(
+                        aio_pika.Message(
+                            body=json.dumps(message).encode(),
+                            content_type="application/json",
+                            delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                        ),
+                        routing_key=self.routing_key,
+                        timeout=self.confirm_timeout,
+                    )
+                    for message in messages
+                )
+            )
+        except Exception:
+            metrics.increment("rabbitmq.publish_failures")
+            # the channel is reopened (and the exchange fetched again) on retry
+            self.channel = None
+            raise
+        metrics.observe("rabbitmq.confirm_latency", time.perf_counter() - started)
+        metrics.increment("rabbitmq.published", len(messages))
 
     async def close(self):
         if self.connection:
             await self.connection.close()
-            print("ClickHouse connection closed")
+            self.connection = None
+            self.channel = None
+            print("RabbitMQ connection closed")
 
 
-redis_client = RedisClient(redis_url=config.REDIS_URL)
+redis_client = RedisClient(
+    redis_url=config.REDIS_URL,
+    max_connections=config.REDIS_MAX_CONNECTIONS,
+    timeout=config.REDIS_SOCKET_TIMEOUT,
+    health_check_interval=config.REDIS_HEALTH_CHECK_INTERVAL,
+    pool_timeout=config.REDIS_POOL_TIMEOUT,
+    failure_threshold=config.REDIS_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=config.REDIS_BREAKER_RESET_TIMEOUT,
+)
 clickhouse_client = ClickHouseClient()
 rabbit_client = RabbitMQClient(config.RABBITMQ_URL)
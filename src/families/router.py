@@ -24,7 +24,7 @@ from core.permissions import (
     IsAuthenicatedPermission,
 )
 from core.security import create_jwt_token, get_payload_from_jwt_token
-from database_connection import get_db
+from core.unit_of_work import get_uow_session
 from families.repository import FamilyRepository
 from families.schemas import (
     FamilyCreateSchema,
@@ -40,6 +40,7 @@ from families.services import (
     LogoutUserFromFamilyService,
 )
 from statistics.repository import StatsRepository, get_statistic_repo
+from users.cache import user_cache
 from users.models import User
 from users.repository import UserRepository
 from users.schemas import UserFamilyPermissionModelSchema, UserResponseSchema
@@ -58,23 +59,22 @@ router = APIRouter()
 async def create_family(
     body: FamilyCreateSchema,
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> FamilyResponseSchema:
-    async with async_session.begin():
-        try:
-            family_creator_service = FamilyCreatorService(
-                name=body.name, user=current_user, db_session=async_session
-            )
-            family = await family_creator_service.run_process()
-        except UserIsAlreadyFamilyMember:
-            raise HTTPException(
-                status_code=400,
-                detail="The user is already a family member",
-            )
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=str(e))
-        else:
-            return FamilyResponseSchema.model_validate(family)
+    try:
+        family_creator_service = FamilyCreatorService(
+            name=body.name, user=current_user, db_session=async_session
+        )
+        family = await family_creator_service.run_process()
+    except UserIsAlreadyFamilyMember:
+        raise HTTPException(
+            status_code=400,
+            detail="The user is already a family member",
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    else:
+        return FamilyResponseSchema.model_validate(family)
 
 
 @router.get(
@@ -84,11 +84,10 @@ async def create_family(
 )
 async def get_my_family(
     current_user: User = Depends(FamilyMemberPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> FamilyResponseSchema:
-    async with async_session.begin():
-        family_id = current_user.family_id
-        family = await FamilyRepository(async_session).get_by_id(family_id)
+    family_id = current_user.family_id
+    family = await FamilyRepository(async_session).get_by_id(family_id)
     return FamilyResponseSchema.model_validate(family)
 
 
@@ -99,13 +98,12 @@ async def get_my_family(
 )
 async def get_family_members(
     current_user: User = Depends(FamilyMemberPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> FamilyMembersSchema:
-    async with async_session.begin():
-        family_id: UUID = current_user.family_id  # type: ignore
-        family_repo = FamilyRepository(async_session)
-        family_members = await family_repo.get_family_members(family_id)
-        return FamilyMembersSchema(members=family_members)
+    family_id: UUID = current_user.family_id  # type: ignore
+    family_repo = FamilyRepository(async_session)
+    family_members = await family_repo.get_family_members(family_id)
+    return FamilyMembersSchema(members=family_members)
 
 
 @router.get(
@@ -116,23 +114,22 @@ async def get_family_members(
 async def get_family_leader(
     current_user: User = Depends(FamilyMemberPermission()),
     statsRepo: StatsRepository = Depends(get_statistic_repo),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> FamilyMemberStatsSchema:
-    async with async_session.begin():
-        family_id: UUID = current_user.family_id  # type: ignore
-        members = await statsRepo.get_family_members_by_chores_completions(
-            family_id, interval=get_current_week_range()
-        )
-        if len(members) == 0:
-            return FamilyMemberStatsSchema(
-                member=None,
-                chore_completion_count=None,
-            )
-        user = await UserRepository(async_session).get_by_id(members[0].user_id)
+    family_id: UUID = current_user.family_id  # type: ignore
+    members = await statsRepo.get_family_members_by_chores_completions(
+        family_id, interval=get_current_week_range()
+    )
+    if len(members) == 0:
         return FamilyMemberStatsSchema(
-            member=UserResponseSchema.model_validate(user),
-            chore_completion_count=members[0].chores_completions_counts,
+            member=None,
+            chore_completion_count=None,
         )
+    user = await UserRepository(async_session).get_by_id(members[0].user_id)
+    return FamilyMemberStatsSchema(
+        member=UserResponseSchema.model_validate(user),
+        chore_completion_count=members[0].chores_completions_counts,
+    )
 
 
 @router.patch(
@@ -142,21 +139,20 @@ async def get_family_leader(
 )
 async def logout_user_from_family(
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> JSONResponse:
-    async with async_session.begin():
-        try:
-            await LogoutUserFromFamilyService(
-                user=current_user, db_session=async_session
-            ).run_process()
+    try:
+        await LogoutUserFromFamilyService(
+            user=current_user, db_session=async_session
+        ).run_process()
 
-        except UserCannotLeaveFamily:
-            return JSONResponse(
-                content={
-                    "message": "You cannot leave a family while you are its administrator."
-                },
-                status_code=400,
-            )
+    except UserCannotLeaveFamily:
+        return JSONResponse(
+            content={
+                "message": "You cannot leave a family while you are its administrator."
+            },
+            status_code=400,
+        )
 
     return JSONResponse(
         content={"message": "OK"},
@@ -172,13 +168,10 @@ async def logout_user_from_family(
 async def kick_user_from_family(
     user_id: UUID,
     current_user: User = Depends(FamilyUserAccessPermission(only_admin=True)),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> JSONResponse:
-    async with async_session.begin():
-        user = await UserRepository(async_session).get_by_id(user_id)
-        await LogoutUserFromFamilyService(
-            user=user, db_session=async_session
-        ).run_process()
+    user = await UserRepository(async_session).get_by_id(user_id)
+    await LogoutUserFromFamilyService(user=user, db_session=async_session).run_process()
 
     return JSONResponse(
         content={"message": "OK"},
@@ -194,13 +187,13 @@ async def kick_user_from_family(
 async def change_family_admin(
     user_id: UUID,
     current_user: User = Depends(FamilyUserAccessPermission(only_admin=True)),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> JSONResponse:
-    async with async_session.begin():
-        family_dal = FamilyRepository(async_session)
-        family = await family_dal.get_by_id(current_user.family_id)
-        family.family_admin_id = user_id
-        await family_dal.update(family)
+    family_dal = FamilyRepository(async_session)
+    family = await family_dal.get_by_id(current_user.family_id)
+    family.family_admin_id = user_id
+    await family_dal.update(family)
+    await user_cache.invalidate_on_commit(async_session, current_user.id, user_id)
     return JSONResponse(
         content={"detail": "New family administrator appointed"},
         status_code=status.HTTP_200_OK,
@@ -233,33 +226,32 @@ async def generate_invite_token(
 async def join_to_family(
     invite_token: str,
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> JSONResponse:
-    async with async_session.begin():
-        payload = get_payload_from_jwt_token(invite_token)
-        family_id = payload.get("family_id")
-        allowed_fields = UserFamilyPermissionModelSchema.model_fields.keys()
-        user_permissions = UserFamilyPermissionModelSchema(
-            **{key: payload[key] for key in allowed_fields if key in payload}
+    payload = get_payload_from_jwt_token(invite_token)
+    family_id = payload.get("family_id")
+    allowed_fields = UserFamilyPermissionModelSchema.model_fields.keys()
+    user_permissions = UserFamilyPermissionModelSchema(
+        **{key: payload[key] for key in allowed_fields if key in payload}
+    )
+    try:
+        family = await FamilyRepository(async_session).get_by_id(family_id)
+        service = AddUserToFamilyService(
+            family=family,
+            user=current_user,
+            permissions=user_permissions,
+            db_session=async_session,
         )
-        try:
-            family = await FamilyRepository(async_session).get_by_id(family_id)
-            service = AddUserToFamilyService(
-                family=family,
-                user=current_user,
-                permissions=user_permissions,
-                db_session=async_session,
-            )
-            await service.run_process()
-        except UserIsAlreadyFamilyMember:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="The user is already a member of a family",
-            )
-        return JSONResponse(
-            content={"message": "You have been successfully added to the family"},
-            status_code=status.HTTP_200_OK,
+        await service.run_process()
+    except UserIsAlreadyFamilyMember:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The user is already a member of a family",
         )
+    return JSONResponse(
+        content={"message": "You have been successfully added to the family"},
+        status_code=status.HTTP_200_OK,
+    )
 
 
 @router.post(
@@ -268,17 +260,16 @@ async def join_to_family(
 async def upload_family_avatar(
     file: UploadFile = File(...),
     current_user: User = Depends(FamilyMemberPermission(only_admin=True)),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> JSONResponse:
-    async with async_session.begin():
-        family = await FamilyRepository(async_session).get_by_id(current_user.family_id)
-        service = UploadAvatarService(
-            target_object=family, file=file, db_session=async_session
-        )
-        try:
-            new_avatar_url = await service.run_process()
-        except ImageError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+    family = await FamilyRepository(async_session).get_by_id(current_user.family_id)
+    service = UploadAvatarService(
+        target_object=family, file=file, db_session=async_session
+    )
+    try:
+        new_avatar_url = await service.run_process()
+    except ImageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return JSONResponse({"avatar_url": new_avatar_url})
 
 
@@ -290,15 +281,14 @@ async def upload_family_avatar(
 )
 async def family_get_avatar(
     current_user: User = Depends(FamilyMemberPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> FileResponse | RedirectResponse:
-    async with async_session.begin():
-        service = GetAvatarService(
-            target_kind="Family",
-            target_object_id=current_user.family_id,
-            db_session=async_session,
-        )
-        avatar = await service.run_process()
+    service = GetAvatarService(
+        target_kind="Family",
+        target_object_id=current_user.family_id,
+        db_session=async_session,
+    )
+    avatar = await service.run_process()
 
     if avatar is None:
         raise HTTPException(status_code=404, detail="no avatar")
@@ -12,18 +12,54 @@ from auth.router import router as auth_router
 from chores.router import router as chores_router
 from chores_completions.router import router as chores_completions_router
 from chores_confirmations.router import router as chores_confirmations_router
-from config import swagger_ui_settings
-from core.enums import PostgreSQLEnum
+from config import (
+    CLICKHOUSE_INGESTION_MODE,
+    CLICKHOUSE_INSERT_BATCH_SIZE,
+    CLICKHOUSE_INSERT_FLUSH_INTERVAL,
+    ENABLE_CLICKHOUSE,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_POLL_INTERVAL,
+    swagger_ui_settings,
+)
+from core.enums import OutboxTopicEnum, PostgreSQLEnum
 from core.exceptions.base_exceptions import BaseAPIException
-from database_connection import engine
+from core.exceptions.redis import RedisUnavailableError
+from core.exceptions.transactions import TransactionConflictError
+from database_connection import (
+    async_session,
+    clickhouse_client,
+    engine,
+    rabbit_client,
+)
 from families.router import router as families_router
+from monitoring.router import router as monitoring_router
+from outbox.relay import OutboxRelay
 from products.router import router as product_router
 from users.router import router as user_router
 from wallets.router import router as wallet_router
+from statistics.cache import stats_cache
 from statistics.router import router as stats_router
 
 logger = logging.getLogger(__name__)
 
+if CLICKHOUSE_INGESTION_MODE == "direct":
+    completions_relay = OutboxRelay(
+        session_factory=async_session,
+        topic=OutboxTopicEnum.chore_completion_approved,
+        deliver=stats_cache.invalidating(clickhouse_client.insert_completions),
+        batch_size=CLICKHOUSE_INSERT_BATCH_SIZE,
+        poll_interval=OUTBOX_POLL_INTERVAL,
+        flush_interval=CLICKHOUSE_INSERT_FLUSH_INTERVAL,
+    )
+else:
+    completions_relay = OutboxRelay(
+        session_factory=async_session,
+        topic=OutboxTopicEnum.chore_completion_approved,
+        deliver=rabbit_client.publish_many,
+        batch_size=OUTBOX_BATCH_SIZE,
+        poll_interval=OUTBOX_POLL_INTERVAL,
+    )
+
 
 async def create_enum_if_not_exists(engine: AsyncEngine):
     async with engine.begin() as conn:
@@ -50,6 +86,8 @@ async def lifespan(app: FastAPI):
     try:
         logger.info("Startup: Checking ENUMs in DB...")
         await create_enum_if_not_exists(engine)
+        if ENABLE_CLICKHOUSE:
+            completions_relay.start()
 
         yield
     except Exception as e:
@@ -57,6 +95,9 @@ async def lifespan(app: FastAPI):
         raise
     finally:
         logger.info("🛑 Shutdown: Closing resources...")
+        await completions_relay.stop()
+        await rabbit_client.close()
+        await clickhouse_client.close()
 
 
 # create instance of the app
@@ -72,6 +113,16 @@ async def api_exception_handler(request: Request, exc: BaseAPIException):
     return JSONResponse(status_code=400, content={"serviceError": str(exc)})
 
 
+@app.exception_handler(RedisUnavailableError)
+async def redis_unavailable_handler(request: Request, exc: RedisUnavailableError):
+    return JSONResponse(status_code=503, content={"serviceError": str(exc)})
+
+
+@app.exception_handler(TransactionConflictError)
+async def transaction_conflict_handler(request: Request, exc: TransactionConflictError):
+    return JSONResponse(status_code=409, content={"serviceError": str(exc)})
+
+
 # create the instance for the routes
 main_api_router = APIRouter(prefix="/api")
 
@@ -87,6 +138,7 @@ main_api_router.include_router(chores_router, prefix="/chores")
 main_api_router.include_router(wallet_router, prefix="/wallets")
 main_api_router.include_router(product_router, prefix="/products")
 main_api_router.include_router(stats_router, prefix="/stats")
+main_api_router.include_router(monitoring_router, prefix="/monitoring")
 
 app.include_router(main_api_router)
 
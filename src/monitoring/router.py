@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+
+from core.exceptions.http_exceptions import permission_denided
+from core.metrics import metrics
+from core.permissions import IsAuthenicatedPermission
+from users.models import User
+
+router = APIRouter()
+
+
+@router.get(
+    path="/metrics",
+    summary="Get in-process application metrics (superuser only)",
+    tags=["Monitoring"],
+)
+async def get_metrics(
+    current_user: User = Depends(IsAuthenicatedPermission()),
+) -> dict:
+    if not current_user.is_superuser:
+        raise permission_denided
+    return metrics.snapshot()
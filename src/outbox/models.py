@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Identity, Index, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models import Base
+
+
+class OutboxEvent(Base):
+    """
+    Event written in the same transaction as the change it describes and
+    delivered later by `OutboxRelay`. The sequential id gives the relay order.
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (Index("ix_outbox_events_topic_id", "topic", "id"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    topic: Mapped[str] = mapped_column(String(100))
+    payload: Mapped[dict] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(
+        server_default=text("TIMEZONE('utc', now())"),
+    )
+
+    def __repr__(self):
+        return super().__repr__()
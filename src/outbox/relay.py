@@ -0,0 +1,105 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from logging import getLogger
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from core.enums import OutboxTopicEnum
+from core.metrics import metrics
+from core.transactions import STANDARD_WRITE, transaction
+from outbox.repository import OutboxRepository
+
+logger = getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Background task that drains one outbox topic in id order.
+
+    Each batch is locked, handed to `deliver` and deleted in the same
+    transaction, so an event is removed only after it was delivered
+    (at-least-once: a crash after delivery re-sends the batch). A batch
+    smaller than `batch_size` is held until its oldest event has waited
+    `flush_interval` seconds, which lets sinks preferring large blocks
+    (ClickHouse) receive fewer inserts. Reports `outbox.<topic>.lag_seconds`,
+    the age of the oldest pending event.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        topic: OutboxTopicEnum,
+        deliver: Callable[[list[dict]], Awaitable[None]],
+        batch_size: int = 500,
+        poll_interval: float = 1.0,
+        flush_interval: float = 0.0,
+    ):
+        self.session_factory = session_factory
+        self.topic = topic
+        self.deliver = deliver
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.flush_interval = flush_interval
+        self.metrics_prefix = f"outbox.{topic.value}"
+        self._task: asyncio.Task | None = None
+
+    async def relay_batch(self) -> int:
+        """Delivers one batch and returns its size"""
+        async with self.session_factory() as db_session:
+            async with transaction(db_session, STANDARD_WRITE):
+                return await self._relay_batch(db_session)
+
+    async def _relay_batch(self, db_session: AsyncSession) -> int:
+        repo = OutboxRepository(db_session)
+        if not await repo.try_lock_relay(self.topic):
+            # another worker is relaying this topic
+            return 0
+
+        events = await repo.get_batch(self.topic, self.batch_size)
+        lag = self._report_lag(events)
+        if not events:
+            return 0
+        if len(events) < self.batch_size and lag < self.flush_interval:
+            return 0
+
+        await self.deliver([event.payload for event in events])
+        await repo.delete_many([event.id for event in events])
+        metrics.increment(f"{self.metrics_prefix}.relayed", len(events))
+        return len(events)
+
+    def _report_lag(self, events: list) -> float:
+        lag = 0.0
+        if events:
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            lag = (now - events[0].created_at).total_seconds()
+        metrics.set_gauge(f"{self.metrics_prefix}.lag_seconds", lag)
+        return lag
+
+    async def run(self) -> None:
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except Exception:
+                metrics.increment(f"{self.metrics_prefix}.failures")
+                logger.exception("Outbox relay of %s failed", self.topic.value)
+                relayed = 0
+            # a full batch means there is probably more waiting
+            if relayed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(
+                self.run(), name=f"outbox-relay-{self.topic.value}"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
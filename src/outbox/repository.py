@@ -0,0 +1,44 @@
+from sqlalchemy import delete, func, select
+
+from core.base_dals import BaseDal
+from core.enums import OutboxTopicEnum
+from outbox.models import OutboxEvent
+
+# class of the transaction-level advisory locks held by active relays,
+# the second key is the hash of the topic
+OUTBOX_RELAY_LOCK_CLASS = 7301
+
+
+class OutboxRepository(BaseDal[OutboxEvent]):
+    model = OutboxEvent
+
+    async def add(self, topic: OutboxTopicEnum, payload: dict) -> None:
+        self.db_session.add(OutboxEvent(topic=topic.value, payload=payload))
+        await self.db_session.flush()
+
+    async def try_lock_relay(self, topic: OutboxTopicEnum) -> bool:
+        """Only one relay drains a topic at a time, which keeps the order"""
+        result = await self.db_session.execute(
+            select(
+                func.pg_try_advisory_xact_lock(
+                    OUTBOX_RELAY_LOCK_CLASS, func.hashtext(topic.value)
+                )
+            )
+        )
+        return bool(result.scalar())
+
+    async def get_batch(self, topic: OutboxTopicEnum, limit: int) -> list[OutboxEvent]:
+        query = (
+            select(OutboxEvent)
+            .where(OutboxEvent.topic == topic.value)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db_session.execute(query)
+        return list(result.scalars().all())
+
+    async def delete_many(self, event_ids: list[int]) -> None:
+        await self.db_session.execute(
+            delete(OutboxEvent).where(OutboxEvent.id.in_(event_ids))
+        )
@@ -19,9 +19,20 @@ from core.exceptions.base_exceptions import ImageError
 from core.exceptions.products import ProductNotFoundError
 from core.exceptions.wallets import NotEnoughCoins
 from core.get_avatars import GetAvatarService, UploadAvatarService
-from core.permissions import IsAuthenicatedPermission, ProductPermission
+from core.permissions import (
+    IsAuthenicatedPermission,
+    ProductPermission,
+    get_permitted_product,
+)
 from core.query_depends import get_pagination_params
-from database_connection import get_db
+from core.transactions import READ_ONLY, transaction
+from core.unit_of_work import (
+    UnitOfWork,
+    get_unit_of_work,
+    get_uow_session,
+    transaction_profile,
+)
+from database_connection import get_read_db
 from products.models import Product
 from products.repository import ProductRepository
 from products.schemas import (
@@ -42,26 +53,23 @@ router = APIRouter()
 async def create_product(
     body: CreateNewProductSchema,
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> ProductFullSchema:
-    async with async_session.begin():
-        product_dal = ProductRepository(async_session)
-        fields = body.model_dump()
-        fields.update(
-            {"seller_id": current_user.id, "family_id": current_user.family_id}
-        )
-        new_product = Product(**fields)
-        new_product = await product_dal.create(new_product)
-        return ProductFullSchema(
-            id=new_product.id,
-            name=new_product.name,
-            description=new_product.description,
-            icon=new_product.icon,
-            price=new_product.price,
-            is_active=new_product.is_active,
-            created_at=new_product.created_at,
-            avatar_version=new_product.avatar_version,
-        )
+    product_dal = ProductRepository(async_session)
+    fields = body.model_dump()
+    fields.update({"seller_id": current_user.id, "family_id": current_user.family_id})
+    new_product = Product(**fields)
+    new_product = await product_dal.create(new_product)
+    return ProductFullSchema(
+        id=new_product.id,
+        name=new_product.name,
+        description=new_product.description,
+        icon=new_product.icon,
+        price=new_product.price,
+        is_active=new_product.is_active,
+        created_at=new_product.created_at,
+        avatar_version=new_product.avatar_version,
+    )
 
 
 @router.post(
@@ -73,17 +81,16 @@ async def upload_avatar_product(
     product_id: UUID,
     file: UploadFile = File(...),
     current_user: User = Depends((ProductPermission())),
-    async_session: AsyncSession = Depends(get_db),
+    product: Product = Depends(get_permitted_product),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> JSONResponse:
-    async with async_session.begin():
-        product = await ProductRepository(async_session).get_by_id(product_id)
-        service = UploadAvatarService(
-            target_object=product, file=file, db_session=async_session
-        )
-        try:
-            new_avatar_url = await service.run_process()
-        except ImageError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+    service = UploadAvatarService(
+        target_object=product, file=file, db_session=async_session
+    )
+    try:
+        new_avatar_url = await service.run_process()
+    except ImageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return JSONResponse(content={"avatar_url": new_avatar_url}, status_code=201)
 
 
@@ -97,13 +104,12 @@ async def user_get_avatar(
     product_id: UUID,
     avatar_version: str | None = Query(None, description="Avatar version"),
     current_user: User = Depends(ProductPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> FileResponse | RedirectResponse:
-    async with async_session.begin():
-        service = GetAvatarService(
-            target_kind="Product", target_object_id=product_id, db_session=async_session
-        )
-        avatar = await service.run_process()
+    service = GetAvatarService(
+        target_kind="Product", target_object_id=product_id, db_session=async_session
+    )
+    avatar = await service.run_process()
 
     if avatar is None:
         raise HTTPException(status_code=404, detail="Product has no avatar")
@@ -119,11 +125,10 @@ async def user_get_avatar(
 )
 async def get_user_products(
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> list[ProductFullSchema]:
-    async with async_session.begin():
-        product_data = ProductRepository(async_session)
-        result_response = await product_data.get_user_active_products(current_user.id)
+    product_data = ProductRepository(async_session)
+    result_response = await product_data.get_user_active_products(current_user.id)
     return result_response
 
 
@@ -135,11 +140,11 @@ async def get_user_products(
 async def get_family_active_products(
     pagination: tuple[int, int] = Depends(get_pagination_params),
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    read_session: AsyncSession = Depends(get_read_db),
 ) -> list[ProductWithSellerSchema]:
-    async with async_session.begin():
+    async with transaction(read_session, READ_ONLY):
         offset, limit = pagination
-        product_data = ProductRepository(async_session)
+        product_data = ProductRepository(read_session)
         family_id = current_user.family_id
         if family_id is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
@@ -152,22 +157,26 @@ async def get_family_active_products(
     summary="Buy a product from the active product list",
     tags=["Products"],
 )
+@transaction_profile(PurchaseService.transaction_profile)
 async def buy_active_products(
     product_id: UUID,
     current_user: User = Depends(ProductPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    product: Product = Depends(get_permitted_product),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ) -> Response:
-    async with async_session.begin():
-        try:
-            product = await ProductRepository(async_session).get_by_id(product_id)
-            service = PurchaseService(
-                product=product, user=current_user, db_session=async_session
-            )
-            await service.run_process()
-        except ProductNotFoundError:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
-        except NotEnoughCoins:
-            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
+    async def purchase() -> None:
+        # current_user and product are reloaded by the permission check on retries
+        service = PurchaseService(
+            product=product, user=current_user, db_session=uow.db_session
+        )
+        await service.run_process()
+
+    try:
+        await uow.run(purchase)
+    except ProductNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    except NotEnoughCoins:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -179,10 +188,9 @@ async def buy_active_products(
 async def delete_active_products(
     product_id: UUID,
     current_user: User = Depends(ProductPermission(only_owner=True)),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> Response:
-    async with async_session.begin():
-        result = await ProductRepository(async_session).soft_delete(product_id)
+    result = await ProductRepository(async_session).soft_delete(product_id)
     if result:
         return Response(status_code=status.HTTP_204_NO_CONTENT)
     else:
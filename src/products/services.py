@@ -5,17 +5,21 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from config import PURCHASE_RATE
 from core.enums import PeerTransactionENUM
 from core.services import BaseService
+from core.transactions import MONEY_MOVEMENT
 from core.validators import validate_product_is_active, validate_user_can_buy_product
 from products.models import Product
 from products.repository import ProductRepository
 from users.models import User
+from users.repository import UserRepository
 from wallets.models import PeerTransaction
-from wallets.repository import PeerTransactionDAL
+from wallets.repository import PeerTransactionDAL, WalletLedgerRepository
 from wallets.services import coin_exchange
 
 
 @dataclass
 class PurchaseService(BaseService[PeerTransaction]):
+    transaction_profile = MONEY_MOVEMENT
+
     product: Product
     user: User
     db_session: AsyncSession
@@ -23,13 +27,24 @@ class PurchaseService(BaseService[PeerTransaction]):
     async def process(self):
         transaction = await self._create_transaction_log()
         await self._change_product_activity()
-        await coin_exchange(
+        exchange = await coin_exchange(
             to_user_id=self.product.seller_id,
             from_user_id=self.user.id,
             coins=self.product.price,
             rate=PURCHASE_RATE,
             db_session=self.db_session,
         )
+        seller = await UserRepository(self.db_session).get_by_id(self.product.seller_id)
+        await WalletLedgerRepository(self.db_session).add_peer_transaction(
+            transaction,
+            from_user=self.user,
+            to_user=seller,
+            debited=exchange.debited,
+            credited=exchange.credited,
+            from_balance=exchange.from_balance,
+            to_balance=exchange.to_balance,
+            product=self.product,
+        )
         return transaction
 
     async def _change_product_activity(self) -> None:
@@ -0,0 +1,323 @@
+"""
+Copies approved chore completions made before ClickHouse ingestion was switched
+on from Postgres into `chore_completion_stats`.
+
+Switch ingestion on (ENABLE_CLICKHOUSE) first, let the outbox relay deliver the
+events pending at that time, then run:
+
+    PYTHONPATH=src python -m statistics.backfill [--partitions 4] [--batch-size 50000]
+
+Completions approved before `--until` (default: the time of the first run) are
+split into time-range partitions copied in parallel. Each partition pages with
+a keyset on (created_at, id) and inserts every page as one columnar block;
+ids already present in ClickHouse are skipped, so a page may be copied again
+safely. Progress is saved to the checkpoint file after every page and a rerun
+resumes from it. At the end the statistics repositories of both backends count
+the completions of every family over the whole days before `--until`.
+
+`chore_completion_stats` is a plain MergeTree, a row inserted twice is counted
+twice. Completions approved after `--until` are left to the relay, and the
+ones approved before it while ingestion was on were delivered by the relay
+before the run started, so no row is inserted by both. Don't pass an `--until`
+later than the start of the run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from statistics.repository import StatsClickhouseRepository, StatsPostgresRepository
+from statistics.schemas import DateRangeSchema
+from uuid import UUID
+
+from sqlalchemy import func, select, tuple_
+
+from chores_completions.models import ChoreCompletion
+from core.enums import StatusConfirmENUM
+from core.metrics import metrics
+from core.transactions import READ_ONLY, transaction
+from database_connection import async_read_session, clickhouse_client
+
+logger = getLogger(__name__)
+
+DEFAULT_CHECKPOINT = "clickhouse_backfill.json"
+# ids of one existence lookup, they are rendered into the query text: 2000 ids
+# and their family ids take ~160 KB, under ClickHouse's default max_query_size
+# of 256 KB
+EXISTING_IDS_CHUNK_SIZE = 2_000
+
+
+@dataclass
+class Partition:
+    """Half-open range [start, end) of completion creation times"""
+
+    start: datetime
+    end: datetime
+    last_created_at: datetime | None = None
+    last_id: UUID | None = None
+    copied: int = 0
+    done: bool = False
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        for field in ("start", "end", "last_created_at"):
+            if data[field] is not None:
+                data[field] = data[field].isoformat()
+        if self.last_id is not None:
+            data["last_id"] = str(self.last_id)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Partition":
+        partition = cls(
+            start=datetime.fromisoformat(data["start"]),
+            end=datetime.fromisoformat(data["end"]),
+            copied=data["copied"],
+            done=data["done"],
+        )
+        if data["last_id"] is not None:
+            partition.last_created_at = datetime.fromisoformat(data["last_created_at"])
+            partition.last_id = UUID(data["last_id"])
+        return partition
+
+
+class Checkpoint:
+    """Backfill progress kept in a JSON file, rewritten atomically"""
+
+    def __init__(self, path: str, until: datetime, partitions: list[Partition]):
+        self.path = path
+        self.until = until
+        self.partitions = partitions
+
+    @classmethod
+    def load(cls, path: str) -> "Checkpoint | None":
+        if not os.path.exists(path):
+            return None
+        with open(path) as file:
+            data = json.load(file)
+        return cls(
+            path,
+            until=datetime.fromisoformat(data["until"]),
+            partitions=[Partition.from_dict(p) for p in data["partitions"]],
+        )
+
+    def save(self) -> None:
+        data = {
+            "until": self.until.isoformat(),
+            "partitions": [p.to_dict() for p in self.partitions],
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def approved_before(until: datetime):
+    return (
+        ChoreCompletion.status == StatusConfirmENUM.approved,
+        ChoreCompletion.created_at < until,
+    )
+
+
+def copied_before(until: datetime):
+    """Completions approved before `until`: later approvals are relayed"""
+    # approval is the last update of a completion
+    return (*approved_before(until), ChoreCompletion.updated_at < until)
+
+
+async def plan_partitions(until: datetime, count: int) -> list[Partition]:
+    """Splits the completions at creation-time quantiles into `count` ranges"""
+    # the 0 quantile is the minimum, it keeps the array non-empty for one partition
+    fractions = [i / count for i in range(1, count)] or [0.0]
+    query = select(
+        func.min(ChoreCompletion.created_at),
+        # one value per fraction, asyncpg returns the array as a list
+        func.percentile_disc(fractions).within_group(ChoreCompletion.created_at),
+    ).where(*copied_before(until))
+    async with async_read_session() as db_session:
+        async with transaction(db_session, READ_ONLY):
+            lowest, quantiles = (await db_session.execute(query)).one()
+    if lowest is None:
+        return []
+
+    bounds = sorted({lowest, *quantiles})
+    ends = [*bounds[1:], until]
+    return [Partition(start, end) for start, end in zip(bounds, ends)]
+
+
+async def get_page(
+    partition: Partition, until: datetime, batch_size: int
+) -> list[tuple]:
+    query = (
+        select(
+            ChoreCompletion.id,
+            ChoreCompletion.chore_id,
+            ChoreCompletion.family_id,
+            ChoreCompletion.completed_by_id,
+            ChoreCompletion.created_at,
+        )
+        .where(
+            *copied_before(until),
+            ChoreCompletion.created_at >= partition.start,
+            ChoreCompletion.created_at < partition.end,
+        )
+        .order_by(ChoreCompletion.created_at, ChoreCompletion.id)
+        .limit(batch_size)
+    )
+    if partition.last_id is not None:
+        query = query.where(
+            tuple_(ChoreCompletion.created_at, ChoreCompletion.id)
+            > tuple_(partition.last_created_at, partition.last_id)
+        )
+    # a short transaction per page, no snapshot is held for the whole copy
+    async with async_read_session() as db_session:
+        async with transaction(db_session, READ_ONLY):
+            return (await db_session.execute(query)).all()
+
+
+async def get_existing_ids(rows: list[tuple]) -> set[UUID]:
+    client = await clickhouse_client.get_client()
+    existing_ids = set()
+    for i in range(0, len(rows), EXISTING_IDS_CHUNK_SIZE):
+        chunk = rows[i : i + EXISTING_IDS_CHUNK_SIZE]
+        result = await client.query(
+            f"""
+                SELECT id
+                FROM {clickhouse_client.completions_table}
+                WHERE family_id IN %(family_ids)s AND id IN %(ids)s
+            """,
+            parameters={
+                "family_ids": list({str(row.family_id) for row in chunk}),
+                "ids": [str(row.id) for row in chunk],
+            },
+        )
+        existing_ids.update(row[0] for row in result.result_rows)
+    return existing_ids
+
+
+async def copy_partition(
+    partition: Partition, checkpoint: Checkpoint, batch_size: int
+) -> None:
+    while not partition.done:
+        rows = await get_page(partition, checkpoint.until, batch_size)
+        if rows:
+            existing_ids = await get_existing_ids(rows)
+            new_rows = [row for row in rows if row.id not in existing_ids]
+            if new_rows:
+                ids, chore_ids, family_ids, completed_by_ids, created_ats = zip(
+                    *new_rows
+                )
+                await clickhouse_client.insert_completion_columns(
+                    [
+                        list(ids),
+                        list(chore_ids),
+                        list(family_ids),
+                        list(completed_by_ids),
+                        # Postgres keeps naive UTC timestamps
+                        [dt.replace(tzinfo=timezone.utc) for dt in created_ats],
+                    ]
+                )
+            partition.last_created_at = rows[-1].created_at
+            partition.last_id = rows[-1].id
+            partition.copied += len(new_rows)
+            metrics.increment("clickhouse.backfill.copied", len(new_rows))
+        partition.done = len(rows) < batch_size
+        checkpoint.save()
+    logger.info(
+        "Partition %s - %s copied: %s rows",
+        partition.start,
+        partition.end,
+        partition.copied,
+    )
+
+
+async def get_postgres_family_counts(interval: DateRangeSchema) -> dict[UUID, int]:
+    async with async_read_session() as db_session:
+        async with transaction(db_session, READ_ONLY):
+            repo = StatsPostgresRepository(db_session)
+            return await repo.get_families_chore_completion_counts(interval)
+
+
+async def get_clickhouse_family_counts(interval: DateRangeSchema) -> dict[UUID, int]:
+    repo = StatsClickhouseRepository()
+    return await repo.get_families_chore_completion_counts(interval)
+
+
+async def verify(until: datetime) -> dict[UUID, tuple[int, int]]:
+    """
+    Returns {family_id: (postgres count, clickhouse count)} of the mismatches.
+    Statistics count whole days, so the day of `until` is left out; later
+    approvals of completions created before it have been relayed meanwhile.
+    """
+    interval = DateRangeSchema(end=until.date() - timedelta(days=1))
+    postgres_counts, clickhouse_counts = await asyncio.gather(
+        get_postgres_family_counts(interval), get_clickhouse_family_counts(interval)
+    )
+    mismatches = {}
+    for family_id in postgres_counts.keys() | clickhouse_counts.keys():
+        counts = (
+            postgres_counts.get(family_id, 0),
+            clickhouse_counts.get(family_id, 0),
+        )
+        if counts[0] != counts[1]:
+            mismatches[family_id] = counts
+    return mismatches
+
+
+async def backfill(
+    checkpoint_path: str,
+    partitions: int,
+    batch_size: int,
+    until: datetime | None = None,
+) -> dict[UUID, tuple[int, int]]:
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if checkpoint is None:
+        until = until or datetime.now(timezone.utc).replace(tzinfo=None)
+        checkpoint = Checkpoint(
+            checkpoint_path, until, await plan_partitions(until, partitions)
+        )
+        checkpoint.save()
+    else:
+        logger.info("Resuming the backfill from %s", checkpoint_path)
+
+    await asyncio.gather(
+        *(
+            copy_partition(partition, checkpoint, batch_size)
+            for partition in checkpoint.partitions
+            if not partition.done
+        )
+    )
+    return await verify(checkpoint.until)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--partitions", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument(
+        "--until",
+        type=datetime.fromisoformat,
+        help="UTC time, completions created before it are copied",
+    )
+    args = parser.parse_args()
+
+    async def run():
+        try:
+            return await backfill(
+                args.checkpoint, args.partitions, args.batch_size, args.until
+            )
+        finally:
+            await clickhouse_client.close()
+
+    mismatches = asyncio.run(run())
+    for family_id, (postgres_count, clickhouse_count) in mismatches.items():
+        print(f"{family_id}: postgres {postgres_count}, clickhouse {clickhouse_count}")
+    print(f"Verification: {len(mismatches)} families differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date
+from logging import getLogger
+from statistics.schemas import (
+    ChoresFamilyCountSchema,
+    DateRangeSchema,
+    UserChoresCountSchema,
+)
+from typing import Any, TypeVar
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import config
+from core.cache import TTLLRUCache
+from core.exceptions.redis import RedisUnavailableError
+from core.metrics import metrics
+from core.transactions import call_after_commit
+from database_connection import redis_client
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+USER_COUNTS = TypeAdapter(list[UserChoresCountSchema])
+CHORE_COUNTS = TypeAdapter(list[ChoresFamilyCountSchema])
+HEATMAP = TypeAdapter(dict[date, int])
+MEMBERS_HEATMAP = TypeAdapter(dict[UUID, dict[date, int]])
+COUNT = TypeAdapter(int)
+COUNTS = TypeAdapter(list[int])
+
+
+def family_scope(family_id: UUID) -> str:
+    return f"family:{family_id}"
+
+
+def user_scope(user_id: UUID) -> str:
+    return f"user:{user_id}"
+
+
+def interval_key(interval: DateRangeSchema | None) -> str:
+    if interval is None:
+        return ":"
+    return f"{interval.start or ''}:{interval.end or ''}"
+
+
+class StatsCache:
+    """
+    Two-tier cache of statistics results: an in-process TTL LRU in front of
+    Redis.
+
+    Every entry key contains the current version of the scopes (families,
+    users) it was computed for. Approving a completion increments the versions
+    in Redis, so old entries are never read again and simply expire. Versions
+    are read on every lookup; while Redis is unavailable the cache is bypassed.
+    Concurrent lookups of the same key in this process share one computation.
+    """
+
+    key_prefix = "stats:"
+    version_prefix = "stats:version:"
+
+    def __init__(self, local_size: int, local_ttl: float, redis_ttl: int):
+        self.local = TTLLRUCache[str, Any](local_size, local_ttl)
+        self.redis_ttl = redis_ttl
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def fetch(
+        self,
+        key: str,
+        scopes: list[str],
+        adapter: TypeAdapter[T],
+        load: Callable[[], Awaitable[T]],
+    ) -> T:
+        versions = await self._get_versions(scopes)
+        if versions is None:
+            return await load()
+        key = f"{self.key_prefix}{key}:{versions}"
+
+        value = self.local.get(key)
+        if value is not None:
+            metrics.increment("stats.cache.local_hits")
+            return value
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            metrics.increment("stats.cache.coalesced")
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await self._fetch(key, adapter, load)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # retrieved, so it is not reported when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._in_flight[key]
+
+    async def _fetch(
+        self, key: str, adapter: TypeAdapter[T], load: Callable[[], Awaitable[T]]
+    ) -> T:
+        raw = await self._redis(lambda redis: redis.get(key))
+        if raw is not None:
+            metrics.increment("stats.cache.redis_hits")
+            value = adapter.validate_json(raw)
+        else:
+            metrics.increment("stats.cache.misses")
+            value = await load()
+            await self._redis(
+                lambda redis: redis.set(
+                    key, adapter.dump_json(value), ex=self.redis_ttl
+                )
+            )
+        self.local.set(key, value)
+        return value
+
+    async def invalidate(
+        self,
+        family_ids: Iterable[UUID | str] = (),
+        user_ids: Iterable[UUID | str] = (),
+    ) -> None:
+        scopes = [family_scope(family_id) for family_id in set(family_ids)]
+        scopes += [user_scope(user_id) for user_id in set(user_ids)]
+        if not scopes:
+            return
+
+        async def increment(redis):
+            async with redis.pipeline(transaction=False) as pipe:
+                for scope in scopes:
+                    pipe.incr(self.version_prefix + scope)
+                return await pipe.execute()
+
+        metrics.increment("stats.cache.invalidations", len(scopes))
+        try:
+            await redis_client.run(increment)
+        except RedisUnavailableError as e:
+            # entries cached under the current versions stay valid until they
+            # expire, up to `redis_ttl` seconds
+            metrics.increment("stats.cache.lost_invalidations", len(scopes))
+            logger.warning("Stats cache: invalidation of %s lost: %s", scopes, e)
+
+    def invalidate_on_commit(
+        self, db_session: AsyncSession, family_id: UUID, user_id: UUID
+    ) -> None:
+        call_after_commit(
+            db_session,
+            lambda: self.invalidate(family_ids=[family_id], user_ids=[user_id]),
+        )
+
+    def invalidating(
+        self, deliver: Callable[[list[dict]], Awaitable[None]]
+    ) -> Callable[[list[dict]], Awaitable[None]]:
+        """
+        Wraps an outbox sink which inserts chore-completion events into
+        ClickHouse: the statistics of the events are invalidated once the rows
+        are visible there. Not for the RabbitMQ sink, which returns before the
+        rows are consumed (see `clickhouse_stats_cache`).
+        """
+
+        async def deliver_and_invalidate(events: list[dict]) -> None:
+            await deliver(events)
+            await self.invalidate(
+                family_ids=[event["family_id"] for event in events],
+                user_ids=[event["completed_by_id"] for event in events],
+            )
+
+        return deliver_and_invalidate
+
+    async def _get_versions(self, scopes: list[str]) -> str | None:
+        try:
+            versions = await redis_client.run(
+                lambda redis: redis.mget(
+                    [self.version_prefix + scope for scope in scopes]
+                )
+            )
+        except RedisUnavailableError as e:
+            self._redis_failed(e)
+            return None
+        return ",".join(version or "0" for version in versions)
+
+    async def _redis(self, command: Callable) -> Any:
+        try:
+            return await redis_client.run(command)
+        except RedisUnavailableError as e:
+            self._redis_failed(e)
+            return None
+
+    def _redis_failed(self, error: Exception) -> None:
+        metrics.increment("stats.cache.redis_errors")
+        logger.debug("Stats cache: redis is unavailable: %s", error)
+
+
+stats_cache = StatsCache(
+    local_size=config.STATS_CACHE_LOCAL_SIZE,
+    local_ttl=config.STATS_CACHE_LOCAL_TTL,
+    redis_ttl=config.STATS_CACHE_REDIS_TTL,
+)
+
+# Events ingested through RabbitMQ reach ClickHouse some time after the broker
+# confirmed them and nothing tells when, so versions can't follow them: those
+# results are only cached for a short time.
+if config.CLICKHOUSE_INGESTION_MODE == "direct":
+    clickhouse_stats_cache = stats_cache
+else:
+    clickhouse_stats_cache = StatsCache(
+        local_size=config.STATS_CACHE_LOCAL_SIZE,
+        local_ttl=min(config.STATS_CACHE_LOCAL_TTL, config.STATS_CACHE_BROKER_TTL),
+        redis_ttl=config.STATS_CACHE_BROKER_TTL,
+    )
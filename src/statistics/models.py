@@ -0,0 +1,34 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+
+from core.models import Base
+
+
+class DailyCompletionCount(Base):
+    """
+    Number of approved chore completions per family member, chore and day.
+    Incremented when a completion is approved, read by StatsPostgresRepository.
+    """
+
+    __tablename__ = "daily_completion_counts"
+    __table_args__ = (
+        Index("ix_daily_completion_counts_user_day", "completed_by_id", "day"),
+    )
+
+    family_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(column="family.id", ondelete="CASCADE"), primary_key=True
+    )
+    completed_by_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(column="users.id", ondelete="CASCADE"), primary_key=True
+    )
+    chore_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey(column="chores.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(primary_key=True)
+    completions: Mapped[int] = mapped_column(default=0)
+
+    def __repr__(self):
+        return super().__repr__()
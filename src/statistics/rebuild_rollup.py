@@ -0,0 +1,27 @@
+"""
+Recounts daily_completion_counts from the approved chore completions, e.g. to
+repair drift or after restoring chore_completion from a backup:
+
+    PYTHONPATH=src python -m statistics.rebuild_rollup
+"""
+
+import asyncio
+from statistics.repository import DailyCompletionCountRepository
+
+from core.transactions import STANDARD_WRITE, transaction
+from database_connection import async_session
+
+
+async def rebuild() -> int:
+    async with async_session() as db_session:
+        async with transaction(db_session, STANDARD_WRITE):
+            return await DailyCompletionCountRepository(db_session).rebuild()
+
+
+def main() -> None:
+    rows = asyncio.run(rebuild())
+    print(f"daily_completion_counts rebuilt: {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,41 @@
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
+from typing import AsyncGenerator
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import text
+from sqlalchemy import Date, cast, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from config import ENABLE_CLICKHOUSE
+from chores_completions.models import ChoreCompletion
+from config import CLICKHOUSE_USE_ROLLUPS, ENABLE_CLICKHOUSE
+from core.base_dals import BaseDal
+from core.enums import StatusConfirmENUM
+from core.unit_of_work import get_uow_session
+from statistics.cache import (
+    CHORE_COUNTS,
+    COUNT,
+    COUNTS,
+    HEATMAP,
+    MEMBERS_HEATMAP,
+    USER_COUNTS,
+    StatsCache,
+    clickhouse_stats_cache,
+    family_scope,
+    interval_key,
+    stats_cache,
+    user_scope,
+)
+from statistics.models import DailyCompletionCount
 from statistics.schemas import (
     ChoresFamilyCountSchema,
     DateRangeSchema,
     UserChoresCountSchema,
 )
-from database_connection import clickhouse_client, get_db
+from database_connection import clickhouse_client
 
 
 class StatsRepository(ABC):
@@ -37,6 +59,12 @@ class StatsRepository(ABC):
         self, completed_by_id: UUID, interval: DateRangeSchema | None = None
     ) -> dict[date, int]: ...
 
+    @abstractmethod
+    async def get_family_members_heatmap(
+        self, family_id: UUID, interval: DateRangeSchema | None = None
+    ) -> dict[UUID, dict[date, int]]:
+        """Daily activity of every family member, grouped in a single query"""
+
     @abstractmethod
     async def get_users_chore_completion_count(
         self, users_ids: list[UUID], interval: DateRangeSchema | None = None
@@ -47,25 +75,108 @@ class StatsRepository(ABC):
         self, family_id: UUID, interval: DateRangeSchema | None = None
     ) -> int: ...
 
+    @abstractmethod
+    async def get_families_chore_completion_counts(
+        self, interval: DateRangeSchema | None = None
+    ) -> dict[UUID, int]:
+        """Completions of every family, e.g. to compare both backends"""
+
+    @abstractmethod
+    async def get_completion_counts_by_windows(
+        self,
+        windows: list[DateRangeSchema],
+        family_id: UUID | None = None,
+        completed_by_id: UUID | None = None,
+    ) -> list[int]:
+        """
+        Completions of the family or of the user in each of the windows, in
+        the same order, computed by a single scan
+        """
+
+
+def get_covering_interval(windows: list[DateRangeSchema]) -> DateRangeSchema:
+    """Smallest interval containing all the windows, prefilters the scan"""
+    starts = [window.start for window in windows]
+    ends = [window.end for window in windows]
+    return DateRangeSchema(
+        start=None if None in starts else min(starts),
+        end=None if None in ends else max(ends),
+    )
+
+
+def check_windows_entity(family_id: UUID | None, completed_by_id: UUID | None):
+    if (family_id is None) == (completed_by_id is None):
+        raise ValueError("Exactly one of family_id and completed_by_id is required")
+
+
+@dataclass(frozen=True)
+class ClickhouseSource:
+    """ClickHouse table a statistics query reads and how it counts per day"""
+
+    table: str
+    day: str
+    completions: str
+    # template of the count of the rows matching a condition
+    completions_if: str
+
+    @classmethod
+    def daily_rollup(cls, table: str) -> "ClickhouseSource":
+        # SummingMergeTree parts may not be merged yet, counts are summed
+        return cls(
+            table,
+            day="day",
+            completions="sum(completions)",
+            completions_if="sumIf(completions, {})",
+        )
+
+
+RAW_COMPLETIONS = ClickhouseSource(
+    "chore_completion_stats",
+    day="toDate(created_at)",
+    completions="count(*)",
+    completions_if="countIf({})",
+)
+
 
 class StatsClickhouseRepository(StatsRepository):
+    """
+    Reads the daily rollups of scripts/clickhouse_init.sql, O(days) rows per
+    query, or the raw completion rows when `use_rollups` is off. Intervals are
+    whole days, so both return the same counts.
+    """
+
+    def __init__(self, use_rollups: bool = CLICKHOUSE_USE_ROLLUPS):
+        if use_rollups:
+            self.family_source = ClickhouseSource.daily_rollup(
+                "chore_completion_daily_family"
+            )
+            self.user_source = ClickhouseSource.daily_rollup(
+                "chore_completion_daily_user"
+            )
+            self.chore_source = ClickhouseSource.daily_rollup(
+                "chore_completion_daily_chore"
+            )
+        else:
+            self.family_source = self.user_source = self.chore_source = RAW_COMPLETIONS
+
     async def get_family_members_by_chores_completions(
         self,
         family_id: UUID,
         interval: DateRangeSchema | None = None,
     ) -> list[UserChoresCountSchema]:
         async_client = await clickhouse_client.get_client()
+        source = self.user_source
 
         condition, parameters = self.__family_date_condition_parameters(
-            family_id, interval
+            family_id, source, interval
         )
 
         query_result = await async_client.query(
             query=f"""
                 SELECT 
                     completed_by_id, 
-                    count(*) AS chore_completion_count
-                FROM chore_completion_stats
+                    {source.completions} AS chore_completion_count
+                FROM {source.table}
                 WHERE {condition}
                 GROUP BY completed_by_id
                 ORDER BY chore_completion_count DESC
@@ -84,17 +195,18 @@ class StatsClickhouseRepository(StatsRepository):
         interval: DateRangeSchema | None = None,
     ) -> list[ChoresFamilyCountSchema]:
         async_client = await clickhouse_client.get_client()
+        source = self.chore_source
 
         condition, parameters = self.__family_date_condition_parameters(
-            family_id, interval
+            family_id, source, interval
         )
 
         query_result = await async_client.query(
             query=f"""
                 SELECT 
                     chore_id, 
-                    count(*) AS chore_completion_count
-                FROM chore_completion_stats
+                    {source.completions} AS chore_completion_count
+                FROM {source.table}
                 WHERE {condition}
                 GROUP BY chore_id
                 ORDER BY chore_completion_count DESC
@@ -113,17 +225,18 @@ class StatsClickhouseRepository(StatsRepository):
         interval: DateRangeSchema | None = None,
     ) -> dict[date, int]:
         async_client = await clickhouse_client.get_client()
+        source = self.family_source
 
         condition, parameters = self.__family_date_condition_parameters(
-            family_id, interval
+            family_id, source, interval
         )
 
         query_result = await async_client.query(
             query=f"""
                 SELECT 
-                    toDate(created_at) AS day,
-                    count(*) AS chore_completion_count
-                FROM chore_completion_stats
+                    {source.day} AS day,
+                    {source.completions} AS chore_completion_count
+                FROM {source.table}
                 WHERE {condition}
                 GROUP BY day
                 ORDER BY day ASC
@@ -138,17 +251,18 @@ class StatsClickhouseRepository(StatsRepository):
         interval: DateRangeSchema | None = None,
     ) -> dict[date, int]:
         async_client = await clickhouse_client.get_client()
+        source = self.user_source
 
         condition, parameters = self.__user_date_condition_parameters(
-            completed_by_id, interval
+            completed_by_id, source, interval
         )
 
         query_result = await async_client.query(
             query=f"""
                 SELECT 
-                    toDate(created_at) AS day,
-                    count(*) AS chore_completion_count
-                FROM chore_completion_stats
+                    {source.day} AS day,
+                    {source.completions} AS chore_completion_count
+                FROM {source.table}
                 WHERE {condition}
                 GROUP BY day
                 ORDER BY day ASC
@@ -157,6 +271,37 @@ class StatsClickhouseRepository(StatsRepository):
         )
         return {row[0]: row[1] for row in query_result.result_rows}
 
+    async def get_family_members_heatmap(
+        self,
+        family_id: UUID,
+        interval: DateRangeSchema | None = None,
+    ) -> dict[UUID, dict[date, int]]:
+        async_client = await clickhouse_client.get_client()
+        source = self.user_source
+
+        condition, parameters = self.__family_date_condition_parameters(
+            family_id, source, interval
+        )
+
+        query_result = await async_client.query(
+            query=f"""
+                SELECT
+                    completed_by_id,
+                    {source.day} AS day,
+                    {source.completions} AS chore_completion_count
+                FROM {source.table}
+                WHERE {condition}
+                GROUP BY completed_by_id, day
+                ORDER BY completed_by_id, day
+            """,
+            parameters=parameters,
+        )
+
+        heatmaps: dict[UUID, dict[date, int]] = {}
+        for user_id, day, count in query_result.result_rows:
+            heatmaps.setdefault(user_id, {})[day] = count
+        return heatmaps
+
     async def get_users_chore_completion_count(
         self,
         users_ids: list[UUID],
@@ -166,19 +311,20 @@ class StatsClickhouseRepository(StatsRepository):
             return []
 
         async_client = await clickhouse_client.get_client()
+        source = self.user_source
         condition = "completed_by_id IN %(users_ids)s"
         parameters = {"users_ids": [str(uid) for uid in users_ids]}
 
         condition, parameters = self.__date_condition_parameters(
-            condition, parameters, interval
+            condition, parameters, source, interval
         )
 
         query_result = await async_client.query(
             query=f"""
                 SELECT 
                     completed_by_id,
-                    count(*) AS completion_count
-                FROM chore_completion_stats
+                    {source.completions} AS completion_count
+                FROM {source.table}
                 WHERE {condition}
                 GROUP BY completed_by_id
             """,
@@ -193,15 +339,16 @@ class StatsClickhouseRepository(StatsRepository):
         self, family_id: UUID, interval: DateRangeSchema | None = None
     ) -> int:
         async_client = await clickhouse_client.get_client()
+        source = self.family_source
 
         condition, parameters = self.__family_date_condition_parameters(
-            family_id, interval
+            family_id, source, interval
         )
 
         query_result = await async_client.query(
             query=f"""
-                SELECT count(*) AS completion_count
-                FROM chore_completion_stats
+                SELECT {source.completions} AS completion_count
+                FROM {source.table}
                 WHERE {condition}
                 GROUP BY family_id
             """,
@@ -212,43 +359,123 @@ class StatsClickhouseRepository(StatsRepository):
             return rows[0][0]
         return 0
 
+    async def get_families_chore_completion_counts(
+        self, interval: DateRangeSchema | None = None
+    ) -> dict[UUID, int]:
+        async_client = await clickhouse_client.get_client()
+        source = self.family_source
+
+        condition, parameters = self.__date_condition_parameters(
+            "1", {}, source, interval
+        )
+
+        query_result = await async_client.query(
+            query=f"""
+                SELECT family_id, {source.completions} AS completion_count
+                FROM {source.table}
+                WHERE {condition}
+                GROUP BY family_id
+            """,
+            parameters=parameters,
+        )
+        return dict(query_result.result_rows)
+
+    async def get_completion_counts_by_windows(
+        self,
+        windows: list[DateRangeSchema],
+        family_id: UUID | None = None,
+        completed_by_id: UUID | None = None,
+    ) -> list[int]:
+        check_windows_entity(family_id, completed_by_id)
+        if not windows:
+            return []
+
+        async_client = await clickhouse_client.get_client()
+        covering_interval = get_covering_interval(windows)
+        if family_id is not None:
+            source = self.family_source
+            condition, parameters = self.__family_date_condition_parameters(
+                family_id, source, covering_interval
+            )
+        else:
+            source = self.user_source
+            condition, parameters = self.__user_date_condition_parameters(
+                completed_by_id, source, covering_interval
+            )
+
+        counts = []
+        for i, window in enumerate(windows):
+            window_condition = ["1"]
+            if window.start:
+                window_condition.append(f"{source.day} >= %(window_start_{i})s")
+                parameters[f"window_start_{i}"] = window.start
+            if window.end:
+                window_condition.append(f"{source.day} <= %(window_end_{i})s")
+                parameters[f"window_end_{i}"] = window.end
+            counts.append(source.completions_if.format(" AND ".join(window_condition)))
+
+        query_result = await async_client.query(
+            query=f"""
+                SELECT {", ".join(counts)}
+                FROM {source.table}
+                WHERE {condition}
+            """,
+            parameters=parameters,
+        )
+        return list(query_result.result_rows[0])
+
     def __family_date_condition_parameters(
-        self, family_id: UUID, interval: DateRangeSchema | None = None
+        self,
+        family_id: UUID,
+        source: ClickhouseSource,
+        interval: DateRangeSchema | None = None,
     ) -> tuple[str, dict]:
         condition = "family_id = %(family_id)s"
         parameters = {"family_id": str(family_id)}
 
-        return self.__date_condition_parameters(condition, parameters, interval)
+        return self.__date_condition_parameters(condition, parameters, source, interval)
 
     def __user_date_condition_parameters(
-        self, completed_by_id: UUID, interval: DateRangeSchema | None = None
+        self,
+        completed_by_id: UUID,
+        source: ClickhouseSource,
+        interval: DateRangeSchema | None = None,
     ) -> tuple[str, dict]:
         condition = "completed_by_id = %(completed_by_id)s"
         parameters = {"completed_by_id": str(completed_by_id)}
 
-        return self.__date_condition_parameters(condition, parameters, interval)
+        return self.__date_condition_parameters(condition, parameters, source, interval)
 
     def __date_condition_parameters(
-        self, condition: str, parameters: dict, interval: DateRangeSchema | None = None
+        self,
+        condition: str,
+        parameters: dict,
+        source: ClickhouseSource,
+        interval: DateRangeSchema | None = None,
     ) -> tuple[str, dict]:
         if interval:
             if interval.start and interval.end:
                 condition += (
-                    " AND toDate(created_at) BETWEEN %(start_date)s AND %(end_date)s"
+                    f" AND {source.day} BETWEEN %(start_date)s AND %(end_date)s"
                 )
                 parameters["start_date"] = interval.start
                 parameters["end_date"] = interval.end
             elif interval.start:
-                condition += " AND toDate(created_at) >= %(start_date)s"
+                condition += f" AND {source.day} >= %(start_date)s"
                 parameters["start_date"] = interval.start
             elif interval.end:
-                condition += " AND toDate(created_at) <= %(end_date)s"
+                condition += f" AND {source.day} <= %(end_date)s"
                 parameters["end_date"] = interval.end
         return condition, parameters
 
 
 @dataclass
 class StatsPostgresRepository(StatsRepository):
+    """
+    Reads the daily_completion_counts rollup, so the cost of a query follows
+    the number of days (and members, chores) rather than of completions.
+    """
+
     db_session: AsyncSession
 
     async def get_family_members_by_chores_completions(
@@ -262,8 +489,8 @@ class StatsPostgresRepository(StatsRepository):
         condition, params = self._add_date_interval(condition, params, interval)
 
         query = text(f"""
-            SELECT completed_by_id, COUNT(*) AS count
-            FROM chore_completion
+            SELECT completed_by_id, SUM(completions) AS count
+            FROM daily_completion_counts
             WHERE {condition}
             GROUP BY completed_by_id
             ORDER BY count DESC
@@ -287,8 +514,8 @@ class StatsPostgresRepository(StatsRepository):
         condition, params = self._add_date_interval(condition, params, interval)
 
         query = text(f"""
-            SELECT chore_id, COUNT(*) AS count
-            FROM chore_completion
+            SELECT chore_id, SUM(completions) AS count
+            FROM daily_completion_counts
             WHERE {condition}
             GROUP BY chore_id
             ORDER BY count DESC
@@ -312,8 +539,8 @@ class StatsPostgresRepository(StatsRepository):
         condition, params = self._add_date_interval(condition, params, interval)
 
         query = text(f"""
-            SELECT DATE(created_at) AS day, COUNT(*) AS count
-            FROM chore_completion
+            SELECT day, SUM(completions) AS count
+            FROM daily_completion_counts
             WHERE {condition}
             GROUP BY day
             ORDER BY day
@@ -333,8 +560,8 @@ class StatsPostgresRepository(StatsRepository):
         condition, params = self._add_date_interval(condition, params, interval)
 
         query = text(f"""
-            SELECT DATE(created_at) AS day, COUNT(*) AS count
-            FROM chore_completion
+            SELECT day, SUM(completions) AS count
+            FROM daily_completion_counts
             WHERE {condition}
             GROUP BY day
             ORDER BY day
@@ -343,6 +570,31 @@ class StatsPostgresRepository(StatsRepository):
         rows = (await self.db_session.execute(query, params)).all()
         return {row[0]: row[1] for row in rows}
 
+    async def get_family_members_heatmap(
+        self,
+        family_id: UUID,
+        interval: DateRangeSchema | None = None,
+    ) -> dict[UUID, dict[date, int]]:
+        condition = "family_id = :family_id"
+        params = {"family_id": str(family_id)}
+
+        condition, params = self._add_date_interval(condition, params, interval)
+
+        query = text(
+            f"""
+            SELECT completed_by_id, day, SUM(completions) AS count
+            FROM daily_completion_counts
+            WHERE {condition}
+            GROUP BY completed_by_id, day
+            ORDER BY completed_by_id, day
+        """
+        )
+
+        heatmaps: dict[UUID, dict[date, int]] = {}
+        for user_id, day, count in await self.db_session.execute(query, params):
+            heatmaps.setdefault(user_id, {})[day] = count
+        return heatmaps
+
     async def get_users_chore_completion_count(
         self,
         users_ids: list[UUID],
@@ -356,8 +608,8 @@ class StatsPostgresRepository(StatsRepository):
         condition, params = self._add_date_interval(condition, params, interval)
 
         query = text(f"""
-            SELECT completed_by_id, COUNT(*) AS completion_count
-            FROM chore_completion
+            SELECT completed_by_id, SUM(completions) AS completion_count
+            FROM daily_completion_counts
             WHERE {condition}
             GROUP BY completed_by_id
         """)
@@ -380,8 +632,8 @@ class StatsPostgresRepository(StatsRepository):
         condition, params = self._add_date_interval(condition, params, interval)
 
         query = text(f"""
-            SELECT COUNT(*)
-            FROM chore_completion
+            SELECT SUM(completions)
+            FROM daily_completion_counts
             WHERE {condition}
             GROUP BY family_id
         """)
@@ -392,25 +644,321 @@ class StatsPostgresRepository(StatsRepository):
             return rows[0][0]
         return 0
 
+    async def get_families_chore_completion_counts(
+        self, interval: DateRangeSchema | None = None
+    ) -> dict[UUID, int]:
+        condition, params = self._add_date_interval("TRUE", {}, interval)
+
+        query = text(
+            f"""
+            SELECT family_id, SUM(completions)
+            FROM daily_completion_counts
+            WHERE {condition}
+            GROUP BY family_id
+        """
+        )
+
+        rows = (await self.db_session.execute(query, params)).all()
+        return {row[0]: row[1] for row in rows}
+
+    async def get_completion_counts_by_windows(
+        self,
+        windows: list[DateRangeSchema],
+        family_id: UUID | None = None,
+        completed_by_id: UUID | None = None,
+    ) -> list[int]:
+        check_windows_entity(family_id, completed_by_id)
+        if not windows:
+            return []
+
+        if family_id is not None:
+            condition = "family_id = :family_id"
+            params = {"family_id": str(family_id)}
+        else:
+            condition = "completed_by_id = :completed_by_id"
+            params = {"completed_by_id": str(completed_by_id)}
+        condition, params = self._add_date_interval(
+            condition, params, get_covering_interval(windows)
+        )
+
+        counts = []
+        for i, window in enumerate(windows):
+            window_condition = ["TRUE"]
+            if window.start:
+                window_condition.append(f"day >= :window_start_{i}")
+                params[f"window_start_{i}"] = window.start
+            if window.end:
+                window_condition.append(f"day < :window_end_{i}")
+                params[f"window_end_{i}"] = window.end + timedelta(days=1)
+            counts.append(
+                "COALESCE(SUM(completions) FILTER "
+                f"(WHERE {' AND '.join(window_condition)}), 0)"
+            )
+
+        query = text(
+            f"""
+            SELECT {", ".join(counts)}
+            FROM daily_completion_counts
+            WHERE {condition}
+        """
+        )
+
+        row = (await self.db_session.execute(query, params)).one()
+        return list(row)
+
     def _add_date_interval(self, condition, params, interval):
+        # half-open range on the bare column, usable by the indexes
         if interval:
-            if interval.start and interval.end:
-                condition += " AND DATE(created_at) BETWEEN :start AND :end"
-                params["start"] = interval.start
-                params["end"] = interval.end
-            elif interval.start:
-                condition += " AND DATE(created_at) >= :start"
+            if interval.start:
+                condition += " AND day >= :start"
                 params["start"] = interval.start
-            elif interval.end:
-                condition += " AND DATE(created_at) <= :end"
-                params["end"] = interval.end
+            if interval.end:
+                condition += " AND day < :end"
+                params["end"] = interval.end + timedelta(days=1)
 
         return condition, params
 
 
-def get_statistic_repo(
-    async_session: AsyncSession = Depends(get_db),
-) -> StatsRepository:
+class DailyCompletionCountRepository(BaseDal[DailyCompletionCount]):
+    model = DailyCompletionCount
+
+    async def increment(self, chore_completion: ChoreCompletion) -> None:
+        """Counts an approved completion, in the approving transaction"""
+        query = insert(DailyCompletionCount).values(
+            family_id=chore_completion.family_id,
+            completed_by_id=chore_completion.completed_by_id,
+            chore_id=chore_completion.chore_id,
+            day=chore_completion.created_at.date(),
+            completions=1,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=DailyCompletionCount.__table__.primary_key.columns,
+            set_={"completions": DailyCompletionCount.completions + 1},
+        )
+        await self.db_session.execute(query)
+
+    async def rebuild(self) -> int:
+        """
+        Recounts the whole table from the approved completions and returns the
+        number of rows. Approvals committing meanwhile wait for the table lock
+        and are counted on top of the rebuilt rows.
+        """
+        await self.db_session.execute(
+            text("LOCK TABLE daily_completion_counts IN EXCLUSIVE MODE")
+        )
+        await self.db_session.execute(delete(DailyCompletionCount))
+        day = cast(ChoreCompletion.created_at, Date)
+        counts = (
+            select(
+                ChoreCompletion.family_id,
+                ChoreCompletion.completed_by_id,
+                ChoreCompletion.chore_id,
+                day,
+                func.count(),
+            )
+            .where(ChoreCompletion.status == StatusConfirmENUM.approved)
+            .group_by(
+                ChoreCompletion.family_id,
+                ChoreCompletion.completed_by_id,
+                ChoreCompletion.chore_id,
+                day,
+            )
+        )
+        result = await self.db_session.execute(
+            insert(DailyCompletionCount).from_select(
+                ["family_id", "completed_by_id", "chore_id", "day", "completions"],
+                counts,
+            )
+        )
+        return result.rowcount
+
+
+class CachedStatsRepository(StatsRepository):
+    """
+    Serves `StatsRepository` calls from `StatsCache`. The wrapped repository
+    is opened on the first miss only, so a hit does not touch the database.
+    """
+
+    def __init__(
+        self,
+        backend: str,
+        open_repo: Callable[[], Awaitable[StatsRepository]],
+        cache: StatsCache = stats_cache,
+    ):
+        self.backend = backend
+        self.open_repo = open_repo
+        self.cache = cache
+        self._repo: StatsRepository | None = None
+
+    async def get_repo(self) -> StatsRepository:
+        if self._repo is None:
+            self._repo = await self.open_repo()
+        return self._repo
+
+    async def get_family_members_by_chores_completions(
+        self, family_id: UUID, interval: DateRangeSchema | None = None
+    ) -> list[UserChoresCountSchema]:
+        async def load():
+            repo = await self.get_repo()
+            return await repo.get_family_members_by_chores_completions(
+                family_id, interval
+            )
+
+        return await self.cache.fetch(
+            self._key("family_members", family_id, interval),
+            [family_scope(family_id)],
+            USER_COUNTS,
+            load,
+        )
+
+    async def get_chores_by_completions(
+        self, family_id: UUID, interval: DateRangeSchema | None = None
+    ) -> list[ChoresFamilyCountSchema]:
+        async def load():
+            repo = await self.get_repo()
+            return await repo.get_chores_by_completions(family_id, interval)
+
+        return await self.cache.fetch(
+            self._key("family_chores", family_id, interval),
+            [family_scope(family_id)],
+            CHORE_COUNTS,
+            load,
+        )
+
+    async def get_family_heatmap(
+        self, family_id: UUID, interval: DateRangeSchema | None = None
+    ) -> dict[date, int]:
+        async def load():
+            repo = await self.get_repo()
+            return await repo.get_family_heatmap(family_id, interval)
+
+        return await self.cache.fetch(
+            self._key("family_heatmap", family_id, interval),
+            [family_scope(family_id)],
+            HEATMAP,
+            load,
+        )
+
+    async def get_user_heatmap(
+        self, completed_by_id: UUID, interval: DateRangeSchema | None = None
+    ) -> dict[date, int]:
+        async def load():
+            repo = await self.get_repo()
+            return await repo.get_user_heatmap(completed_by_id, interval)
+
+        return await self.cache.fetch(
+            self._key("user_heatmap", completed_by_id, interval),
+            [user_scope(completed_by_id)],
+            HEATMAP,
+            load,
+        )
+
+    async def get_family_members_heatmap(
+        self, family_id: UUID, interval: DateRangeSchema | None = None
+    ) -> dict[UUID, dict[date, int]]:
+        async def load():
+            repo = await self.get_repo()
+            return await repo.get_family_members_heatmap(family_id, interval)
+
+        return await self.cache.fetch(
+            self._key("family_members_heatmap", family_id, interval),
+            [family_scope(family_id)],
+            MEMBERS_HEATMAP,
+            load,
+        )
+
+    async def get_users_chore_completion_count(
+        self, users_ids: list[UUID], interval: DateRangeSchema | None = None
+    ) -> list[UserChoresCountSchema]:
+        if not users_ids:
+            return []
+        users_ids = sorted(set(users_ids))
+
+        async def load():
+            repo = await self.get_repo()
+            return await repo.get_users_chore_completion_count(users_ids, interval)
+
+        return await self.cache.fetch(
+            self._key("users_counts", ",".join(map(str, users_ids)), interval),
+            [user_scope(user_id) for user_id in users_ids],
+            USER_COUNTS,
+            load,
+        )
+
+    async def get_family_chore_completion_count(
+        self, family_id: UUID, interval: DateRangeSchema | None = None
+    ) -> int:
+        async def load():
+            repo = await self.get_repo()
+            return await repo.get_family_chore_completion_count(family_id, interval)
+
+        return await self.cache.fetch(
+            self._key("family_count", family_id, interval),
+            [family_scope(family_id)],
+            COUNT,
+            load,
+        )
+
+    async def get_families_chore_completion_counts(
+        self, interval: DateRangeSchema | None = None
+    ) -> dict[UUID, int]:
+        # not scoped to a family or a user, so it isn't cached
+        repo = await self.get_repo()
+        return await repo.get_families_chore_completion_counts(interval)
+
+    async def get_completion_counts_by_windows(
+        self,
+        windows: list[DateRangeSchema],
+        family_id: UUID | None = None,
+        completed_by_id: UUID | None = None,
+    ) -> list[int]:
+        check_windows_entity(family_id, completed_by_id)
+
+        async def load():
+            repo = await self.get_repo()
+            return await repo.get_completion_counts_by_windows(
+                windows, family_id, completed_by_id
+            )
+
+        if family_id is not None:
+            query, entity, scope = "family_windows", family_id, family_scope(family_id)
+        else:
+            query, entity = "user_windows", completed_by_id
+            scope = user_scope(completed_by_id)
+        windows_key = ";".join(map(interval_key, windows))
+        return await self.cache.fetch(
+            f"{self.backend}:{query}:{entity}:{windows_key}",
+            [scope],
+            COUNTS,
+            load,
+        )
+
+    def _key(
+        self, query: str, entity: UUID | str, interval: DateRangeSchema | None
+    ) -> str:
+        return f"{self.backend}:{query}:{entity}:{interval_key(interval)}"
+
+
+async def get_statistic_repo(
+    async_session: AsyncSession = Depends(get_uow_session),
+) -> AsyncGenerator[StatsRepository, None]:
+    """
+    Postgres statistics are read in the request's unit of work, on the
+    primary: the cache versions are bumped once an approval committed there, a
+    replica still replaying it would have the old counts cached under the new
+    version. Only misses reach it.
+    """
     if ENABLE_CLICKHOUSE:
-        return StatsClickhouseRepository()
-    return StatsPostgresRepository(async_session)
+
+        async def open_clickhouse_repo() -> StatsRepository:
+            return StatsClickhouseRepository()
+
+        yield CachedStatsRepository(
+            "clickhouse", open_clickhouse_repo, clickhouse_stats_cache
+        )
+        return
+
+    async def open_postgres_repo() -> StatsRepository:
+        return StatsPostgresRepository(async_session)
+
+    yield CachedStatsRepository("postgres", open_postgres_repo)
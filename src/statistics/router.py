@@ -1,15 +1,19 @@
-from datetime import datetime
+from datetime import UTC, date, datetime, timedelta
 from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, Query
 
+from core.exceptions.statistics import DateRangeTooLongError
 from core.permissions import FamilyMemberPermission, FamilyUserAccessPermission
 from statistics.repository import StatsRepository, get_statistic_repo
 from statistics.schemas import (
     ActivitySchema,
     ChoresFamilyCountSchema,
+    CompactActivitySchema,
     DateRangeSchema,
     FamilyProfileStats,
+    MemberActivitySchema,
+    MembersActivitySchema,
     UserActivitySchema,
     UserChoresCountSchema,
     UserProfileStats,
@@ -31,6 +35,46 @@ def get_date_range(
     return DateRangeSchema(start=start, end=end)
 
 
+HEATMAP_MAX_DAYS = 366
+
+
+def get_heatmap_range(
+    interval: DateRangeSchema = Depends(get_date_range),
+) -> DateRangeSchema:
+    """Bounds a heatmap interval, by default the last year up to today"""
+    end = interval.end or datetime.now(UTC).date()
+    start = interval.start or end - timedelta(days=HEATMAP_MAX_DAYS - 1)
+    if (end - start).days >= HEATMAP_MAX_DAYS:
+        raise DateRangeTooLongError(HEATMAP_MAX_DAYS)
+    return DateRangeSchema(start=start, end=end)
+
+
+def fill_heatmap(
+    activity_data: dict[date, int], interval: DateRangeSchema
+) -> list[int]:
+    """One count per day of the interval, zero for the days without activity"""
+    counts = [0] * max((interval.end - interval.start).days + 1, 0)
+    for activity_date, activity in activity_data.items():
+        counts[(activity_date - interval.start).days] = activity
+    return counts
+
+
+def get_heatmap_response(
+    activity_data: dict[date, int], interval: DateRangeSchema, compact: bool
+) -> UserActivitySchema | CompactActivitySchema:
+    counts = fill_heatmap(activity_data, interval)
+    if compact:
+        return CompactActivitySchema(start=interval.start, counts=counts)
+    return UserActivitySchema(
+        activities=[
+            ActivitySchema(
+                activity_date=interval.start + timedelta(days=i), activity=activity
+            )
+            for i, activity in enumerate(counts)
+        ]
+    )
+
+
 date_range_docs = """
 - **start** — Start date of the interval (optional). If not provided, there will be no lower time limit.
 - **end** — End date of the interval (optional). If not provided, there will be no upper time limit.
@@ -38,6 +82,12 @@ date_range_docs = """
 If both start and end dates are missing, the statistics are calculated for all time.
 """
 
+heatmap_docs = """
+- **start** — Start date of the interval (optional). Defaults to 365 days before the end date.
+- **end** — End date of the interval (optional). Defaults to today (UTC).
+- **compact** — Return the start date and one count per day instead of a list of days (optional, false by default).
+"""
+
 
 @router.get(
     "/families/members",
@@ -86,7 +136,7 @@ async def family_chores_stats(
 @router.get(
     "/families/heatmap",
     tags=["Statistics"],
-    response_model=UserActivitySchema,
+    response_model=UserActivitySchema | CompactActivitySchema,
     summary="---",
     description=f"""
 Retrieves the family's daily activity statistics within a specified date range.
@@ -97,37 +147,73 @@ Each day in the range will be listed, even if the nobody had no activity on that
 - **family_id** — Unique identifier of the family (required).
 
 **Query parameters**:
-{date_range_docs}
+{heatmap_docs}
 
 **Response**:
 Returns a list of days with the corresponding number of completed chores.  
 Days without any activity will have an activity count of 0.
 Results are sorted chronologically.
 
+In compact mode returns `start` and `counts`: the number of completed chores of
+every day of the range, the first one being `start`.
+
 **Note:**  
 - The maximum allowed date range is **1 year** (366 days).  
 - If a longer range is requested, an error will be returned.
 """,
 )
 async def family_heatmap(
-    interval: DateRangeSchema = Depends(get_date_range),
+    interval: DateRangeSchema = Depends(get_heatmap_range),
+    compact: bool = Query(False, description="Return one count per day"),
     current_user: User = Depends(FamilyMemberPermission()),
     statsRepo: StatsRepository = Depends(get_statistic_repo),
-) -> UserActivitySchema:
+) -> UserActivitySchema | CompactActivitySchema:
     activity_data = await statsRepo.get_family_heatmap(current_user.family_id, interval)
-    if not activity_data:
-        return UserActivitySchema(activities=[])
+    return get_heatmap_response(activity_data, interval, compact)
+
+
+@router.get(
+    "/families/heatmap/members",
+    tags=["Statistics"],
+    response_model=MembersActivitySchema,
+    summary="Get daily activity of every family member",
+    description=f"""
+Retrieves the daily activity of all members of the family within a specified date range, computed by a single query.
+
+**Query parameters**:
+- **start** — Start date of the interval (optional). Defaults to 365 days before the end date.
+- **end** — End date of the interval (optional). Defaults to today (UTC).
 
-    list_activities = []
-    for i in activity_data.items():
-        list_activities.append(ActivitySchema(activity_date=i[0], activity=i[1]))
-    return UserActivitySchema(activities=list_activities)
+**Response**:
+Returns `start` and, for every member who completed chores in the range, the
+number of completed chores of every day of the range, the first one being `start`.
+Members are ordered by the number of completed chores in descending order.
+
+**Note:**  
+- The maximum allowed date range is **1 year** ({HEATMAP_MAX_DAYS} days).  
+- If a longer range is requested, an error will be returned.
+""",
+)
+async def family_members_heatmap(
+    interval: DateRangeSchema = Depends(get_heatmap_range),
+    current_user: User = Depends(FamilyMemberPermission()),
+    statsRepo: StatsRepository = Depends(get_statistic_repo),
+) -> MembersActivitySchema:
+    heatmaps = await statsRepo.get_family_members_heatmap(
+        current_user.family_id, interval
+    )
+    members = [
+        MemberActivitySchema(user_id=user_id, counts=fill_heatmap(heatmap, interval))
+        for user_id, heatmap in heatmaps.items()
+    ]
+    members.sort(key=lambda member: sum(member.counts), reverse=True)
+    return MembersActivitySchema(start=interval.start, members=members)
 
 
 @router.get(
     "/users/{user_id}/heatmap",
     tags=["Statistics"],
-    response_model=UserActivitySchema,
+    response_model=UserActivitySchema | CompactActivitySchema,
     summary="Get user's daily activity",
     description=f"""
 Retrieves the user's daily activity statistics within a specified date range.
@@ -138,13 +224,16 @@ Each day in the range will be listed, even if the user had no activity on that d
 - **user_id** — Unique identifier of the user (required).
 
 **Query parameters**:
-{date_range_docs}
+{heatmap_docs}
 
 **Response**:
 Returns a list of days with the corresponding number of completed chores.  
 Days without any activity will have an activity count of 0.
 Results are sorted chronologically.
 
+In compact mode returns `start` and `counts`: the number of completed chores of
+every day of the range, the first one being `start`.
+
 **Note:**  
 - The maximum allowed date range is **1 year** (366 days).  
 - If a longer range is requested, an error will be returned.
@@ -153,18 +242,12 @@ Results are sorted chronologically.
 async def user_heatmap(
     user_id: UUID,
     current_user: User = Depends(FamilyUserAccessPermission()),
-    interval: DateRangeSchema = Depends(get_date_range),
+    interval: DateRangeSchema = Depends(get_heatmap_range),
+    compact: bool = Query(False, description="Return one count per day"),
     statsRepo: StatsRepository = Depends(get_statistic_repo),
-) -> UserActivitySchema:
+) -> UserActivitySchema | CompactActivitySchema:
     activity_data = await statsRepo.get_user_heatmap(user_id, interval)
-
-    if not activity_data:
-        return UserActivitySchema(activities=[])
-
-    list_activities = []
-    for i in activity_data.items():
-        list_activities.append(ActivitySchema(activity_date=i[0], activity=i[1]))
-    return UserActivitySchema(activities=list_activities)
+    return get_heatmap_response(activity_data, interval, compact)
 
 
 @router.get(
@@ -205,19 +288,14 @@ async def users_profile_stats(
     current_user: User = Depends(FamilyUserAccessPermission()),
     statsRepo: StatsRepository = Depends(get_statistic_repo),
 ) -> UserProfileStats:
-    week_interval = get_current_week_range()
-    month_interval = get_current_month_range()
-
-    week_result = await statsRepo.get_users_chore_completion_count(
-        [user_id], week_interval
-    )
-    month_result = await statsRepo.get_users_chore_completion_count(
-        [user_id], month_interval
+    week_result, month_result = await statsRepo.get_completion_counts_by_windows(
+        [get_current_week_range(), get_current_month_range()],
+        completed_by_id=user_id,
     )
     return UserProfileStats(
         user_id=user_id,
-        completed_this_week=week_result[0].chores_completions_counts,
-        completed_this_month=month_result[0].chores_completions_counts,
+        completed_this_week=week_result,
+        completed_this_month=month_result,
     )
 
 
@@ -236,14 +314,9 @@ async def family_profile_stats(
     current_user: User = Depends(FamilyMemberPermission()),
     statsRepo: StatsRepository = Depends(get_statistic_repo),
 ) -> FamilyProfileStats:
-    week_interval = get_current_week_range()
-    month_interval = get_current_month_range()
-
-    week_result = await statsRepo.get_family_chore_completion_count(
-        current_user.family_id, week_interval
-    )
-    month_result = await statsRepo.get_family_chore_completion_count(
-        current_user.family_id, month_interval
+    week_result, month_result = await statsRepo.get_completion_counts_by_windows(
+        [get_current_week_range(), get_current_month_range()],
+        family_id=current_user.family_id,
     )
     return FamilyProfileStats(
         completed_this_week=week_result,
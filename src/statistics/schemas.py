@@ -36,6 +36,21 @@ class UserActivitySchema(BaseModel):
     activities: list[ActivitySchema]
 
 
+class CompactActivitySchema(BaseModel):
+    start: date = Field(description="Date of the first count")
+    counts: list[int] = Field(description="Activity count of each consecutive day")
+
+
+class MemberActivitySchema(BaseModel):
+    user_id: UUID
+    counts: list[int] = Field(description="Activity count of each consecutive day")
+
+
+class MembersActivitySchema(BaseModel):
+    start: date = Field(description="Date of the first count of every member")
+    members: list[MemberActivitySchema]
+
+
 class ChoresFamilyCountSchema(BaseModel):
     chore_id: UUID
     chores_completions_counts: int
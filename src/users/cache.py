@@ -0,0 +1,175 @@
+import json
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from logging import getLogger
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+import config
+from core.cache import TTLLRUCache
+from core.exceptions.redis import RedisUnavailableError
+from core.metrics import metrics
+from core.transactions import call_after_commit
+from database_connection import redis_client
+from users.models import User
+
+logger = getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class UserSnapshot:
+    """Immutable copy of the columns of a `User` row"""
+
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+    username: str
+    name: str | None
+    surname: str | None
+    family_id: UUID | None
+    email: str
+    is_active: bool
+    is_superuser: bool
+    avatar_version: int | None
+    avatar_extension: str | None
+    experience: int
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserSnapshot":
+        return cls(**{field.name: getattr(user, field.name) for field in fields(cls)})
+
+    def to_user(self, db_session: AsyncSession) -> User:
+        """
+        Attaches the snapshot to the session as a persistent `User` without
+        querying the database, so handlers can still modify and flush it.
+        """
+        user = User(**asdict(self))
+        make_transient_to_detached(user)
+        db_session.add(user)
+        return user
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["id"] = str(self.id)
+        data["family_id"] = str(self.family_id) if self.family_id else None
+        data["created_at"] = self.created_at.isoformat()
+        data["updated_at"] = self.updated_at.isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "UserSnapshot":
+        data = json.loads(raw)
+        data["id"] = UUID(data["id"])
+        data["family_id"] = UUID(data["family_id"]) if data["family_id"] else None
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        data["updated_at"] = datetime.fromisoformat(data["updated_at"])
+        return cls(**data)
+
+
+class UserCache:
+    """
+    Two-tier cache of user snapshots keyed by user id (the token `sub`):
+    an in-process TTL LRU in front of Redis. Redis failures are treated as misses.
+
+    A snapshot which could not be deleted from Redis stays there, so this
+    process skips the Redis tier until the delete is retried successfully.
+    Other workers may still read it once Redis is back and before that retry,
+    at most for `redis_ttl` seconds.
+    """
+
+    key_prefix = "user:snapshot:"
+
+    def __init__(self, local_size: int, local_ttl: float, redis_ttl: int):
+        self.local = TTLLRUCache[str, UserSnapshot](local_size, local_ttl)
+        self.redis_ttl = redis_ttl
+        # users whose snapshots may still be in Redis after a failed delete
+        self._pending_deletes: set[str] = set()
+
+    async def get(self, user_id: str) -> UserSnapshot | None:
+        snapshot = self.local.get(user_id)
+        if snapshot is not None:
+            metrics.increment("users.cache.local_hits")
+            return snapshot
+
+        raw = None
+        if await self._delete_pending():
+            try:
+                raw = await redis_client.run(
+                    lambda redis: redis.get(self.key_prefix + user_id)
+                )
+            except RedisUnavailableError as e:
+                self._redis_failed(e)
+
+        if raw is None:
+            metrics.increment("users.cache.misses")
+            return None
+
+        metrics.increment("users.cache.redis_hits")
+        snapshot = UserSnapshot.from_json(raw)
+        self.local.set(user_id, snapshot)
+        return snapshot
+
+    async def set(self, snapshot: UserSnapshot) -> None:
+        user_id = str(snapshot.id)
+        self.local.set(user_id, snapshot)
+        if not await self._delete_pending():
+            return
+        try:
+            await redis_client.run(
+                lambda redis: redis.set(
+                    self.key_prefix + user_id, snapshot.to_json(), ex=self.redis_ttl
+                )
+            )
+        except RedisUnavailableError as e:
+            self._redis_failed(e)
+
+    async def invalidate(self, *user_ids: UUID | str) -> None:
+        keys = [str(user_id) for user_id in user_ids]
+        for key in keys:
+            self.local.delete(key)
+        metrics.increment("users.cache.invalidations", len(keys))
+        self._pending_deletes.update(keys)
+        if not await self._delete_pending():
+            metrics.increment("users.cache.failed_invalidations", len(keys))
+            logger.warning(
+                "User cache: Redis tier skipped until %s snapshots are deleted",
+                len(self._pending_deletes),
+            )
+
+    async def invalidate_on_commit(
+        self, db_session: AsyncSession, *user_ids: UUID | str
+    ) -> None:
+        """
+        Drops the users right away and once more after the transaction is
+        committed, so a concurrent request can't cache the pre-commit row.
+        """
+        await self.invalidate(*user_ids)
+        call_after_commit(db_session, lambda: self.invalidate(*user_ids))
+
+    async def _delete_pending(self) -> bool:
+        """Whether the Redis tier may be used, i.e. no stale snapshot is left"""
+        if not self._pending_deletes:
+            return True
+        keys = list(self._pending_deletes)
+        try:
+            await redis_client.run(
+                lambda redis: redis.delete(*(self.key_prefix + key for key in keys))
+            )
+        except RedisUnavailableError as e:
+            self._redis_failed(e)
+            return False
+        self._pending_deletes.difference_update(keys)
+        return not self._pending_deletes
+
+    def _redis_failed(self, error: Exception) -> None:
+        metrics.increment("users.cache.redis_errors")
+        logger.debug("User cache: redis is unavailable: %s", error)
+
+
+user_cache = UserCache(
+    local_size=config.USER_CACHE_LOCAL_SIZE,
+    local_ttl=config.USER_CACHE_LOCAL_TTL,
+    redis_ttl=config.USER_CACHE_REDIS_TTL,
+)
@@ -1,9 +1,11 @@
 from uuid import UUID
 
 from sqlalchemy import select, update
+from sqlalchemy.orm.util import identity_key
 
 from core.base_dals import BaseDals, BaseUserPkDals, DeleteDALMixin
 from core.exceptions.users import UserNotFoundError
+from users.cache import UserSnapshot, user_cache
 from users.models import User, UserFamilyPermissions, UserSettings
 
 
@@ -11,6 +13,27 @@ class UserRepository(BaseDals[User]):
     model = User
     not_found_exception = UserNotFoundError
 
+    async def get_cached_by_id(self, user_id: UUID) -> User:
+        """
+        Returns the user from the snapshot cache, attached to the session
+        without a query. Falls back to the database on a miss, or when the
+        session already holds the user (e.g. a transaction retried after a
+        rollback expired it).
+        """
+        in_session = identity_key(User, user_id) in self.db_session.identity_map
+        snapshot = None if in_session else await user_cache.get(str(user_id))
+        if snapshot is not None:
+            return snapshot.to_user(self.db_session)
+
+        user = await self.get_by_id(user_id)
+        await user_cache.set(UserSnapshot.from_user(user))
+        return user
+
+    async def update(self, object: User) -> User:
+        user = await super().update(object)
+        await user_cache.invalidate_on_commit(self.db_session, user.id)
+        return user
+
     async def get_user_by_email(self, email: str) -> User:
         query = select(User).where(User.email == email)
         result = await self.db_session.execute(query)
@@ -20,6 +43,14 @@ class UserRepository(BaseDals[User]):
         else:
             raise self.not_found_exception
 
+    async def get_family_members_by_ids(
+        self, family_id: UUID, user_ids: list[UUID]
+    ) -> dict[UUID, User]:
+        """The users of `user_ids` that belong to the family, by id"""
+        query = select(User).where(User.family_id == family_id, User.id.in_(user_ids))
+        users = (await self.db_session.execute(query)).scalars().all()
+        return {user.id: user for user in users}
+
     async def increment_experience(self, user_id: UUID, value: int):
         await self.db_session.execute(
             update(User)
@@ -27,6 +58,7 @@ class UserRepository(BaseDals[User]):
             .values(experience=User.experience + value)
         )
         await self.db_session.flush()
+        await user_cache.invalidate_on_commit(self.db_session, user_id)
 
 
 class UserSettingsRepository(BaseDals[UserSettings], BaseUserPkDals[UserSettings]):
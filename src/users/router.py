@@ -15,7 +15,7 @@ from core.permissions import (
     FamilyUserAccessPermission,
     IsAuthenicatedPermission,
 )
-from database_connection import get_db
+from core.unit_of_work import get_uow_session
 from families.repository import FamilyRepository
 from users.models import User
 from users.repository import UserRepository, UserSettingsRepository
@@ -41,17 +41,16 @@ router = APIRouter()
 )
 async def me_get_user_profile(
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> MeResponseSchemaFull:
     is_family_member = current_user.family_id is not None
     is_family_admin = False
 
     if is_family_member:
         is_family_member = True
-        async with async_session.begin():
-            is_family_admin = await FamilyRepository(
-                async_session
-            ).user_is_family_admin(current_user.id, current_user.family_id)
+        is_family_admin = await FamilyRepository(async_session).user_is_family_admin(
+            current_user.id, current_user.family_id
+        )
 
     return MeResponseSchemaFull(
         id=current_user.id,
@@ -73,14 +72,13 @@ async def me_get_user_profile(
 async def me_user_partial_update(
     body: UserUpdateSchema,
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> UserResponseSchema:
-    async with async_session.begin():
-        user_dal = UserRepository(async_session)
-        for field, value in body.model_dump(exclude_unset=True).items():
-            setattr(current_user, field, value)
+    user_dal = UserRepository(async_session)
+    for field, value in body.model_dump(exclude_unset=True).items():
+        setattr(current_user, field, value)
 
-        user = await user_dal.update(current_user)
+    user = await user_dal.update(current_user)
 
     result_response = UserResponseSchema(
         id=user.id,
@@ -95,19 +93,18 @@ async def me_user_partial_update(
 @router.get(path="/me/settings", summary="Get current user's settings", tags=["Me"])
 async def me_user_get_settings(
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> UserSettingsResponseSchema:
-    async with async_session.begin():
-        user_settings = await UserSettingsRepository(async_session).get_by_user_id(
-            current_user.id
-        )
-        if user_settings is None:
-            raise HTTPException(status_code=404)
-        return UserSettingsResponseSchema(
-            app_theme=user_settings.app_theme,
-            language=user_settings.language,
-            date_of_birth=user_settings.date_of_birth,
-        )
+    user_settings = await UserSettingsRepository(async_session).get_by_user_id(
+        current_user.id
+    )
+    if user_settings is None:
+        raise HTTPException(status_code=404)
+    return UserSettingsResponseSchema(
+        app_theme=user_settings.app_theme,
+        language=user_settings.language,
+        date_of_birth=user_settings.date_of_birth,
+    )
 
 
 @router.patch(
@@ -118,15 +115,14 @@ async def me_user_get_settings(
 async def me_user_settings_partial_update(
     body: UserSettingsUpdateSchema,
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> UserSettingsResponseSchema:
-    async with async_session.begin():
-        UserSettingsDal = UserSettingsRepository(async_session)
-        user_settings = await UserSettingsDal.get_by_user_id(current_user.id)
-        for field, value in body.model_dump(exclude_unset=True).items():
-            setattr(user_settings, field, value)
+    UserSettingsDal = UserSettingsRepository(async_session)
+    user_settings = await UserSettingsDal.get_by_user_id(current_user.id)
+    for field, value in body.model_dump(exclude_unset=True).items():
+        setattr(user_settings, field, value)
 
-        user_settings = await UserSettingsDal.update(user_settings)
+    user_settings = await UserSettingsDal.update(user_settings)
 
     result_response = UserSettingsResponseSchema(
         app_theme=user_settings.app_theme,
@@ -144,10 +140,9 @@ async def me_user_settings_partial_update(
 async def get_user_profile(
     user_id: UUID,
     current_user: User = Depends(FamilyUserAccessPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> UserResponseSchemaFull:
-    async with async_session.begin():
-        user = await UserRepository(async_session).get_by_id(user_id)
+    user = await UserRepository(async_session).get_by_id(user_id)
     result = UserResponseSchemaFull.model_validate(user)
     return result
 
@@ -160,16 +155,15 @@ async def get_user_profile(
 async def me_user_upload_avatar(
     file: UploadFile = File(...),
     current_user: User = Depends(IsAuthenicatedPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> JSONResponse:
-    async with async_session.begin():
-        service = UploadAvatarService(
-            target_object=current_user, file=file, db_session=async_session
-        )
-        try:
-            new_avatar_url = await service.run_process()
-        except ImageError as e:
-            raise HTTPException(status_code=400, detail=str(e))
+    service = UploadAvatarService(
+        target_object=current_user, file=file, db_session=async_session
+    )
+    try:
+        new_avatar_url = await service.run_process()
+    except ImageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return JSONResponse(content={"avatar_url": new_avatar_url}, status_code=201)
 
 
@@ -183,13 +177,12 @@ async def user_get_avatar(
     user_id: UUID,
     avatar_version: str | None = Query(None, description="Avatar version"),
     current_user: User = Depends(FamilyUserAccessPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> FileResponse | RedirectResponse:
-    async with async_session.begin():
-        service = GetAvatarService(
-            target_kind="User", target_object_id=user_id, db_session=async_session
-        )
-        avatar = await service.run_process()
+    service = GetAvatarService(
+        target_kind="User", target_object_id=user_id, db_session=async_session
+    )
+    avatar = await service.run_process()
 
     if avatar is None:
         raise HTTPException(status_code=404, detail="User has no avatar")
@@ -1,6 +1,8 @@
 import uuid
+from datetime import datetime
 
-from sqlalchemy import Enum, ForeignKey
+from sqlalchemy import Enum, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from core.enums import (
@@ -31,8 +33,9 @@ class BaseTransaction(Base, BaseIdTimeStampModel):
 
     detail: Mapped[str]
     coins: Mapped[int] = mapped_column(nullable=False)
+    # indexed with (created_at, id) by the subclasses, for the history pages
     to_user_id: Mapped[uuid.UUID | None] = mapped_column(
-        ForeignKey("users.id", ondelete="SET NULL"), index=True
+        ForeignKey("users.id", ondelete="SET NULL")
     )
 
 
@@ -42,6 +45,20 @@ class PeerTransaction(BaseTransaction):
     """
 
     __tablename__ = "peer_transactions"
+    __table_args__ = (
+        Index(
+            "ix_peer_transactions_to_user_id_created_at_id",
+            "to_user_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_peer_transactions_from_user_id_created_at_id",
+            "from_user_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     transaction_type: Mapped[PeerTransactionENUM] = mapped_column(
         Enum(
@@ -53,7 +70,7 @@ class PeerTransaction(BaseTransaction):
         nullable=False,
     )
     from_user_id: Mapped[uuid.UUID | None] = mapped_column(
-        ForeignKey("users.id", ondelete="SET NULL"), index=True
+        ForeignKey("users.id", ondelete="SET NULL")
     )
     product_id: Mapped[uuid.UUID | None] = mapped_column(
         ForeignKey("products.id", ondelete="SET NULL"), index=True
@@ -66,6 +83,14 @@ class RewardTransaction(BaseTransaction):
     """
 
     __tablename__ = "reward_transactions"
+    __table_args__ = (
+        Index(
+            "ix_reward_transactions_to_user_id_created_at_id",
+            "to_user_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     transaction_type: Mapped[RewardTransactionENUM] = mapped_column(
         Enum(
@@ -79,3 +104,64 @@ class RewardTransaction(BaseTransaction):
     chore_completion_id: Mapped[uuid.UUID | None] = mapped_column(
         ForeignKey("chore_completion.id", ondelete="SET NULL"), index=True
     )
+
+
+class WalletLedgerEntry(Base):
+    """
+    Append-only history of a wallet: one row per user side of a peer or reward
+    transaction, written in the same transaction, with snapshots of what the
+    history shows (counterparty, product, chore completion) and the balance
+    after it. Rebuilt from the transaction tables by `wallets.rebuild_ledger`.
+    """
+
+    __tablename__ = "wallet_ledger"
+    __table_args__ = (
+        Index(
+            "ix_wallet_ledger_user_id_created_at_transaction_id",
+            "user_id",
+            "created_at",
+            "transaction_id",
+        ),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    # id of the peer or reward transaction
+    transaction_id: Mapped[uuid.UUID] = mapped_column(primary_key=True)
+    transaction_type: Mapped[str] = mapped_column(String(20))
+    transaction_direction: Mapped[str] = mapped_column(String(8))
+    detail: Mapped[str]
+    coins: Mapped[int]
+    # change of the balance, signed and after the transfer/purchase rate
+    amount: Mapped[int]
+    balance: Mapped[int]
+    other_user: Mapped[dict | None] = mapped_column(JSONB)
+    product: Mapped[dict | None] = mapped_column(JSONB)
+    chore_completion: Mapped[dict | None] = mapped_column(JSONB)
+    created_at: Mapped[datetime]
+
+    def __repr__(self):
+        return super().__repr__()
+
+
+class WalletReconciliation(Base):
+    """
+    Checkpoint of `wallets.reconcile`: the balance the transaction tables give
+    for the wallet up to `verified_until`, so the next run only sums the
+    transactions created after it.
+    """
+
+    __tablename__ = "wallet_reconciliations"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    verified_until: Mapped[datetime]
+    verified_balance: Mapped[int]
+    # wallet balance minus the expected one at the last check, 0 once corrected
+    drift: Mapped[int] = mapped_column(default=0)
+    checked_at: Mapped[datetime]
+
+    def __repr__(self):
+        return super().__repr__()
@@ -0,0 +1,53 @@
+"""
+Rebuilds wallet_ledger from peer_transactions and reward_transactions, e.g. to
+fill it after the table was created or to repair a user's history:
+
+    PYTHONPATH=src python -m wallets.rebuild_ledger [--user USER_ID]
+
+Every wallet is rebuilt in its own short transaction, with the wallet row
+locked, so transfers keep working meanwhile.
+"""
+
+import argparse
+import asyncio
+from uuid import UUID
+
+from sqlalchemy import select
+
+from core.transactions import READ_ONLY, STANDARD_WRITE, transaction
+from database_connection import async_session
+from wallets.models import Wallet
+from wallets.repository import WalletLedgerRepository
+
+
+async def get_user_ids() -> list[UUID]:
+    async with async_session() as db_session:
+        async with transaction(db_session, READ_ONLY):
+            return list((await db_session.scalars(select(Wallet.user_id))).all())
+
+
+async def rebuild_user(user_id: UUID) -> int:
+    async with async_session() as db_session:
+        async with transaction(db_session, STANDARD_WRITE):
+            return await WalletLedgerRepository(db_session).rebuild(user_id)
+
+
+async def rebuild(user_ids: list[UUID] | None = None) -> int:
+    if user_ids is None:
+        user_ids = await get_user_ids()
+    entries = 0
+    for user_id in user_ids:
+        entries += await rebuild_user(user_id)
+    return entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--user", type=UUID, action="append", dest="user_ids")
+    args = parser.parse_args()
+    entries = asyncio.run(rebuild(args.user_ids))
+    print(f"wallet_ledger rebuilt: {entries} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Checks the wallet balances against peer_transactions and reward_transactions:
+
+    PYTHONPATH=src python -m wallets.reconcile [--workers 4] [--correct]
+
+Every wallet has a checkpoint in `wallet_reconciliations`, the balance its
+transactions give up to a point in time, so a run only sums the transactions
+created since the previous one (the first run checks the whole history).
+Wallets are checked in batches of `--batch-size` user ids, `--workers` batches
+at a time, each in its own short transaction. Wallets whose balance differs are
+reported and, with --correct, set to the expected balance; wallet_ledger isn't
+changed, run `wallets.rebuild_ledger --user ...` for them if their history
+should follow.
+"""
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+from uuid import UUID
+
+from sqlalchemy import select
+
+from core.metrics import metrics
+from core.transactions import READ_ONLY, STANDARD_WRITE, run_in_transaction, transaction
+from database_connection import async_session
+from wallets.models import Wallet
+from wallets.repository import WalletDrift, WalletReconciliationRepository
+
+# transactions created more recently may still be committing, see
+# WalletReconciliationRepository.check
+DEFAULT_SETTLE_SECONDS = 300
+
+
+async def get_batches(batch_size: int) -> AsyncIterator[list[UUID]]:
+    last_user_id = None
+    while True:
+        query = select(Wallet.user_id).order_by(Wallet.user_id).limit(batch_size)
+        if last_user_id is not None:
+            query = query.where(Wallet.user_id > last_user_id)
+        async with async_session() as db_session:
+            async with transaction(db_session, READ_ONLY):
+                user_ids = list((await db_session.scalars(query)).all())
+        if user_ids:
+            yield user_ids
+        if len(user_ids) < batch_size:
+            return
+        last_user_id = user_ids[-1]
+
+
+async def reconcile_batch(
+    user_ids: list[UUID], settle_seconds: int, correct: bool
+) -> list[WalletDrift]:
+    async with async_session() as db_session:
+
+        async def check() -> list[WalletDrift]:
+            repository = WalletReconciliationRepository(db_session)
+            drifts = await repository.check(user_ids, settle_seconds)
+            if correct and drifts:
+                await repository.correct(drifts)
+            return drifts
+
+        drifts = await run_in_transaction(db_session, check, STANDARD_WRITE)
+
+    metrics.increment("wallets.reconcile.checked", len(user_ids))
+    metrics.increment("wallets.reconcile.drifted", len(drifts))
+    if correct:
+        metrics.increment("wallets.reconcile.corrected", len(drifts))
+    return drifts
+
+
+async def reconcile(
+    workers: int,
+    batch_size: int,
+    correct: bool,
+    settle_seconds: int = DEFAULT_SETTLE_SECONDS,
+) -> list[WalletDrift]:
+    queue: asyncio.Queue[list[UUID] | None] = asyncio.Queue(maxsize=workers)
+    drifts = []
+
+    async def work() -> None:
+        while (user_ids := await queue.get()) is not None:
+            drifts.extend(await reconcile_batch(user_ids, settle_seconds, correct))
+
+    # a failing batch cancels the others and the paging
+    async with asyncio.TaskGroup() as group:
+        for _ in range(workers):
+            group.create_task(work())
+        async for user_ids in get_batches(batch_size):
+            await queue.put(user_ids)
+        for _ in range(workers):
+            await queue.put(None)
+    return drifts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--settle-seconds",
+        type=int,
+        default=DEFAULT_SETTLE_SECONDS,
+        help="checkpoints stay this far behind the current time",
+    )
+    parser.add_argument(
+        "--correct", action="store_true", help="set drifted balances to the expected"
+    )
+    args = parser.parse_args()
+
+    drifts = asyncio.run(
+        reconcile(args.workers, args.batch_size, args.correct, args.settle_seconds)
+    )
+    for drift in drifts:
+        print(
+            f"{drift.user_id}: balance {drift.balance}, expected {drift.expected}, "
+            f"drift {drift.drift:+}"
+        )
+    action = "corrected" if args.correct else "found"
+    print(f"Reconciliation: {len(drifts)} drifted wallets {action}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,47 @@
+from collections.abc import Mapping
 from dataclasses import dataclass
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import String, case, cast, exists, func, literal, select, update
+from sqlalchemy import (
+    Integer,
+    Select,
+    String,
+    case,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
 from chores.models import Chore
+from chores.schemas import ChoreResponseSchema
 from chores_completions.models import ChoreCompletion
-from core.base_dals import BaseDals, BaseUserPkDals, DeleteDALMixin
+from config import PURCHASE_RATE, TRANSFER_RATE
+from core.base_dals import BaseDal, BaseDals, BaseUserPkDals, DeleteDALMixin
 from core.enums import PeerTransactionENUM, RewardTransactionENUM
 from core.exceptions.wallets import TransactionNotFoundError, WalletNotFoundError
+from core.pagination import Cursor
 from products.models import Product
+from products.schemas import ProductFullSchema
 from users.models import User
-from wallets.models import PeerTransaction, RewardTransaction, Wallet
+from users.schemas import UserResponseSchema
+from wallets.models import (
+    PeerTransaction,
+    RewardTransaction,
+    Wallet,
+    WalletLedgerEntry,
+    WalletReconciliation,
+)
 from wallets.schemas import (
     PurchaseTransactionSchema,
     RewardTransactionSchema,
@@ -38,33 +67,175 @@ class WalletRepository(BaseDals[Wallet], BaseUserPkDals[Wallet], DeleteDALMixin)
 
         return result.scalar()
 
+    async def transfer(
+        self, from_user_id: UUID, to_user_id: UUID, debit: int, credit: int
+    ) -> tuple[int | None, int | None, int]:
+        """
+        Moves coins between two wallets, see `transfer_many`.
+
+        Returns the balances after the transfer (None if it didn't happen) and
+        the number of wallets found.
+        """
+        from_balance, to_balances, wallets = await self.transfer_many(
+            from_user_id, debit, {to_user_id: credit}
+        )
+        return from_balance, to_balances.get(to_user_id), wallets
+
+    async def transfer_many(
+        self, from_user_id: UUID, debit: int, credits: dict[UUID, int]
+    ) -> tuple[int | None, dict[UUID, int], int]:
+        """
+        Debits `debit` from the sender and credits every recipient in one
+        statement. All the rows are locked in user_id order first, so
+        concurrent transfers between the same users can't deadlock. The sender
+        is debited only if the balance covers `debit`, the recipients are
+        credited only if the debit happened.
+
+        Returns the sender's balance after the transfer (None if it didn't
+        happen), the recipients' balances and the number of wallets found.
+        """
+        query = text(
+            """
+            WITH locked AS MATERIALIZED (
+                SELECT user_id FROM wallets
+                WHERE user_id = :from_user_id
+                    OR user_id = ANY(CAST(:to_user_ids AS uuid[]))
+                ORDER BY user_id
+                FOR UPDATE
+            ),
+            debit AS (
+                UPDATE wallets SET balance = balance - :debit
+                WHERE user_id = :from_user_id
+                    AND balance >= :debit
+                    AND (SELECT count(*) FROM locked) = :wallets
+                RETURNING balance
+            ),
+            credit AS (
+                UPDATE wallets SET balance = wallets.balance + credits.amount
+                FROM unnest(
+                    CAST(:to_user_ids AS uuid[]), CAST(:credits AS integer[])
+                ) AS credits(user_id, amount)
+                WHERE wallets.user_id = credits.user_id
+                    AND EXISTS (SELECT FROM debit)
+                RETURNING wallets.user_id, wallets.balance
+            )
+            SELECT
+                (SELECT balance FROM debit),
+                (SELECT array_agg(user_id ORDER BY user_id) FROM credit),
+                (SELECT array_agg(balance ORDER BY user_id) FROM credit),
+                (SELECT count(*) FROM locked)
+        """
+        )
+        result = await self.db_session.execute(
+            query,
+            {
+                "from_user_id": from_user_id,
+                "to_user_ids": list(credits),
+                "credits": list(credits.values()),
+                "debit": debit,
+                "wallets": len(credits.keys() | {from_user_id}),
+            },
+        )
+        from_balance, to_user_ids, to_balances, wallets = result.one()
+        return from_balance, dict(zip(to_user_ids or [], to_balances or [])), wallets
+
+
+def get_transaction_schema(
+    item: Mapping,
+) -> PurchaseTransactionSchema | TransferTransactionSchema | RewardTransactionSchema:
+    transaction_type = item["transaction_type"]
+    if transaction_type == PeerTransactionENUM.purchase.value:
+        return PurchaseTransactionSchema.model_validate(item)
+    elif transaction_type == PeerTransactionENUM.transfer.value:
+        return TransferTransactionSchema.model_validate(item)
+    elif transaction_type == RewardTransactionENUM.reward_for_chore.value:
+        return RewardTransactionSchema.model_validate(item)
+    raise ValueError(f"Unknown transaction type: {transaction_type}")
+
 
 @dataclass
 class TransactionDataService:
-    """Return pydantic models"""
+    """
+    Return pydantic models. Builds the history from the transaction tables,
+    requests read `wallet_ledger` (see `WalletLedgerRepository`) and this is
+    what the ledger is rebuilt from.
+    """
 
     db_session: AsyncSession
 
     async def get_union_user_transactions(
-        self, user_id: UUID, offset: int, limit: int
+        self, user_id: UUID, offset: int, limit: int, cursor: Cursor | None = None
     ) -> UnionTransactionsSchema:
+        """
+        One page of the user's transactions, newest first. Each branch of the
+        union reads at most offset + limit rows in the order of its
+        (user, created_at, id) index before they are merged, so the cost of a
+        page doesn't grow with the history. Pass the cursor of the last
+        transaction of the previous page instead of an offset for deep pages.
+        """
+        query = self.get_page_query(user_id, offset, limit, cursor)
+        query_result = await self.db_session.execute(query)
+        raw_data = query_result.mappings().all()
+
+        return UnionTransactionsSchema(
+            transactions=[get_transaction_schema(item) for item in raw_data]
+        )
+
+    def get_page_query(
+        self, user_id: UUID, offset: int, limit: int, cursor: Cursor | None = None
+    ) -> Select:
+        branch_limit = offset + limit
+        union_query = union_all(
+            *(
+                self._limit_branch(query, model, cursor, branch_limit)
+                for query, model in self.get_history_branches(user_id)
+            )
+        ).subquery()
+        return (
+            select(union_query)
+            .order_by(union_query.c.created_at.desc(), union_query.c.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+
+    def get_history_branches(
+        self, user_id: UUID
+    ) -> list[tuple[Select, type[PeerTransaction | RewardTransaction]]]:
+        """Incoming transfers, outgoing transfers and rewards of the user"""
+        return [
+            self._peer_transactions_query(user_id, incoming=True),
+            self._peer_transactions_query(user_id, incoming=False),
+            self._reward_transactions_query(user_id),
+        ]
+
+    def _peer_transactions_query(
+        self, user_id: UUID, incoming: bool
+    ) -> tuple[Select, type[PeerTransaction]]:
         u = aliased(User)
         p = aliased(Product)
-        cc = aliased(ChoreCompletion)
-        c = aliased(Chore)
+        if incoming:
+            user_column, other_user_column = (
+                PeerTransaction.to_user_id,
+                PeerTransaction.from_user_id,
+            )
+        else:
+            user_column, other_user_column = (
+                PeerTransaction.from_user_id,
+                PeerTransaction.to_user_id,
+            )
 
-        peer_transactions_query = (
+        query = (
             select(
                 PeerTransaction.id,
                 PeerTransaction.detail,
                 PeerTransaction.coins,
-                cast(
-                    PeerTransaction.transaction_type, String
-                ),  # converting enum to string to correctly combine two queries
-                case(
-                    (PeerTransaction.to_user_id == user_id, "incoming"),
-                    (PeerTransaction.from_user_id == user_id, "outgoing"),
-                ).label("transaction_direction"),
+                # converting enum to string to correctly combine the queries
+                cast(PeerTransaction.transaction_type, String).label(
+                    "transaction_type"
+                ),
+                literal("incoming" if incoming else "outgoing").label(
+                    "transaction_direction"
+                ),
                 PeerTransaction.created_at,
                 func.json_build_object(
                     "id",
@@ -96,39 +267,39 @@ class TransactionDataService:
                             p.is_active,
                             "created_at",
                             p.created_at,
+                            "avatar_version",
+                            p.avatar_version,
                         ),
                     ),
                     else_=None,
                 ).label("product"),
                 literal(None).label("chore_completion"),
             )
-            .join(
-                u,
-                (u.id == PeerTransaction.from_user_id)
-                & (PeerTransaction.from_user_id != user_id)
-                | (u.id == PeerTransaction.to_user_id)
-                & (PeerTransaction.to_user_id != user_id),
-                isouter=True,
-            )
+            .join(u, u.id == other_user_column, isouter=True)
             .join(p, p.id == PeerTransaction.product_id, isouter=True)
-            .where(
-                (PeerTransaction.to_user_id == user_id)
-                | (PeerTransaction.from_user_id == user_id)
-            )
+            .where(user_column == user_id)
         )
+        return query, PeerTransaction
 
-        reward_transactions_query = (
+    def _reward_transactions_query(
+        self, user_id: UUID
+    ) -> tuple[Select, type[RewardTransaction]]:
+        cc = aliased(ChoreCompletion)
+        c = aliased(Chore)
+
+        query = (
             select(
                 RewardTransaction.id,
                 RewardTransaction.detail,
                 RewardTransaction.coins,
-                cast(
-                    RewardTransaction.transaction_type, String
-                ),  # converting enum to string to correctly combine two queries
-                func.text("incoming").label("transaction_direction"),
+                # converting enum to string to correctly combine the queries
+                cast(RewardTransaction.transaction_type, String).label(
+                    "transaction_type"
+                ),
+                literal("incoming").label("transaction_direction"),
                 RewardTransaction.created_at,
-                literal(None).label("product"),
                 literal(None).label("other_user"),
+                literal(None).label("product"),
                 func.json_build_object(
                     "id",
                     RewardTransaction.chore_completion_id,
@@ -153,39 +324,415 @@ class TransactionDataService:
             .join(c, c.id == cc.chore_id, isouter=True)
             .where(RewardTransaction.to_user_id == user_id)
         )
+        return query, RewardTransaction
 
-        union_query = peer_transactions_query.union_all(
-            reward_transactions_query
-        ).subquery()
-        final_query = (
-            select(union_query)
-            .order_by(union_query.c.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-        )
-        query_result = await self.db_session.execute(final_query)
-        raw_data = query_result.mappings().all()
-
-        result = []
-        for item in raw_data:
-            transaction_type = item["transaction_type"]
-            if transaction_type == PeerTransactionENUM.purchase.value:
-                result.append(PurchaseTransactionSchema.model_validate(item))
-            elif transaction_type == PeerTransactionENUM.transfer.value:
-                result.append(TransferTransactionSchema.model_validate(item))
-            elif transaction_type == RewardTransactionENUM.reward_for_chore.value:
-                result.append(RewardTransactionSchema.model_validate(item))
-            else:
-                raise ValueError(f"Unknown transaction type: {transaction_type}")
-
-        return UnionTransactionsSchema(transactions=result)
+    def _limit_branch(
+        self,
+        query: Select,
+        model: type[PeerTransaction | RewardTransaction],
+        cursor: Cursor | None,
+        limit: int,
+    ) -> Select:
+        if cursor is not None:
+            query = query.where(
+                tuple_(model.created_at, model.id)
+                < tuple_(cursor.created_at, cursor.id)
+            )
+        return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
 
 
 class PeerTransactionDAL(BaseDals[PeerTransaction]):
     model = PeerTransaction
     not_found_exception = TransactionNotFoundError
 
+    async def create_many(
+        self, transactions: list[PeerTransaction]
+    ) -> list[PeerTransaction]:
+        """Inserts the transactions with one multi-row statement and fills in
+        their ids and creation times"""
+        for transaction in transactions:
+            transaction.id = transaction.id or uuid4()
+        query = (
+            insert(PeerTransaction)
+            .values(
+                [
+                    {
+                        "id": transaction.id,
+                        "detail": transaction.detail,
+                        "coins": transaction.coins,
+                        "to_user_id": transaction.to_user_id,
+                        "from_user_id": transaction.from_user_id,
+                        "product_id": transaction.product_id,
+                        "transaction_type": transaction.transaction_type,
+                    }
+                    for transaction in transactions
+                ]
+            )
+            .returning(PeerTransaction.id, PeerTransaction.created_at)
+        )
+        created_at = dict((await self.db_session.execute(query)).all())
+        for transaction in transactions:
+            transaction.created_at = created_at[transaction.id]
+        return transactions
+
 
 class RewardTransactionDAL(BaseDals[RewardTransaction]):
     model = RewardTransaction
     not_found_exception = TransactionNotFoundError
+
+
+class WalletLedgerRepository(BaseDal[WalletLedgerEntry]):
+    model = WalletLedgerEntry
+
+    async def add_peer_transaction(
+        self,
+        transaction: PeerTransaction,
+        from_user: User,
+        to_user: User,
+        debited: int,
+        credited: int,
+        from_balance: int,
+        to_balance: int,
+        product: Product | None = None,
+    ) -> None:
+        """Writes the outgoing entry of the sender and the incoming one of the
+        recipient, `debited`/`credited` are the changes of their balances"""
+        await self.add_entries(
+            self.get_peer_entries(
+                transaction,
+                from_user,
+                to_user,
+                debited,
+                credited,
+                from_balance,
+                to_balance,
+                product,
+            )
+        )
+
+    async def add_entries(self, entries: list[dict]) -> None:
+        await self.db_session.execute(insert(WalletLedgerEntry).values(entries))
+
+    def get_peer_entries(
+        self,
+        transaction: PeerTransaction,
+        from_user: User,
+        to_user: User,
+        debited: int,
+        credited: int,
+        from_balance: int,
+        to_balance: int,
+        product: Product | None = None,
+    ) -> list[dict]:
+        entry = {
+            "transaction_id": transaction.id,
+            "transaction_type": transaction.transaction_type.value,
+            "detail": transaction.detail,
+            "coins": transaction.coins,
+            "product": self._product_snapshot(product) if product else None,
+            "chore_completion": None,
+            "created_at": transaction.created_at,
+        }
+        return [
+            {
+                **entry,
+                "user_id": from_user.id,
+                "transaction_direction": "outgoing",
+                "amount": -debited,
+                "balance": from_balance,
+                "other_user": self._user_snapshot(to_user),
+            },
+            {
+                **entry,
+                "user_id": to_user.id,
+                "transaction_direction": "incoming",
+                "amount": credited,
+                "balance": to_balance,
+                "other_user": self._user_snapshot(from_user),
+            },
+        ]
+
+    async def add_reward_transaction(
+        self,
+        transaction: RewardTransaction,
+        chore_completion: ChoreCompletion,
+        chore: Chore,
+        balance: int,
+    ) -> None:
+        chore_completion_snapshot = (
+            RewardTransactionSchema.ChoreCompletionTransactionSchema(
+                id=chore_completion.id,
+                completed_at=chore_completion.created_at,
+                chore=ChoreResponseSchema.model_validate(chore, from_attributes=True),
+            ).model_dump(mode="json")
+        )
+        await self.db_session.execute(
+            insert(WalletLedgerEntry).values(
+                user_id=transaction.to_user_id,
+                transaction_id=transaction.id,
+                transaction_type=transaction.transaction_type.value,
+                transaction_direction="incoming",
+                detail=transaction.detail,
+                coins=transaction.coins,
+                amount=transaction.coins,
+                balance=balance,
+                other_user=None,
+                product=None,
+                chore_completion=chore_completion_snapshot,
+                created_at=transaction.created_at,
+            )
+        )
+
+    async def get_user_history(
+        self, user_id: UUID, offset: int, limit: int, cursor: Cursor | None = None
+    ) -> UnionTransactionsSchema:
+        """One page of the user's transactions, newest first, from one range
+        of the (user_id, created_at, transaction_id) index"""
+        query = (
+            select(
+                WalletLedgerEntry.transaction_id.label("id"),
+                WalletLedgerEntry.transaction_type,
+                WalletLedgerEntry.transaction_direction,
+                WalletLedgerEntry.detail,
+                WalletLedgerEntry.coins,
+                WalletLedgerEntry.balance,
+                WalletLedgerEntry.other_user,
+                WalletLedgerEntry.product,
+                WalletLedgerEntry.chore_completion,
+                WalletLedgerEntry.created_at,
+            )
+            .where(WalletLedgerEntry.user_id == user_id)
+            .order_by(
+                WalletLedgerEntry.created_at.desc(),
+                WalletLedgerEntry.transaction_id.desc(),
+            )
+            .limit(limit)
+            .offset(offset)
+        )
+        if cursor is not None:
+            query = query.where(
+                tuple_(WalletLedgerEntry.created_at, WalletLedgerEntry.transaction_id)
+                < tuple_(cursor.created_at, cursor.id)
+            )
+        raw_data = (await self.db_session.execute(query)).mappings().all()
+        return UnionTransactionsSchema(
+            transactions=[get_transaction_schema(item) for item in raw_data]
+        )
+
+    async def rebuild(self, user_id: UUID) -> int:
+        """
+        Replaces the user's entries with the history of the transaction tables.
+        Balances are summed from zero and incoming transfers are credited at
+        the current rates. The wallet row is locked, so no transfer of the user
+        runs meanwhile.
+        """
+        await self.db_session.execute(
+            select(Wallet.id).where(Wallet.user_id == user_id).with_for_update()
+        )
+        await self.db_session.execute(
+            delete(WalletLedgerEntry).where(WalletLedgerEntry.user_id == user_id)
+        )
+
+        history = union_all(
+            *(
+                query
+                for query, _ in TransactionDataService(
+                    self.db_session
+                ).get_history_branches(user_id)
+            )
+        ).subquery()
+        amount = case(
+            (history.c.transaction_direction == "outgoing", -history.c.coins),
+            (
+                history.c.transaction_type == PeerTransactionENUM.transfer.value,
+                func.floor(history.c.coins * TRANSFER_RATE),
+            ),
+            (
+                history.c.transaction_type == PeerTransactionENUM.purchase.value,
+                func.floor(history.c.coins * PURCHASE_RATE),
+            ),
+            else_=history.c.coins,
+        )
+        balance = func.sum(amount).over(order_by=(history.c.created_at, history.c.id))
+        query = insert(WalletLedgerEntry).from_select(
+            [
+                "user_id",
+                "transaction_id",
+                "transaction_type",
+                "transaction_direction",
+                "detail",
+                "coins",
+                "amount",
+                "balance",
+                "other_user",
+                "product",
+                "chore_completion",
+                "created_at",
+            ],
+            select(
+                literal(user_id),
+                history.c.id,
+                history.c.transaction_type,
+                history.c.transaction_direction,
+                history.c.detail,
+                history.c.coins,
+                cast(amount, Integer),
+                cast(balance, Integer),
+                cast(history.c.other_user, JSONB),
+                cast(history.c.product, JSONB),
+                cast(history.c.chore_completion, JSONB),
+                history.c.created_at,
+            ),
+        )
+        result = await self.db_session.execute(query)
+        return result.rowcount
+
+    def _user_snapshot(self, user: User) -> dict:
+        return UserResponseSchema.model_validate(user).model_dump(mode="json")
+
+    def _product_snapshot(self, product: Product) -> dict:
+        return ProductFullSchema.model_validate(
+            product, from_attributes=True
+        ).model_dump(mode="json")
+
+
+@dataclass
+class WalletDrift:
+    user_id: UUID
+    balance: int
+    expected: int
+
+    @property
+    def drift(self) -> int:
+        return self.balance - self.expected
+
+
+class WalletReconciliationRepository(BaseDal[WalletReconciliation]):
+    model = WalletReconciliation
+
+    async def check(
+        self, user_ids: list[UUID], settle_seconds: int
+    ) -> list[WalletDrift]:
+        """
+        Compares the balances of the wallets with their checkpoint plus the
+        transactions created after it, and moves the checkpoints forward, in
+        one statement (so one snapshot of the balances and the transactions).
+
+        The checkpoints only move up to `settle_seconds` ago: a transaction
+        still running may commit rows created before a newer one, these are
+        summed again by the next run instead of being skipped. Amounts use the
+        current rates, as `WalletLedgerRepository.rebuild`.
+
+        Returns the wallets whose balance differs.
+        """
+        query = text(
+            """
+            WITH checked AS (
+                SELECT
+                    w.user_id,
+                    w.balance,
+                    coalesce(r.verified_balance, 0)
+                        + coalesce(sum(t.amount), 0) AS expected,
+                    coalesce(r.verified_balance, 0)
+                        + coalesce(sum(t.amount) FILTER (
+                            WHERE t.created_at <= bounds.until
+                        ), 0) AS verified_balance,
+                    greatest(r.verified_until, bounds.until) AS verified_until
+                FROM wallets AS w
+                CROSS JOIN (
+                    SELECT TIMEZONE('utc', now()) - make_interval(
+                        secs => CAST(:settle_seconds AS integer)
+                    ) AS until
+                ) AS bounds
+                LEFT JOIN wallet_reconciliations AS r ON r.user_id = w.user_id
+                LEFT JOIN LATERAL (
+                    SELECT
+                        floor(p.coins * CASE p.transaction_type
+                            WHEN :purchase THEN CAST(:purchase_rate AS numeric)
+                            ELSE CAST(:transfer_rate AS numeric)
+                        END) AS amount,
+                        p.created_at
+                    FROM peer_transactions AS p
+                    WHERE p.to_user_id = w.user_id
+                        AND p.created_at > coalesce(r.verified_until, '-infinity')
+                    UNION ALL
+                    SELECT -p.coins, p.created_at
+                    FROM peer_transactions AS p
+                    WHERE p.from_user_id = w.user_id
+                        AND p.created_at > coalesce(r.verified_until, '-infinity')
+                    UNION ALL
+                    SELECT rt.coins, rt.created_at
+                    FROM reward_transactions AS rt
+                    WHERE rt.to_user_id = w.user_id
+                        AND rt.created_at > coalesce(r.verified_until, '-infinity')
+                ) AS t ON true
+                WHERE w.user_id = ANY(CAST(:user_ids AS uuid[]))
+                GROUP BY
+                    w.user_id,
+                    w.balance,
+                    r.verified_balance,
+                    r.verified_until,
+                    bounds.until
+            ),
+            saved AS (
+                INSERT INTO wallet_reconciliations (
+                    user_id, verified_until, verified_balance, drift, checked_at
+                )
+                SELECT
+                    user_id,
+                    verified_until,
+                    verified_balance,
+                    balance - expected,
+                    TIMEZONE('utc', now())
+                FROM checked
+                ON CONFLICT (user_id) DO UPDATE SET
+                    verified_until = excluded.verified_until,
+                    verified_balance = excluded.verified_balance,
+                    drift = excluded.drift,
+                    checked_at = excluded.checked_at
+            )
+            SELECT user_id, balance, expected FROM checked
+            WHERE balance <> expected
+        """
+        )
+        result = await self.db_session.execute(
+            query,
+            {
+                "user_ids": user_ids,
+                "settle_seconds": settle_seconds,
+                "purchase": PeerTransactionENUM.purchase.value,
+                "purchase_rate": PURCHASE_RATE,
+                "transfer_rate": TRANSFER_RATE,
+            },
+        )
+        return [
+            WalletDrift(user_id=user_id, balance=balance, expected=int(expected))
+            for user_id, balance, expected in result.all()
+        ]
+
+    async def correct(self, drifts: list[WalletDrift]) -> None:
+        """
+        Takes the drift off the balances. Relative to the current balance, so
+        transfers committed since the check are kept.
+        """
+        query = text(
+            """
+            WITH corrected AS (
+                UPDATE wallets SET balance = wallets.balance - d.drift
+                FROM unnest(
+                    CAST(:user_ids AS uuid[]), CAST(:drifts AS integer[])
+                ) AS d(user_id, drift)
+                WHERE wallets.user_id = d.user_id
+                RETURNING wallets.user_id
+            )
+            UPDATE wallet_reconciliations SET drift = 0
+            WHERE user_id IN (SELECT user_id FROM corrected)
+        """
+        )
+        await self.db_session.execute(
+            query,
+            {
+                "user_ids": [drift.user_id for drift in drifts],
+                "drifts": [drift.drift for drift in drifts],
+            },
+        )
@@ -1,23 +1,33 @@
 from logging import getLogger
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions.base_exceptions import ObjectNotFoundError
 from core.exceptions.wallets import NotEnoughCoins
+from core.pagination import NEXT_CURSOR_HEADER, Cursor
 from core.permissions import FamilyMemberPermission
-from core.query_depends import get_pagination_params
-from database_connection import get_db
+from core.query_depends import get_cursor, get_pagination_params
+from core.transactions import READ_ONLY, transaction
+from core.unit_of_work import (
+    UnitOfWork,
+    get_unit_of_work,
+    get_uow_session,
+    transaction_profile,
+)
+from database_connection import get_read_db
 from users.models import User
 from users.repository import UserRepository
-from wallets.repository import TransactionDataService, WalletRepository
+from wallets.repository import WalletLedgerRepository, WalletRepository
 from wallets.schemas import (
+    BatchTransferResultSchema,
+    BatchTransferSchema,
     MoneyTransferSchema,
     UnionTransactionsSchema,
     WalletBalanceSchema,
 )
-from wallets.services import CoinsTransferService
+from wallets.services import BatchTransferService, CoinsTransferService
 
 logger = getLogger(__name__)
 
@@ -27,13 +37,12 @@ router = APIRouter()
 @router.get(path="", summary="Get user wallet balance", tags=["Wallet"])
 async def get_user_wallet(
     current_user: User = Depends(FamilyMemberPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    async_session: AsyncSession = Depends(get_uow_session),
 ) -> WalletBalanceSchema:
-    async with async_session.begin():
-        wallet_data = await WalletRepository(async_session).get_by_user_id(
-            user_id=current_user.id
-        )
-        return WalletBalanceSchema(balance=wallet_data.balance)
+    wallet_data = await WalletRepository(async_session).get_by_user_id(
+        user_id=current_user.id
+    )
+    return WalletBalanceSchema(balance=wallet_data.balance)
 
 
 @router.post(
@@ -41,28 +50,31 @@ async def get_user_wallet(
     summary="Transfer coins to another user",
     tags=["Wallet"],
 )
+@transaction_profile(CoinsTransferService.transaction_profile)
 async def money_transfer_wallet(
     body: MoneyTransferSchema,
     current_user: User = Depends(FamilyMemberPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
 ) -> JSONResponse:
-    async with async_session.begin():
-        try:
-            user_dal = UserRepository(async_session)
-            to_user = await user_dal.get_by_id(body.to_user_id)
-
-            transfer_service = CoinsTransferService(
-                from_user=current_user,
-                to_user=to_user,
-                count=body.count,
-                message="Transferred you some coins",
-                db_session=async_session,
-            )
-            await transfer_service.run_process()
-        except ObjectNotFoundError as e:
-            raise HTTPException(status_code=404, detail=str(e))
-        except NotEnoughCoins:
-            raise HTTPException(status_code=400, detail="You don't have enough coins")
+    async def transfer() -> None:
+        # current_user is reloaded by the permission check on retries
+        to_user = await UserRepository(uow.db_session).get_by_id(body.to_user_id)
+
+        transfer_service = CoinsTransferService(
+            from_user=current_user,
+            to_user=to_user,
+            count=body.count,
+            message="Transferred you some coins",
+            db_session=uow.db_session,
+        )
+        await transfer_service.run_process()
+
+    try:
+        await uow.run(transfer)
+    except ObjectNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except NotEnoughCoins:
+        raise HTTPException(status_code=400, detail="You don't have enough coins")
 
     return JSONResponse(
         status_code=200,
@@ -70,23 +82,73 @@ async def money_transfer_wallet(
     )
 
 
+@router.post(
+    path="/transfer/batch",
+    summary="Transfer coins to several family members",
+    description="""
+Transfers coins to several members of the family in one transaction, e.g. to
+pay the weekly allowances.
+
+Items to users outside the family or to yourself are rejected, the result of
+every item is returned in the order of the request. The other items are
+applied together: if the balance doesn't cover their total nothing is
+transferred.
+""",
+    tags=["Wallet"],
+)
+@transaction_profile(BatchTransferService.transaction_profile)
+async def batch_money_transfer_wallet(
+    body: BatchTransferSchema,
+    current_user: User = Depends(FamilyMemberPermission()),
+    uow: UnitOfWork = Depends(get_unit_of_work),
+) -> BatchTransferResultSchema:
+    async def transfer() -> BatchTransferResultSchema:
+        items = await BatchTransferService(
+            from_user=current_user,
+            items=body.items,
+            message="Transferred you some coins",
+            db_session=uow.db_session,
+        ).run_process()
+        return BatchTransferResultSchema(items=items)
+
+    try:
+        return await uow.run(transfer)
+    except NotEnoughCoins:
+        raise HTTPException(status_code=400, detail="You don't have enough coins")
+
+
 @router.get(
     path="/transactions",
     summary="Get user's wallet transactions",
+    description=f"""
+Returns the user's transactions, newest first.
+
+Pages can be requested with **offset** or, for deep pages, with **cursor**: the
+value of the `{NEXT_CURSOR_HEADER}` header of the previous page (the header is
+missing on the last page).
+""",
     tags=["Wallet"],
 )
 async def get_user_wallet_transaction(
+    response: Response,
     pagination: tuple[int, int] = Depends(get_pagination_params),
+    cursor: Cursor | None = Depends(get_cursor),
     current_user: User = Depends(FamilyMemberPermission()),
-    async_session: AsyncSession = Depends(get_db),
+    read_session: AsyncSession = Depends(get_read_db),
 ) -> UnionTransactionsSchema:
-    async with async_session.begin():
-        transactions_data = TransactionDataService(async_session)
+    async with transaction(read_session, READ_ONLY):
+        ledger = WalletLedgerRepository(read_session)
         offset, limit = pagination
 
-        user_transactions = await transactions_data.get_union_user_transactions(
+        user_transactions = await ledger.get_user_history(
             user_id=current_user.id,
             offset=offset,
             limit=limit,
+            cursor=cursor,
         )
-        return user_transactions
+    transactions = user_transactions.transactions
+    if transactions and len(transactions) == limit:
+        last = transactions[-1]
+        next_cursor = Cursor(created_at=last.created_at, id=last.id)
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor.encode()
+    return user_transactions
@@ -3,7 +3,7 @@ from decimal import Decimal
 from typing import Literal
 from uuid import UUID
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 from chores.schemas import ChoreResponseSchema
 from core.enums import PeerTransactionENUM, RewardTransactionENUM
@@ -26,6 +26,22 @@ class MoneyTransferSchema(BaseModel):
         return value
 
 
+class BatchTransferSchema(BaseModel):
+    items: list[MoneyTransferSchema] = Field(min_length=1, max_length=100)
+
+
+class BatchTransferItemResultSchema(BaseModel):
+    to_user_id: UUID
+    count: Decimal
+    status: Literal["transferred", "rejected"]
+    detail: str | None = None
+    transaction_id: UUID | None = None
+
+
+class BatchTransferResultSchema(BaseModel):
+    items: list[BatchTransferItemResultSchema]
+
+
 class CreatePeerTransactionSchema(BaseModel):
     detail: str
     coins: int
@@ -40,6 +56,7 @@ class BaseWalletTransaction(BaseModel):
     coins: Decimal
     created_at: datetime
     transaction_direction: Literal["incoming", "outgoing"]
+    balance: int | None = None
 
 
 class PurchaseTransactionSchema(BaseWalletTransaction):
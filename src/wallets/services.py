@@ -8,8 +8,10 @@ from chores.repository import ChoreRepository
 from chores_completions.models import ChoreCompletion
 from config import TRANSFER_RATE
 from core.enums import PeerTransactionENUM, RewardTransactionENUM
-from core.exceptions.wallets import NotEnoughCoins
+from core.exceptions.families import UserNotFoundInFamily
+from core.exceptions.wallets import NotEnoughCoins, SelfTransferError
 from core.services import BaseService
+from core.transactions import MONEY_MOVEMENT
 from core.validators import (
     validate_chore_completion_is_approved,
 )
@@ -18,10 +20,22 @@ from users.models import User
 from users.repository import UserRepository
 from wallets.models import PeerTransaction, RewardTransaction, Wallet
 from wallets.repository import (
-    WalletRepository,
     PeerTransactionDAL,
     RewardTransactionDAL,
+    WalletLedgerRepository,
+    WalletRepository,
 )
+from wallets.schemas import BatchTransferItemResultSchema, MoneyTransferSchema
+
+
+@dataclass
+class CoinExchange:
+    """Changes of both balances and the balances after the exchange"""
+
+    debited: int
+    credited: int
+    from_balance: int
+    to_balance: int
 
 
 async def coin_exchange(
@@ -30,22 +44,28 @@ async def coin_exchange(
     coins: int,
     rate: Decimal,
     db_session: AsyncSession,
-):
-    wallet_dal = WalletRepository(db_session)
-    from_wallet = await wallet_dal.get_by_user_id(from_user_id)
-    if not from_wallet:
-        raise ValueError(f"Wallet for user {from_user_id} not found")
-    if from_wallet.balance < coins:
+) -> CoinExchange:
+    """
+    Debits `coins` (whole coins) from the sender and credits them at `rate` to
+    the recipient, see `WalletRepository.transfer`
+    """
+    if to_user_id == from_user_id:
+        raise SelfTransferError()
+    debited = int(coins)
+    credited = int(coins * rate)
+    from_balance, to_balance, wallets = await WalletRepository(db_session).transfer(
+        from_user_id, to_user_id, debited, credited
+    )
+    if wallets < 2:
+        raise ValueError(f"Wallet for user {from_user_id} or {to_user_id} not found")
+    if from_balance is None:
         raise NotEnoughCoins()
-    from_wallet.balance -= coins
-    await wallet_dal.update(from_wallet)
-
-    to_wallet = await wallet_dal.get_by_user_id(to_user_id)
-    if not to_wallet:
-        raise ValueError(f"Wallet for user {to_user_id} not found")
-    amount_to_add = int(coins * rate)
-    to_wallet.balance += amount_to_add
-    await wallet_dal.update(to_wallet)
+    return CoinExchange(
+        debited=debited,
+        credited=credited,
+        from_balance=from_balance,
+        to_balance=to_balance,
+    )
 
 
 @dataclass
@@ -73,6 +93,8 @@ class CoinsTransferService(BaseService[PeerTransaction | None]):
     Service for transferring coins between two users of the same family
     """
 
+    transaction_profile = MONEY_MOVEMENT
+
     from_user: User
     to_user: User
     count: int
@@ -81,13 +103,22 @@ class CoinsTransferService(BaseService[PeerTransaction | None]):
 
     async def process(self) -> PeerTransaction:
         transaction = await self._create_transaction_log()
-        await coin_exchange(
+        exchange = await coin_exchange(
             to_user_id=self.to_user.id,
             from_user_id=self.from_user.id,
             coins=self.count,
             db_session=self.db_session,
             rate=TRANSFER_RATE,
         )
+        await WalletLedgerRepository(self.db_session).add_peer_transaction(
+            transaction,
+            from_user=self.from_user,
+            to_user=self.to_user,
+            debited=exchange.debited,
+            credited=exchange.credited,
+            from_balance=exchange.from_balance,
+            to_balance=exchange.to_balance,
+        )
         return transaction
 
     async def _create_transaction_log(self):
@@ -103,12 +134,125 @@ class CoinsTransferService(BaseService[PeerTransaction | None]):
         return await transaction_log_dal.create(transaction)
 
 
+@dataclass
+class BatchTransferService(BaseService[list[BatchTransferItemResultSchema]]):
+    """
+    Transfers coins from one user to several members of the family at once.
+
+    Items to users outside the family or to the sender are rejected, the rest
+    is applied together: the sender is debited the total and every recipient
+    credited with one statement, so the whole batch fails with NotEnoughCoins
+    if the balance doesn't cover it.
+    """
+
+    transaction_profile = MONEY_MOVEMENT
+
+    from_user: User
+    items: list[MoneyTransferSchema]
+    message: str
+    db_session: AsyncSession
+
+    async def process(self) -> list[BatchTransferItemResultSchema]:
+        recipients = await UserRepository(self.db_session).get_family_members_by_ids(
+            self.from_user.family_id, [item.to_user_id for item in self.items]
+        )
+        results = [
+            BatchTransferItemResultSchema(
+                to_user_id=item.to_user_id,
+                count=item.count,
+                status="transferred",
+                detail=self._get_rejection(item, recipients),
+            )
+            for item in self.items
+        ]
+        for result in results:
+            if result.detail is not None:
+                result.status = "rejected"
+
+        accepted = [result for result in results if result.status == "transferred"]
+        if accepted:
+            transactions = await self._transfer(accepted, recipients)
+            for result, transaction in zip(accepted, transactions):
+                result.transaction_id = transaction.id
+        return results
+
+    def _get_rejection(
+        self, item: MoneyTransferSchema, recipients: dict[UUID, User]
+    ) -> str | None:
+        if item.to_user_id == self.from_user.id:
+            return str(SelfTransferError())
+        if item.to_user_id not in recipients:
+            return str(UserNotFoundInFamily())
+        return None
+
+    async def _transfer(
+        self,
+        items: list[BatchTransferItemResultSchema],
+        recipients: dict[UUID, User],
+    ) -> list[PeerTransaction]:
+        debits = [int(item.count) for item in items]
+        credits = [int(item.count * TRANSFER_RATE) for item in items]
+        credit_totals: dict[UUID, int] = {}
+        for item, credit in zip(items, credits):
+            credit_totals[item.to_user_id] = (
+                credit_totals.get(item.to_user_id, 0) + credit
+            )
+
+        from_balance, to_balances, wallets = await WalletRepository(
+            self.db_session
+        ).transfer_many(self.from_user.id, sum(debits), credit_totals)
+        if wallets < len(credit_totals) + 1:
+            raise ValueError(f"Wallets of the batch from {self.from_user.id} not found")
+        if from_balance is None:
+            raise NotEnoughCoins()
+
+        transactions = await PeerTransactionDAL(self.db_session).create_many(
+            [
+                PeerTransaction(
+                    detail=self.message,
+                    coins=item.count,
+                    to_user_id=item.to_user_id,
+                    from_user_id=self.from_user.id,
+                    product_id=None,
+                    transaction_type=PeerTransactionENUM.transfer,
+                )
+                for item in items
+            ]
+        )
+
+        # balances after each item, walking back from the final ones. The items
+        # share created_at, the history (and a ledger rebuild) orders them by id
+        ledger = WalletLedgerRepository(self.db_session)
+        entries = []
+        for transaction, debit, credit in sorted(
+            zip(transactions, debits, credits),
+            key=lambda item: item[0].id,
+            reverse=True,
+        ):
+            to_user_id = transaction.to_user_id
+            entries += ledger.get_peer_entries(
+                transaction,
+                from_user=self.from_user,
+                to_user=recipients[to_user_id],
+                debited=debit,
+                credited=credit,
+                from_balance=from_balance,
+                to_balance=to_balances[to_user_id],
+            )
+            from_balance += debit
+            to_balances[to_user_id] -= credit
+        await ledger.add_entries(entries)
+        return transactions
+
+
 @dataclass
 class CoinsRewardService(BaseService[RewardTransaction]):
     """
     Service for accruing coins for completing chore
     """
 
+    transaction_profile = MONEY_MOVEMENT
+
     chore_completion: ChoreCompletion
     message: str
     db_session: AsyncSession
@@ -118,16 +262,19 @@ class CoinsRewardService(BaseService[RewardTransaction]):
         chore = await ChoreRepository(self.db_session).get_by_id(
             self.chore_completion.chore_id
         )
-        await self._add_coins(user_id, chore.valuation)
+        balance = await self._add_coins(user_id, chore.valuation)
         transaction = await self._create_transaction_log(user_id, chore.valuation)
+        await WalletLedgerRepository(self.db_session).add_reward_transaction(
+            transaction, self.chore_completion, chore, balance
+        )
         await self._add_experience(
             user_id, self.chore_completion.family_id, chore.valuation
         )
         return transaction
 
-    async def _add_coins(self, user_id: UUID, amount: int):
+    async def _add_coins(self, user_id: UUID, amount: int) -> int:
         wallet_dal = WalletRepository(self.db_session)
-        await wallet_dal.add_balance(user_id=user_id, amount=amount)
+        return await wallet_dal.add_balance(user_id=user_id, amount=amount)
 
     async def _create_transaction_log(self, user_id: UUID, amount: int):
         transaction = RewardTransaction(
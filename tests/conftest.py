@@ -6,7 +6,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from database_connection import get_db
+from database_connection import get_db, get_read_db
 from families.services import AddUserToFamilyService, FamilyCreatorService
 from users.schemas import UserCreateSchema, UserFamilyPermissionModelSchema
 from users.services import UserCreatorService
@@ -26,6 +26,7 @@ CLEAN_TABLES = [
     "product_buyers",
     "products",
     "reward_transactions",
+    "outbox_events",
 ]
 TEST_DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -52,8 +53,10 @@ def override_get_db(async_session_factory):
             yield session
 
     app.dependency_overrides[get_db] = _get_db_override
+    app.dependency_overrides[get_read_db] = _get_db_override
     yield
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
 
 
 @pytest_asyncio.fixture
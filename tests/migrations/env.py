@@ -27,8 +27,16 @@ from families.models import Family
 from chores.models import Chore
 from chores_completions.models import ChoreCompletion
 from chores_confirmations.models import ChoreConfirmation
-from wallets.models import Wallet, PeerTransaction, RewardTransaction
+from wallets.models import (
+    Wallet,
+    PeerTransaction,
+    RewardTransaction,
+    WalletLedgerEntry,
+    WalletReconciliation,
+)
 from products.models import Product, ProductBuyer
+from outbox.models import OutboxEvent
+from statistics.models import DailyCompletionCount
 
 target_metadata = Base.metadata
 
@@ -3,6 +3,7 @@ from sqlalchemy import select
 
 from chores.models import Chore
 from chores_completions.models import ChoreCompletion
+from chores_completions.repository import ChoreCompletionRepository
 from chores_completions.services import (
     ApproveChoreCompletion,
     CancellChoreCompletion,
@@ -11,7 +12,9 @@ from chores_completions.services import (
 from core.enums import StatusConfirmENUM
 from core.exceptions.chores import ChoreNotFoundError
 from core.exceptions.chores_completion import ChoreCompletionCanNotBeChanged
+from core.pagination import Cursor
 from families.models import Family
+from statistics.repository import StatsPostgresRepository
 from unittest.mock import AsyncMock, patch
 
 from users.models import User
@@ -87,6 +90,32 @@ async def test_create_awaited_chore_completion(member_family, async_session_test
         mock_approve.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_family_chore_completions_cursor_pages(
+    member_family,
+    async_session_test,
+):
+    user, family = member_family
+    for _ in range(5):
+        await get_chore_completion(user, family, async_session_test)
+    repository = ChoreCompletionRepository(async_session_test)
+    all_completions = await repository.get_family_chore_completion(
+        family.id, 0, 10, None, None, None
+    )
+
+    pages, cursor = [], None
+    while True:
+        page = await repository.get_family_chore_completion(
+            family.id, 0, 2, None, None, user.id, cursor
+        )
+        pages.extend(page)
+        if len(page) < 2:
+            break
+        cursor = Cursor.decode(Cursor(page[-1].completed_at, page[-1].id).encode())
+
+    assert [c.id for c in pages] == [c.id for c in all_completions]
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "initial_status, expected_status, should_raise_exception",
@@ -125,6 +154,29 @@ async def test_approve_chore_completion(
             mock_approve.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_approve_chore_completion_counts_daily_completion(
+    member_family,
+    async_session_test,
+):
+    user, family = member_family
+    chore_completion = await get_chore_completion(user, family, async_session_test)
+    stats_repo = StatsPostgresRepository(async_session_test)
+    day = chore_completion.created_at.date()
+    heatmap_before = await stats_repo.get_user_heatmap(user.id)
+
+    with patch(
+        "chores_completions.services.CoinsRewardService.run_process",
+        new_callable=AsyncMock,
+    ):
+        await ApproveChoreCompletion(
+            chore_completion, db_session=async_session_test
+        ).run_process()
+
+    heatmap_after = await stats_repo.get_user_heatmap(user.id)
+    assert heatmap_after[day] == heatmap_before.get(day, 0) + 1
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "initial_status, expected_status, should_raise_exception",
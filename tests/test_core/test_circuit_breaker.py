@@ -0,0 +1,140 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from core.circuit_breaker import CircuitBreaker
+from core.exceptions.redis import RedisUnavailableError
+from database_connection import redis_client
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = Clock()
+    with patch("core.circuit_breaker.time.monotonic", clock):
+        yield clock
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+
+def test_circuit_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=10)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_circuit_breaker_success_resets_failures(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=10)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize(
+    "trial_succeeds, expected_state",
+    [
+        (True, CircuitBreaker.CLOSED),
+        (False, CircuitBreaker.OPEN),
+    ],
+)
+def test_circuit_breaker_half_open_trial(clock, trial_succeeds, expected_state):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10)
+    open_breaker(breaker)
+
+    clock.now += 10
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # a single trial at a time
+    assert not breaker.allow_request()
+
+    if trial_succeeds:
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+    assert breaker.state == expected_state
+    assert breaker.allow_request() == trial_succeeds
+
+
+def test_circuit_breaker_aborted_trial_reopens(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    assert breaker.allow_request()
+
+    breaker.record_aborted()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 10
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker_aborted_call_while_closed_is_ignored(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+
+    breaker.record_aborted()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_circuit_breaker_unreported_trial_expires(clock):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    assert breaker.allow_request()
+
+    clock.now += 9
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error, raised",
+    [
+        (asyncio.CancelledError(), asyncio.CancelledError),
+        (ValueError(), ValueError),
+        (ConnectionError(), RedisUnavailableError),
+    ],
+)
+async def test_redis_client_trial_never_stays_pending(clock, error, raised):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    command = AsyncMock(side_effect=error)
+
+    with (
+        patch.object(redis_client, "breaker", breaker),
+        patch.object(redis_client, "get_client", new_callable=AsyncMock),
+    ):
+        with pytest.raises(raised):
+            await redis_client.run(command)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 10
+    assert breaker.allow_request()
@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from core.exceptions.pagination import InvalidCursorError
+from core.pagination import Cursor
+
+
+def encode_raw(data) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def test_cursor_round_trip():
+    cursor = Cursor(created_at=datetime(2026, 10, 1, 12, 30, 15, 123456), id=uuid4())
+
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+def test_cursor_with_offset_is_normalized_to_naive_utc():
+    cursor_id = uuid4()
+
+    cursor = Cursor.decode(encode_raw(["2026-10-01T14:30:00+02:00", str(cursor_id)]))
+
+    assert cursor == Cursor(created_at=datetime(2026, 10, 1, 12, 30), id=cursor_id)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "not a cursor",
+        encode_raw(["yesterday", str(uuid4())]),
+        encode_raw(["2026-10-01T12:30:00", "not a uuid"]),
+        encode_raw([1, 2]),
+        encode_raw(["2026-10-01T12:30:00"]),
+        encode_raw({"created_at": "2026-10-01T12:30:00"}),
+    ],
+)
+def test_invalid_cursor(value):
+    with pytest.raises(InvalidCursorError):
+        Cursor.decode(value)
@@ -0,0 +1,44 @@
+from statistics.cache import StatsCache
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from core.exceptions.redis import RedisUnavailableError
+from core.metrics import metrics
+
+
+@pytest.mark.asyncio
+async def test_lost_invalidation_is_counted():
+    cache = StatsCache(local_size=10, local_ttl=60, redis_ttl=300)
+    lost_before = metrics.snapshot()["counters"].get(
+        "stats.cache.lost_invalidations", 0
+    )
+
+    with patch(
+        "statistics.cache.redis_client.run",
+        new_callable=AsyncMock,
+        side_effect=RedisUnavailableError(),
+    ):
+        await cache.invalidate(family_ids=[uuid4()], user_ids=[uuid4()])
+
+    lost = metrics.snapshot()["counters"]["stats.cache.lost_invalidations"]
+    assert lost == lost_before + 2
+
+
+@pytest.mark.asyncio
+async def test_invalidating_bumps_versions_after_delivery():
+    cache = StatsCache(local_size=10, local_ttl=60, redis_ttl=300)
+    family_id, user_id = uuid4(), uuid4()
+    calls = []
+    deliver = AsyncMock(side_effect=lambda events: calls.append("deliver"))
+
+    async def invalidate(family_ids, user_ids):
+        calls.append(("invalidate", family_ids, user_ids))
+
+    with patch.object(cache, "invalidate", invalidate):
+        await cache.invalidating(deliver)(
+            [{"family_id": str(family_id), "completed_by_id": str(user_id)}]
+        )
+
+    assert calls == ["deliver", ("invalidate", [str(family_id)], [str(user_id)])]
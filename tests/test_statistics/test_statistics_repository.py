@@ -0,0 +1,247 @@
+from datetime import date
+from statistics.models import DailyCompletionCount
+from statistics.repository import StatsClickhouseRepository, StatsPostgresRepository
+from statistics.schemas import DateRangeSchema
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from chores.models import Chore
+from chores_completions.models import ChoreCompletion
+from chores_completions.services import ApproveChoreCompletion, CreateChoreCompletion
+from core.exceptions.chores import ChoreNotFoundError
+from families.models import Family
+from users.models import User
+
+
+async def get_random_chore(family: Family, db_session) -> Chore:
+    query = select(Chore).where(family.id == family.id)
+    query_result = await db_session.execute(query)
+    chore = query_result.fetchone()
+    if chore is not None:
+        return chore[0]
+    raise ChoreNotFoundError
+
+
+async def get_chore_completion(
+    user: User, family: Family, db_session
+) -> ChoreCompletion:
+    chore = await get_random_chore(family, db_session)
+
+    chore_completion = await CreateChoreCompletion(
+        user=user, chore=chore, message="message", db_session=db_session
+    ).run_process()
+    return chore_completion
+
+
+@pytest.mark.asyncio
+async def test_postgres_family_members_heatmap(member_family, async_session_test):
+    user, family = member_family
+    chore_completion = await get_chore_completion(user, family, async_session_test)
+    with patch(
+        "chores_completions.services.CoinsRewardService.run_process",
+        new_callable=AsyncMock,
+    ):
+        await ApproveChoreCompletion(
+            chore_completion, db_session=async_session_test
+        ).run_process()
+
+    heatmaps = await StatsPostgresRepository(
+        async_session_test
+    ).get_family_members_heatmap(family.id)
+
+    assert heatmaps == {user.id: {chore_completion.created_at.date(): 1}}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "use_rollups, table",
+    [
+        (True, "chore_completion_daily_user"),
+        (False, "chore_completion_stats"),
+    ],
+)
+async def test_clickhouse_family_members_heatmap(use_rollups, table):
+    family_id, first_user_id, second_user_id = uuid4(), uuid4(), uuid4()
+    client = MagicMock()
+    client.query = AsyncMock(
+        return_value=MagicMock(
+            result_rows=[
+                (first_user_id, date(2026, 10, 1), 2),
+                (first_user_id, date(2026, 10, 3), 1),
+                (second_user_id, date(2026, 10, 2), 4),
+            ]
+        )
+    )
+
+    with patch(
+        "statistics.repository.clickhouse_client.get_client",
+        new_callable=AsyncMock,
+        return_value=client,
+    ):
+        heatmaps = await StatsClickhouseRepository(
+            use_rollups=use_rollups
+        ).get_family_members_heatmap(family_id)
+
+    assert heatmaps == {
+        first_user_id: {date(2026, 10, 1): 2, date(2026, 10, 3): 1},
+        second_user_id: {date(2026, 10, 2): 4},
+    }
+    query = client.query.call_args.kwargs["query"]
+    assert f"FROM {table}" in query
+    assert "family_id = %(family_id)s" in query
+    assert client.query.call_args.kwargs["parameters"]["family_id"] == str(family_id)
+
+
+@pytest.mark.asyncio
+async def test_postgres_completion_counts_by_windows(member_family, async_session_test):
+    user, family = member_family
+    chore = await get_random_chore(family, async_session_test)
+    for day, completions in [
+        (date(2026, 10, 1), 2),
+        (date(2026, 10, 5), 1),
+        (date(2026, 10, 10), 3),
+    ]:
+        async_session_test.add(
+            DailyCompletionCount(
+                family_id=family.id,
+                completed_by_id=user.id,
+                chore_id=chore.id,
+                day=day,
+                completions=completions,
+            )
+        )
+    await async_session_test.commit()
+    windows = [
+        DateRangeSchema(end=date(2026, 10, 5)),
+        DateRangeSchema(start=date(2026, 10, 5)),
+        DateRangeSchema(start=date(2026, 10, 1), end=date(2026, 10, 5)),
+        DateRangeSchema(start=date(2026, 10, 5), end=date(2026, 10, 10)),
+        DateRangeSchema(start=date(2026, 10, 11), end=date(2026, 10, 20)),
+        DateRangeSchema(),
+    ]
+    repo = StatsPostgresRepository(async_session_test)
+
+    family_counts = await repo.get_completion_counts_by_windows(
+        windows, family_id=family.id
+    )
+    user_counts = await repo.get_completion_counts_by_windows(
+        windows, completed_by_id=user.id
+    )
+    other_user_counts = await repo.get_completion_counts_by_windows(
+        windows, completed_by_id=uuid4()
+    )
+
+    assert family_counts == [3, 4, 3, 4, 0, 6]
+    assert user_counts == [3, 4, 3, 4, 0, 6]
+    assert other_user_counts == [0, 0, 0, 0, 0, 0]
+    assert await repo.get_completion_counts_by_windows([], family_id=family.id) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "use_rollups, table, count_if",
+    [
+        (True, "chore_completion_daily_family", "sumIf(completions, "),
+        (False, "chore_completion_stats", "countIf("),
+    ],
+)
+async def test_clickhouse_completion_counts_by_windows(use_rollups, table, count_if):
+    family_id = uuid4()
+    client = MagicMock()
+    client.query = AsyncMock(return_value=MagicMock(result_rows=[(3, 4, 0)]))
+    windows = [
+        DateRangeSchema(end=date(2026, 10, 5)),
+        DateRangeSchema(start=date(2026, 10, 5), end=date(2026, 10, 10)),
+        DateRangeSchema(start=date(2026, 10, 11)),
+    ]
+
+    with patch(
+        "statistics.repository.clickhouse_client.get_client",
+        new_callable=AsyncMock,
+        return_value=client,
+    ):
+        repo = StatsClickhouseRepository(use_rollups=use_rollups)
+        counts = await repo.get_completion_counts_by_windows(
+            windows, family_id=family_id
+        )
+        assert await repo.get_completion_counts_by_windows([], family_id) == []
+
+    assert counts == [3, 4, 0]
+    client.query.assert_awaited_once()
+    query = client.query.call_args.kwargs["query"]
+    parameters = client.query.call_args.kwargs["parameters"]
+    assert f"FROM {table}" in query
+    assert query.count(count_if) == 3
+    # the covering interval of an open window is open as well
+    assert "start_date" not in parameters and "end_date" not in parameters
+    assert parameters["family_id"] == str(family_id)
+    assert parameters["window_end_0"] == date(2026, 10, 5)
+    assert "window_start_0" not in parameters
+    assert parameters["window_start_1"] == date(2026, 10, 5)
+    assert parameters["window_end_1"] == date(2026, 10, 10)
+    assert parameters["window_start_2"] == date(2026, 10, 11)
+    assert "window_end_2" not in parameters
+
+
+@pytest.mark.asyncio
+async def test_completion_counts_by_windows_requires_one_entity():
+    with pytest.raises(ValueError):
+        await StatsClickhouseRepository().get_completion_counts_by_windows(
+            [DateRangeSchema()]
+        )
+
+
+@pytest.mark.asyncio
+async def test_postgres_families_chore_completion_counts(
+    member_family, async_session_test
+):
+    user, family = member_family
+    chore = await get_random_chore(family, async_session_test)
+    for day, completions in [(date(2026, 10, 1), 2), (date(2026, 10, 5), 1)]:
+        async_session_test.add(
+            DailyCompletionCount(
+                family_id=family.id,
+                completed_by_id=user.id,
+                chore_id=chore.id,
+                day=day,
+                completions=completions,
+            )
+        )
+    await async_session_test.commit()
+    repo = StatsPostgresRepository(async_session_test)
+
+    assert await repo.get_families_chore_completion_counts() == {family.id: 3}
+    assert await repo.get_families_chore_completion_counts(
+        DateRangeSchema(end=date(2026, 10, 4))
+    ) == {family.id: 2}
+
+
+@pytest.mark.asyncio
+async def test_clickhouse_families_chore_completion_counts():
+    first_family_id, second_family_id = uuid4(), uuid4()
+    client = MagicMock()
+    client.query = AsyncMock(
+        return_value=MagicMock(
+            result_rows=[(first_family_id, 3), (second_family_id, 1)]
+        )
+    )
+
+    with patch(
+        "statistics.repository.clickhouse_client.get_client",
+        new_callable=AsyncMock,
+        return_value=client,
+    ):
+        counts = await StatsClickhouseRepository(
+            use_rollups=True
+        ).get_families_chore_completion_counts(DateRangeSchema(end=date(2026, 10, 4)))
+
+    assert counts == {first_family_id: 3, second_family_id: 1}
+    query = client.query.call_args.kwargs["query"]
+    assert "FROM chore_completion_daily_family" in query
+    assert "GROUP BY family_id" in query
+    assert client.query.call_args.kwargs["parameters"] == {
+        "end_date": date(2026, 10, 4)
+    }
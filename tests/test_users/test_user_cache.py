@@ -0,0 +1,50 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from core.exceptions.redis import RedisUnavailableError
+from users.cache import UserCache
+
+
+@pytest.mark.asyncio
+async def test_failed_delete_skips_redis_until_retried():
+    cache = UserCache(local_size=10, local_ttl=5, redis_ttl=60)
+    user_id = str(uuid4())
+    redis = MagicMock()
+    redis.get = AsyncMock(return_value=None)
+    redis.delete = AsyncMock()
+    redis_up = False
+
+    async def run(command):
+        if not redis_up:
+            raise RedisUnavailableError()
+        return await command(redis)
+
+    with patch("users.cache.redis_client.run", run):
+        await cache.invalidate(user_id)
+        redis_up = True
+        # the stale snapshot is deleted before Redis is read again
+        assert await cache.get(user_id) is None
+
+    redis.delete.assert_awaited_once_with(cache.key_prefix + user_id)
+    redis.get.assert_awaited_once_with(cache.key_prefix + user_id)
+
+
+@pytest.mark.asyncio
+async def test_redis_is_not_read_while_delete_keeps_failing():
+    cache = UserCache(local_size=10, local_ttl=5, redis_ttl=60)
+    user_id = str(uuid4())
+    redis = MagicMock()
+    redis.get = AsyncMock()
+    redis.delete = AsyncMock(side_effect=RedisUnavailableError())
+
+    async def run(command):
+        return await command(redis)
+
+    with patch("users.cache.redis_client.run", run):
+        await cache.invalidate(user_id)
+        assert await cache.get(user_id) is None
+
+    redis.get.assert_not_awaited()
+    assert redis.delete.await_count == 2
@@ -1,5 +1,7 @@
+import asyncio
 from decimal import Decimal
 from unittest.mock import AsyncMock, patch
+
 import pytest
 from sqlalchemy import select, update
 
@@ -13,17 +15,24 @@ from core.exceptions.chores import ChoreNotFoundError
 from core.exceptions.chores_completion import ChoreCompletionIsNotApproved
 from core.exceptions.families import UserNotFoundInFamily
 from core.exceptions.wallets import NotEnoughCoins
+from core.transactions import STANDARD_WRITE, transaction
 from families.models import Family
 from users.models import User
 from users.repository import UserRepository
 from wallets.models import Wallet
-from wallets.repository import WalletRepository
-from wallets.schemas import CreatePeerTransactionSchema
+from wallets.repository import (
+    WalletLedgerRepository,
+    WalletReconciliationRepository,
+    WalletRepository,
+)
+from wallets.schemas import CreatePeerTransactionSchema, MoneyTransferSchema
 from wallets.services import (
+    BatchTransferService,
     CoinsRewardService,
     CoinsTransferService,
     PeerTransactionService,
     WalletCreatorService,
+    coin_exchange,
 )
 
 
@@ -180,3 +189,154 @@ async def test_coin_reward_service(
         )
 
         assert actual_user_balance == chore_valuation
+
+
+@pytest.mark.asyncio
+async def test_coin_reward_service_writes_ledger(member_family, async_session_test):
+    member, family = member_family
+    chore_completion = await get_chore_completion(member, family, async_session_test)
+    chore_completion.status = StatusConfirmENUM.approved
+    transaction_log = await CoinsRewardService(
+        chore_completion, "message", async_session_test
+    ).run_process()
+
+    history = await WalletLedgerRepository(async_session_test).get_user_history(
+        member.id, 0, 10
+    )
+    wallet = await WalletRepository(async_session_test).get_by_user_id(member.id)
+
+    [entry] = history.transactions
+    assert entry.id == transaction_log.id
+    assert entry.transaction_direction == "incoming"
+    assert entry.chore_completion.id == chore_completion.id
+    assert entry.balance == wallet.balance
+
+
+@pytest.mark.asyncio
+async def test_coin_exchange_concurrent_transfers(
+    member_family, async_session_test, async_session_factory
+):
+    member, family = member_family
+    admin = await UserRepository(async_session_test).get_by_id(family.family_admin_id)
+    await set_user_balance(member, 100, async_session_test)
+    await set_user_balance(admin, 100, async_session_test)
+    await async_session_test.commit()
+
+    async def transfer(from_user, to_user):
+        # READ COMMITTED and no retries: a lost update or a deadlock would show
+        async with async_session_factory() as db_session:
+            async with transaction(db_session, STANDARD_WRITE):
+                await coin_exchange(
+                    to_user_id=to_user.id,
+                    from_user_id=from_user.id,
+                    coins=5,
+                    rate=Decimal(1),
+                    db_session=db_session,
+                )
+
+    await asyncio.gather(
+        *(transfer(member, admin) for _ in range(20)),
+        *(transfer(admin, member) for _ in range(20)),
+    )
+
+    async with async_session_factory() as db_session:
+        wallet_dal = WalletRepository(db_session)
+        assert (await wallet_dal.get_by_user_id(member.id)).balance == 100
+        assert (await wallet_dal.get_by_user_id(admin.id)).balance == 100
+
+
+@pytest.mark.asyncio
+async def test_batch_transfer_service(member_family, user_factory, async_session_test):
+    member, family = member_family
+    admin = await UserRepository(async_session_test).get_by_id(family.family_admin_id)
+    stranger = await user_factory()
+    await set_user_balance(admin, 100, async_session_test)
+    await set_user_balance(member, 0, async_session_test)
+
+    results = await BatchTransferService(
+        from_user=admin,
+        items=[
+            MoneyTransferSchema(to_user_id=member.id, count=Decimal(10)),
+            MoneyTransferSchema(to_user_id=stranger.id, count=Decimal(10)),
+            MoneyTransferSchema(to_user_id=admin.id, count=Decimal(10)),
+            MoneyTransferSchema(to_user_id=member.id, count=Decimal(20)),
+        ],
+        message="Allowance",
+        db_session=async_session_test,
+    ).run_process()
+
+    assert [result.status for result in results] == [
+        "transferred",
+        "rejected",
+        "rejected",
+        "transferred",
+    ]
+    wallet_dal = WalletRepository(async_session_test)
+    member_balance = int(10 * TRANSFER_RATE) + int(20 * TRANSFER_RATE)
+    assert await wallet_dal.get_user_balance(admin.id) == 70
+    assert await wallet_dal.get_user_balance(member.id) == member_balance
+
+    history = await WalletLedgerRepository(async_session_test).get_user_history(
+        member.id, 0, 10
+    )
+    credits = {
+        results[0].transaction_id: int(10 * TRANSFER_RATE),
+        results[3].transaction_id: int(20 * TRANSFER_RATE),
+    }
+    # newest first: each balance is the previous one before its own credit
+    [latest, earliest] = history.transactions
+    assert {latest.id, earliest.id} == set(credits)
+    assert latest.balance == member_balance
+    assert earliest.balance == member_balance - credits[latest.id]
+
+
+@pytest.mark.asyncio
+async def test_batch_transfer_service_not_enough_coins(
+    member_family, async_session_test
+):
+    member, family = member_family
+    admin = await UserRepository(async_session_test).get_by_id(family.family_admin_id)
+    await set_user_balance(admin, 15, async_session_test)
+
+    with pytest.raises(NotEnoughCoins):
+        await BatchTransferService(
+            from_user=admin,
+            items=[
+                MoneyTransferSchema(to_user_id=member.id, count=Decimal(10)),
+                MoneyTransferSchema(to_user_id=member.id, count=Decimal(10)),
+            ],
+            message="Allowance",
+            db_session=async_session_test,
+        ).run_process()
+
+    balance = await WalletRepository(async_session_test).get_user_balance(admin.id)
+    assert balance == 15
+
+
+@pytest.mark.asyncio
+async def test_wallet_reconciliation(member_family, async_session_test):
+    member, family = member_family
+    admin = await UserRepository(async_session_test).get_by_id(family.family_admin_id)
+    reconciliation = WalletReconciliationRepository(async_session_test)
+    wallet_dal = WalletRepository(async_session_test)
+    # no transaction backs these coins
+    await set_user_balance(admin, 100, async_session_test)
+
+    [drift] = await reconciliation.check([member.id, admin.id], settle_seconds=0)
+    assert (drift.user_id, drift.balance, drift.expected) == (admin.id, 100, 0)
+
+    await reconciliation.correct([drift])
+    assert await wallet_dal.get_user_balance(admin.id) == 0
+    # the reward is created by a later transaction, after the checkpoint
+    await async_session_test.commit()
+
+    chore_completion = await get_chore_completion(member, family, async_session_test)
+    chore_completion.status = StatusConfirmENUM.approved
+    await CoinsRewardService(
+        chore_completion=chore_completion,
+        message="message",
+        db_session=async_session_test,
+    ).run_process()
+
+    # only the reward since the checkpoint is summed
+    assert await reconciliation.check([member.id, admin.id], settle_seconds=0) == []